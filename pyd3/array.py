@@ -0,0 +1,622 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of (part of) the `d3-array
+<https://github.com/d3/d3-array>`_ javascript module.
+
+Data in JavaScript is often represented by an iterable (such as an array,
+set or generator), and so iterable manipulation is a common task when
+analyzing or visualizing data. Here, data are numpy arrays and statistics
+are computed by numpy over whole arrays. As with d3, undefined values (NaN,
+NaT) are ignored::
+
+   array.extent([3, 1, np.nan, 2])     # [1.0, 3.0]
+   array.quantile(values, [0.25, 0.75])
+   array.bisect([1, 2, 3], [0.5, 2])   # array([0, 2])
+
+Statistics of data that do not fit in memory (or that are produced by
+several workers) are computed in one pass with accumulators, which are
+updated chunk by chunk and can be merged::
+
+   extent, moments = array.Extent(), array.Moments()
+   for chunk in chunks:
+       extent.update(chunk)
+       moments.update(chunk)
+   x = scale.linear(domain=extent.value).nice()
+
+Quantiles are accumulated with a QuantileSketch (see sketch) and
+histograms (see bin and Histogram) are updated and merged alike.
+"""
+import copy
+import warnings
+import numpy as np
+from pyd3.sketch import QuantileSketch
+from pyd3.scale import ticks, tick_step, tick_steps, ticks_many, _nice_linear
+
+
+def _undefined(values):
+    if values.dtype.kind in "mM":
+        return np.isnat(values)
+    return np.isnan(values)
+
+def _asarray(values):
+    values = np.asarray(values)
+    if values.dtype.kind not in "fcmM":
+        values = values.astype(float)
+    return values
+
+
+
+# -----------------------------------------------------------------------------
+# Statistics
+# -----------------------------------------------------------------------------
+
+def min(values, axis=None):
+    """
+    Returns the minimum of the given values (NaN if there are none),
+    ignoring undefined values.
+    """
+    return extent(values, axis)[0]
+
+def max(values, axis=None):
+    """
+    Returns the maximum of the given values (NaN if there are none),
+    ignoring undefined values.
+    """
+    return extent(values, axis)[1]
+
+def extent(values, axis=None):
+    """
+    Returns the minimum and maximum of the given values, ignoring undefined
+    values, as a list [min, max] suitable for a scale domain. If there are
+    no values, returns [NaN, NaN]. If an axis is given, min and max are
+    arrays reduced along this axis.
+    """
+
+    values = _asarray(values)
+    if values.size == 0:
+        nan = np.array("NaT", dtype=values.dtype) if values.dtype.kind in "mM" else np.nan
+        if axis is None:
+            return [nan, nan]
+        shape = np.delete(values.shape, axis)
+        return [np.full(shape, nan), np.full(shape, nan)]
+    return [np.fmin.reduce(values, axis=axis)[()], np.fmax.reduce(values, axis=axis)[()]]
+
+def sum(values, axis=None):
+    """
+    Returns the sum of the given values, ignoring undefined values (0 if
+    there are none).
+    """
+    return np.nansum(_asarray(values), axis=axis)[()]
+
+def mean(values, axis=None):
+    """
+    Returns the mean of the given values, ignoring undefined values (NaN if
+    there are none).
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmean(_asarray(values), axis=axis)[()]
+
+def median(values, axis=None):
+    """
+    Returns the median of the given values, ignoring undefined values (NaN
+    if there are none).
+    """
+    return quantile(values, 0.5, axis=axis)
+
+def variance(values, axis=None):
+    """
+    Returns an unbiased estimator of the population variance of the given
+    values, ignoring undefined values. If there are fewer than two values,
+    returns NaN.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanvar(_asarray(values), axis=axis, ddof=1)[()]
+
+def deviation(values, axis=None):
+    """
+    Returns the standard deviation, defined as the square root of the
+    bias-corrected variance, of the given values, ignoring undefined
+    values. If there are fewer than two values, returns NaN.
+    """
+    return np.sqrt(variance(values, axis))[()]
+
+def quantile(values, p, axis=None):
+    """
+    Returns the p-quantile(s) of the given values, p being a number or an
+    array of numbers in [0, 1], using the R-7 method (as d3 and numpy).
+    Undefined values are ignored. If there are no values, returns NaN.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanquantile(_asarray(values), p, axis=axis)[()]
+
+def quantile_sorted(values, p):
+    """
+    Similar to quantile, but expects the values to be a sorted array of
+    defined numbers, such that no copy nor sort is needed.
+    """
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return np.full(np.shape(p), np.nan)[()]
+    return np.interp(np.asarray(p, dtype=float) * (len(values) - 1),
+                     np.arange(len(values)), values)[()]
+
+
+
+# -----------------------------------------------------------------------------
+# Search
+# -----------------------------------------------------------------------------
+
+def bisect_left(values, x, lo=0, hi=None):
+    """
+    Returns the insertion point(s) for x (a value or an array of values) in
+    the sorted values to maintain sorted order, before any existing entries
+    equal to x. The arguments lo and hi specify a subset of the values to
+    consider.
+    """
+    values = np.asarray(values)
+    hi = len(values) if hi is None else hi
+    return (lo + np.searchsorted(values[lo:hi], x, side="left"))[()]
+
+def bisect_right(values, x, lo=0, hi=None):
+    """
+    Like bisect_left, but returns insertion point(s) which come after any
+    existing entries equal to x.
+    """
+    values = np.asarray(values)
+    hi = len(values) if hi is None else hi
+    return (lo + np.searchsorted(values[lo:hi], x, side="right"))[()]
+
+bisect = bisect_right
+
+def bisect_center(values, x, lo=0, hi=None):
+    """
+    Returns the index (or indices) of the value closest to x in the sorted
+    values (numbers).
+    """
+    values = np.asarray(values)
+    hi = len(values) if hi is None else hi
+    i = bisect_left(values, x, lo, hi)
+    x, i = np.asarray(x), np.asarray(i)
+    before = np.clip(i - 1, lo, hi - 1)
+    i = np.clip(i, lo, hi - 1)
+    closer = (i > lo) & (x - values[before] < values[i] - x)
+    return np.where(closer, before, i)[()]
+
+
+
+# -----------------------------------------------------------------------------
+# Blur
+# -----------------------------------------------------------------------------
+
+def _box(values, radius, axis):
+    """
+    Moving average of width 2*radius+1 along an axis, values beyond the
+    edges being clamped. A fractional radius weights the extreme values of
+    the window.
+    """
+
+    r = int(np.floor(radius))
+    t = radius - r
+    n = values.shape[axis]
+    padded = np.pad(values, [(r+1, r+1) if a == axis % values.ndim else (0, 0)
+                             for a in range(values.ndim)], mode="edge")
+    shape = list(padded.shape)
+    shape[axis] = 1
+    cumulated = np.concatenate([np.zeros(shape), np.cumsum(padded, axis=axis)], axis=axis)
+    take = lambda array, start: np.take(array, np.arange(start, start + n), axis=axis)
+    total = take(cumulated, 2*r + 2) - take(cumulated, 1)
+    if t:
+        total += t * (take(padded, 0) + take(padded, 2*r + 2))
+    return total / (2*radius + 1)
+
+def blur(values, radius, axis=-1):
+    """
+    Returns the values blurred along the given axis by three iterations of
+    a moving average (box) of radius r, approximating a gaussian blur. The
+    radius may be fractional.
+    """
+
+    values = np.asarray(values, dtype=float)
+    if radius > 0:
+        for _ in range(3):
+            values = _box(values, radius, axis)
+    return values
+
+def blur2(values, rx, ry=None):
+    """
+    Returns a 2D array of values (rows being y) blurred by blur, with
+    radius rx horizontally and ry (defaulting to rx) vertically.
+    """
+    ry = rx if ry is None else ry
+    return blur(blur(values, rx, axis=1), ry, axis=0)
+
+
+
+# -----------------------------------------------------------------------------
+# Ticks (see scale)
+# -----------------------------------------------------------------------------
+
+def nice(start, stop, count):
+    """
+    Returns a new interval [start, stop] covering the given interval and
+    where start and stop are guaranteed to align with the corresponding
+    tick step.
+    """
+    return _nice_linear([start, stop], count)
+
+
+
+# -----------------------------------------------------------------------------
+# Accumulators
+# -----------------------------------------------------------------------------
+
+class Extent(object):
+    """
+    Accumulates the extent of streamed values (undefined values are
+    ignored). Accumulators updated with different chunks can be merged.
+    """
+
+    def __init__(self):
+        self._min = self._max = None
+        self._count = 0
+
+    @property
+    def count(self):
+        """ Number of (defined) values seen so far """
+        return self._count
+
+    @property
+    def value(self):
+        """ Extent [min, max] of the values seen so far ([NaN, NaN] before) """
+        if self._min is None:
+            return [np.nan, np.nan]
+        return [self._min, self._max]
+
+    def _add(self, lo, hi, count):
+        if not count:
+            return self
+        if self._min is None:
+            self._min, self._max = lo, hi
+        else:
+            self._min, self._max = np.fmin(self._min, lo), np.fmax(self._max, hi)
+        self._count += count
+        return self
+
+    def update(self, values):
+        """
+        Adds values (any array like) and returns the accumulator.
+        """
+        values = _asarray(values).ravel()
+        count = len(values) - int(np.count_nonzero(_undefined(values)))
+        if not count:
+            return self
+        lo, hi = extent(values)
+        return self._add(lo, hi, count)
+
+    def merge(self, other):
+        """
+        Merges another accumulator into this one and returns this one.
+        """
+        return self._add(other._min, other._max, other._count)
+
+    def copy(self):
+        """ Returns an independent copy of the accumulator """
+        return copy.copy(self)
+
+
+class Moments(object):
+    """
+    Accumulates the count, sum, mean and variance of streamed numbers
+    (undefined values are ignored). Chunks are reduced by numpy and combined
+    with the pairwise formula of Chan et al., which is numerically stable.
+    Accumulators updated with different chunks can be merged.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def count(self):
+        """ Number of (defined) values seen so far """
+        return self._count
+
+    @property
+    def sum(self):
+        """ Sum of the values seen so far """
+        return self._mean * self._count
+
+    @property
+    def mean(self):
+        """ Mean of the values seen so far (NaN before) """
+        return self._mean if self._count else np.nan
+
+    @property
+    def variance(self):
+        """
+        Unbiased variance of the values seen so far (NaN if fewer than two)
+        """
+        return self._m2 / (self._count - 1) if self._count > 1 else np.nan
+
+    @property
+    def deviation(self):
+        """
+        Standard deviation of the values seen so far (NaN if fewer than two)
+        """
+        return np.sqrt(self.variance)
+
+    def _add(self, count, mean, m2):
+        if not count:
+            return self
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta * delta * self._count * count / total
+        self._count = total
+        return self
+
+    def update(self, values):
+        """
+        Adds values (any array like) and returns the accumulator.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        mean = values.mean()
+        centered = values - mean
+        return self._add(len(values), mean, float(np.dot(centered, centered)))
+
+    def merge(self, other):
+        """
+        Merges another accumulator into this one and returns this one.
+        """
+        return self._add(other._count, other._mean, other._m2)
+
+    def copy(self):
+        """ Returns an independent copy of the accumulator """
+        return copy.copy(self)
+
+
+
+# -----------------------------------------------------------------------------
+# Histograms
+# -----------------------------------------------------------------------------
+
+def _chunks(values):
+    """
+    Flat float chunks of values, converted one at a time such that large
+    (e.g. memory-mapped) arrays are never copied whole.
+    """
+    values = np.asarray(values).reshape(-1)
+    for start in range(0, len(values), Histogram._chunk_size):
+        yield np.asarray(values[start:start + Histogram._chunk_size], dtype=float)
+
+def _count(values):
+    """
+    Returns the number of defined values.
+    """
+    count = 0
+    for chunk in _chunks(values):
+        count += int(np.count_nonzero(~np.isnan(chunk)))
+    return count
+
+def threshold_sturges(values, x0=None, x1=None):
+    """
+    Returns the number of bins according to Sturges’ formula.
+    """
+    count = _count(values)
+    return int(np.ceil(np.log2(count))) + 1 if count > 1 else 1
+
+def threshold_scott(values, x0=None, x1=None):
+    """
+    Returns the number of bins according to Scott’s normal reference rule.
+    """
+    values = _asarray(values)
+    count, d = Moments().update(values).count, deviation(values)
+    if not count or not d > 0:
+        return 1
+    lo, hi = extent(values)
+    return int(np.ceil((hi - lo) * np.cbrt(count) / (3.49 * d)))
+
+def threshold_freedman_diaconis(values, x0=None, x1=None):
+    """
+    Returns the number of bins according to the Freedman–Diaconis rule.
+    """
+    values = _asarray(values)
+    count = _count(values)
+    q1, q3 = quantile(values, [0.25, 0.75]) if count else (np.nan, np.nan)
+    if not count or not q3 - q1 > 0:
+        return 1
+    lo, hi = extent(values)
+    return int(np.ceil((hi - lo) / (2 * (q3 - q1) * count**(-1/3))))
+
+
+def _bin_thresholds(domain, thresholds, values=None, niced=False):
+    """
+    Domain and thresholds of bins, following d3: a count of thresholds is
+    turned into ticks, and when the domain is the (niced) extent of values,
+    the upper bound is extended such that the last bin is as wide as others.
+    Thresholds outside the domain are removed.
+    """
+
+    x0, x1 = float(domain[0]), float(domain[-1])
+    if callable(thresholds):
+        thresholds = thresholds(values, x0, x1)
+    if np.ndim(thresholds) == 0:
+        count = int(thresholds)
+        if count < 1 or not x0 < x1:
+            tz = []
+        else:
+            maximum = x1
+            if niced:
+                x0, x1 = _nice_linear([x0, x1], count)
+            tz = ticks(x0, x1, count)
+            if tz and tz[-1] >= x1:
+                if niced and maximum >= x1:
+                    step = tick_step(x0, x1, count)
+                    x1 = (np.floor(x1 / step) + 1) * step
+                else:
+                    tz.pop()
+    else:
+        tz = np.sort(np.asarray(thresholds, dtype=float).ravel())
+    tz = np.asarray(tz, dtype=float)
+    return x0, x1, tz[(tz > x0) & (tz <= x1)]
+
+
+class Histogram(object):
+    """
+    Counts of values falling in consecutive bins of a domain [x0, x1]: bins
+    are delimited by thresholds (x0 <= values < t0, t0 <= values < t1, ...,
+    tn <= values <= x1) and values outside the domain are ignored. The
+    thresholds are either an array or a count, in which case they are the
+    ticks of the domain (see scale.ticks).
+
+    A histogram can be updated with chunks of values, weighted or not, and
+    merged with a histogram of the same bins (e.g. computed by another
+    worker).
+    """
+
+    # Values are binned by chunks such that temporary arrays are bounded
+    _chunk_size = 2**20
+
+    def __init__(self, domain, thresholds=10):
+        self._set_bins(*_bin_thresholds(domain, thresholds))
+
+    def _set_bins(self, x0, x1, thresholds):
+        self._x0, self._x1 = x0, x1
+        self._thresholds = thresholds
+        self._thresholds.setflags(write=False)
+        self._counts = np.zeros(len(thresholds) + 1, dtype=np.int64)
+
+        # Evenly spaced thresholds: bins are computed arithmetically
+        self._step = None
+        if len(thresholds) > 1:
+            steps = np.diff(thresholds)
+            if np.allclose(steps, steps[0], rtol=1e-9, atol=0):
+                self._step = float(thresholds[-1] - thresholds[0]) / (len(thresholds) - 1)
+
+    @property
+    def domain(self):
+        """ Domain [x0, x1] of the bins """
+        return [self._x0, self._x1]
+
+    @property
+    def thresholds(self):
+        """ Thresholds between bins (read-only array) """
+        return self._thresholds
+
+    @property
+    def x0(self):
+        """ Lower bounds (inclusive) of the bins """
+        return np.concatenate([[self._x0], self._thresholds])
+
+    @property
+    def x1(self):
+        """ Upper bounds (exclusive, but the last one) of the bins """
+        return np.concatenate([self._thresholds, [self._x1]])
+
+    @property
+    def counts(self):
+        """ Count (or total weight) of values in each bin """
+        return self._counts
+
+    def __len__(self):
+        return len(self._counts)
+
+    def index(self, values):
+        """
+        Returns the index of the bin of each value (-1 for values outside
+        the domain or undefined).
+        """
+
+        x = np.asarray(values, dtype=float)
+        tz, m = self._thresholds, len(self._thresholds)
+        if self._step is not None:
+            with np.errstate(invalid='ignore'):
+                i = np.floor((x - tz[0]) / self._step) + 1
+                i = np.clip(np.nan_to_num(i), 0, m).astype(np.intp)
+            # Rounding may offset values close to thresholds by one bin
+            i -= (i > 0) & (x < tz[np.maximum(i - 1, 0)])
+            i += (i < m) & (x >= tz[np.minimum(i, m - 1)])
+        else:
+            i = np.searchsorted(tz, x, side="right")
+        with np.errstate(invalid='ignore'):
+            outside = ~((x >= self._x0) & (x <= self._x1))
+        return np.where(outside, -1, i)[()]
+
+    def update(self, values, weights=None):
+        """
+        Adds values (and their weights, if given) to the bins and returns
+        the histogram.
+        """
+
+        # Values (and weights) are converted to floats chunk by chunk
+        values = np.asarray(values).reshape(-1)
+        if weights is not None:
+            weights = np.broadcast_to(np.asarray(weights), values.shape)
+            if self._counts.dtype.kind != "f":
+                self._counts = self._counts.astype(float)
+        size = len(self._counts) + 1
+        for start in range(0, len(values), self._chunk_size):
+            stop = start + self._chunk_size
+            # Values outside the domain go to a discarded first bin
+            index = self.index(np.asarray(values[start:stop], dtype=float)) + 1
+            chunk = None
+            if weights is not None:
+                chunk = np.asarray(weights[start:stop], dtype=float)
+            self._counts += np.bincount(index, chunk, minlength=size)[1:]
+        return self
+
+    def merge(self, other):
+        """
+        Merges another histogram with the same bins into this one and
+        returns this one.
+        """
+
+        if (self.domain != other.domain
+            or not np.array_equal(self._thresholds, other._thresholds)):
+            raise ValueError("Histograms have different bins")
+        if other._counts.dtype.kind == "f" and self._counts.dtype.kind != "f":
+            self._counts = self._counts.astype(float)
+        self._counts += other._counts
+        return self
+
+    def copy(self):
+        """ Returns an independent copy of the histogram """
+        histogram = copy.copy(self)
+        histogram._counts = self._counts.copy()
+        return histogram
+
+
+def bin(values, domain=None, thresholds=None, weights=None):
+    """
+    Returns the histogram of the given values. The domain defaults to the
+    extent of values, niced according to the thresholds, which default to
+    a count given by Sturges’ formula. Thresholds are either an array, a
+    count or a function of (values, x0, x1) returning one or the other (see
+    threshold_sturges, threshold_scott and threshold_freedman_diaconis).
+    The thresholds of a scale are given by its domain and ticks::
+
+       histogram = array.bin(values, x.domain, x.ticks(20))
+    """
+
+    values = np.asarray(values)
+    niced = domain is None
+    if niced:
+        accumulator = Extent()
+        for chunk in _chunks(values):
+            accumulator.update(chunk)
+        domain = accumulator.value
+    if thresholds is None:
+        thresholds = threshold_sturges
+    histogram = Histogram.__new__(Histogram)
+    histogram._set_bins(*_bin_thresholds(domain, thresholds, values, niced))
+    return histogram.update(values, weights)
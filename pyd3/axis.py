@@ -0,0 +1,293 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of the `d3-axis
+<https://github.com/d3/d3-axis>`_ javascript module.
+
+The axis component renders human-readable reference marks for scales. This
+alleviates one of the more tedious tasks in visualizing data. Since there is
+no DOM to render into, an axis computes a layout instead: tick positions (in
+pixels), labels and SVG path data, which can be drawn with any backend::
+
+   x = scale.linear(domain=[0, 100], range=[0, 960])
+   layout = axis.bottom(x).layout()
+   layout.positions    # array([  0.5,  96.5, 192.5, ...])
+   layout.labels       # array(['0', '10', '20', ...])
+   layout.domain_path  # "M0.5,6V0.5H960.5V6"
+   layout.tick_path    # "M0.5,0V6M96.5,0V6..."
+
+Positions are computed by mapping all tick values at once and labels are
+formatted in bulk (see format). Layouts are cached: as long as neither the
+scale (see its version) nor the axis change, layout() returns the same
+(read-only) layout, such that re-rendering a static axis costs nothing.
+"""
+import collections
+import numpy as np
+from pyd3 import format as formats
+
+
+AxisLayout = collections.namedtuple("AxisLayout", [
+    "orient",       # "top", "right", "bottom" or "left"
+    "values",       # tick values
+    "positions",    # tick positions along the axis (pixels, offset included)
+    "labels",       # formatted tick values
+    "tick_path",    # SVG path of all tick lines
+    "domain_path",  # SVG path of the domain line (with outer ticks)
+    "label_offset", # position of labels across the axis
+    "text_anchor",  # SVG text-anchor of labels
+    "dy"])          # SVG dy of labels
+
+
+def _number(x):
+    """ Shortest representation of x, as javascript """
+    s = repr(float(x))
+    return s[:-2] if s.endswith(".0") else s
+
+def _numbers(values):
+    return [_number(x) for x in np.asarray(values, dtype=float).tolist()]
+
+
+class Axis(object):
+    """
+    Axis of a scale for the given orientation ("top", "right", "bottom" or
+    "left"). Ticks are generated with the scale ticks and tick_format
+    methods (with the given tick arguments) unless explicit tick values or
+    format are given. The offset (0.5 by default) is added to positions
+    such that lines are crisp on low-resolution devices.
+    """
+
+    def __init__(self, orient, scale, tick_arguments=(), tick_values=None,
+                 tick_format=None, tick_size_inner=6, tick_size_outer=6,
+                 tick_padding=3, offset=0.5):
+        if orient not in ("top", "right", "bottom", "left"):
+            raise ValueError("Unknown orientation: %s" % orient)
+        self._orient = orient
+        self._scale = scale
+        self._tick_arguments = tuple(tick_arguments)
+        self._tick_values = tick_values
+        self._tick_format = tick_format
+        self._tick_size_inner = tick_size_inner
+        self._tick_size_outer = tick_size_outer
+        self._tick_padding = tick_padding
+        self._offset = offset
+        self._layout = None
+
+    def _invalidate(self):
+        self._layout = None
+
+    @property
+    def orient(self):
+        """ Orientation of the axis """
+        return self._orient
+
+    @property
+    def scale(self):
+        """ Scale of the axis """
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale):
+        self._scale = scale
+        self._invalidate()
+
+    @property
+    def tick_arguments(self):
+        """
+        Arguments passed to scale.ticks and scale.tick_format, e.g. (5,) or
+        (5, "+%") or (time.minute.every(15),)
+        """
+        return self._tick_arguments
+
+    @tick_arguments.setter
+    def tick_arguments(self, arguments):
+        self._tick_arguments = tuple(arguments)
+        self._invalidate()
+
+    def ticks(self, *arguments):
+        """
+        Sets the tick arguments and returns the axis.
+        """
+        self.tick_arguments = arguments
+        return self
+
+    @property
+    def tick_values(self):
+        """ Explicit tick values (None to use the scale ticks) """
+        return self._tick_values
+
+    @tick_values.setter
+    def tick_values(self, values):
+        self._tick_values = values
+        self._invalidate()
+
+    @property
+    def tick_format(self):
+        """
+        Explicit tick format (None to use the scale tick format): a format
+        specifier, a Format or a function called for each tick value.
+        """
+        return self._tick_format
+
+    @tick_format.setter
+    def tick_format(self, format):
+        self._tick_format = format
+        self._invalidate()
+
+    @property
+    def tick_size(self):
+        """ Inner tick size (setting it sets both inner and outer sizes) """
+        return self._tick_size_inner
+
+    @tick_size.setter
+    def tick_size(self, size):
+        self._tick_size_inner = self._tick_size_outer = size
+        self._invalidate()
+
+    @property
+    def tick_size_inner(self):
+        """ Length of the tick lines """
+        return self._tick_size_inner
+
+    @tick_size_inner.setter
+    def tick_size_inner(self, size):
+        self._tick_size_inner = size
+        self._invalidate()
+
+    @property
+    def tick_size_outer(self):
+        """ Length of the square ends of the domain path """
+        return self._tick_size_outer
+
+    @tick_size_outer.setter
+    def tick_size_outer(self, size):
+        self._tick_size_outer = size
+        self._invalidate()
+
+    @property
+    def tick_padding(self):
+        """ Distance between ticks and labels """
+        return self._tick_padding
+
+    @tick_padding.setter
+    def tick_padding(self, padding):
+        self._tick_padding = padding
+        self._invalidate()
+
+    @property
+    def offset(self):
+        """ Pixel offset added to positions (0 on high-resolution devices) """
+        return self._offset
+
+    @offset.setter
+    def offset(self, offset):
+        self._offset = offset
+        self._invalidate()
+
+    def _values(self):
+        scale, arguments = self._scale, self._tick_arguments
+        if self._tick_values is not None:
+            return list(self._tick_values)
+        if hasattr(scale, "ticks"):
+            return scale.ticks(*arguments)
+        return list(scale.domain)
+
+    def _labels(self, values):
+        scale, format = self._scale, self._tick_format
+        if format is None:
+            if not hasattr(scale, "tick_format"):
+                return np.array([str(value) for value in values], dtype=str)
+            format = scale.tick_format(*self._tick_arguments)
+        elif isinstance(format, str):
+            format = formats.format(format)
+        elif not isinstance(format, formats.Format):
+            return np.array([format(value) for value in values], dtype=str)
+        return np.asarray(format(values), dtype=str).reshape(len(values))
+
+    def _positions(self, values):
+        scale, offset = self._scale, self._offset
+        positions = np.asarray(scale(values), dtype=float).reshape(len(values)) + offset
+        bandwidth = getattr(scale, "bandwidth", None)
+        if bandwidth is not None:
+            # Ticks are at the center of bands
+            center = max(0, bandwidth - offset * 2) / 2
+            if scale.round:
+                center = round(center)
+            positions += center
+        return positions
+
+    def layout(self):
+        """
+        Returns the layout of the axis (cached until the axis or its scale
+        change).
+        """
+
+        version = getattr(self._scale, "version", None)
+        if self._layout is not None and version is not None and self._version == version:
+            return self._layout
+
+        orient, offset = self._orient, self._offset
+        inner, outer = self._tick_size_inner, self._tick_size_outer
+        k = -1 if orient in ("top", "left") else 1
+        values = self._values()
+        positions = self._positions(values) if len(values) else np.empty(0)
+        labels = self._labels(values) if len(values) else np.empty(0, dtype=str)
+
+        # Domain path (the range is expected to be numeric)
+        range = self._scale.range
+        range0 = _number(float(range[0]) + offset)
+        range1 = _number(float(range[-1]) + offset)
+        o, kouter = _number(offset), _number(k * outer)
+        if orient in ("top", "bottom"):
+            domain_path = ("M%s,%sV%sH%sV%s" % (range0, kouter, o, range1, kouter) if outer
+                           else "M%s,%sH%s" % (range0, o, range1))
+            tail = ",0V" + _number(k * inner)
+            tick_path = "".join(["M" + x + tail for x in _numbers(positions)])
+        else:
+            domain_path = ("M%s,%sH%sV%sH%s" % (kouter, range0, o, range1, kouter) if outer
+                           else "M%s,%sV%s" % (o, range0, range1))
+            tail = "H" + _number(k * inner)
+            tick_path = "".join(["M0," + y + tail for y in _numbers(positions)])
+
+        positions.setflags(write=False)
+        labels.setflags(write=False)
+        self._layout = AxisLayout(
+            orient=orient, values=values, positions=positions, labels=labels,
+            tick_path=tick_path, domain_path=domain_path,
+            label_offset=k * (max(inner, 0) + self._tick_padding),
+            text_anchor={"right": "start", "left": "end"}.get(orient, "middle"),
+            dy={"top": "0em", "bottom": "0.71em"}.get(orient, "0.32em"))
+        self._version = version
+        return self._layout
+
+
+def top(scale, **kwargs):
+    """
+    Constructs a new top-oriented axis generator for the given scale. In
+    this orientation, ticks are drawn above the horizontal domain path.
+    """
+    return Axis("top", scale, **kwargs)
+
+def right(scale, **kwargs):
+    """
+    Constructs a new right-oriented axis generator for the given scale. In
+    this orientation, ticks are drawn to the right of the vertical domain
+    path.
+    """
+    return Axis("right", scale, **kwargs)
+
+def bottom(scale, **kwargs):
+    """
+    Constructs a new bottom-oriented axis generator for the given scale. In
+    this orientation, ticks are drawn below the horizontal domain path.
+    """
+    return Axis("bottom", scale, **kwargs)
+
+def left(scale, **kwargs):
+    """
+    Constructs a new left-oriented axis generator for the given scale. In
+    this orientation, ticks are drawn to the left of the vertical domain
+    path.
+    """
+    return Axis("left", scale, **kwargs)
@@ -0,0 +1,569 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of the `d3-contour
+<https://github.com/d3/d3-contour>`_ javascript module.
+
+This library computes contour polygons by applying marching squares to a
+rectangular array of numeric values. For example::
+
+   values = np.fromfile("volcano.bin").reshape(87, 61)
+   geometries = contour.contours(thresholds=20)(values)
+   paths = [contour.path(geometry) for geometry in geometries]
+
+Each contour is a GeoJSON-like MultiPolygon (a dict) enclosing the points
+where the value is greater than or equal to its threshold value, in grid
+coordinates ([0, width] x [0, height], rows of the array being y). Rings are
+closed numpy arrays of shape (n, 2). Isobands (values between consecutive
+thresholds) are MultiPolygons as well, built from the rings of both
+thresholds.
+
+Cells of all thresholds are classified at once and segments are stitched
+into rings with array operations (no loop over cells or segments), such that
+large grids contour in milliseconds. The contour density generator
+estimates the density of a set of points with a separable blur (see
+array.blur2) and contours it.
+"""
+import numpy as np
+from pyd3 import shape
+from pyd3.array import blur2, extent, threshold_sturges, ticks, nice
+
+
+# Segments of each marching squares case, as (x0, y0, x1, y1) offsets in
+# half cells from the top left corner of the cell (d3 cases, times 2, minus 2)
+_cases = [
+    [],
+    [[0, 1, -1, 0]],
+    [[1, 0, 0, 1]],
+    [[1, 0, -1, 0]],
+    [[0, -1, 1, 0]],
+    [[0, 1, -1, 0], [0, -1, 1, 0]],
+    [[0, -1, 0, 1]],
+    [[0, -1, -1, 0]],
+    [[-1, 0, 0, -1]],
+    [[0, 1, 0, -1]],
+    [[-1, 0, 0, -1], [1, 0, 0, 1]],
+    [[1, 0, 0, -1]],
+    [[-1, 0, 1, 0]],
+    [[0, 1, 1, 0]],
+    [[-1, 0, 0, 1]],
+    []]
+_case_count = np.array([len(segments) for segments in _cases])
+_case_segments = np.zeros((16, 2, 4), dtype=np.int64)
+for _case, _segments in enumerate(_cases):
+    if _segments:
+        _case_segments[_case, :len(_segments)] = _segments
+
+
+def _thresholds(values, thresholds):
+    """
+    Sorted threshold values: a count (or a function of values returning a
+    count) is turned into ticks of the niced extent of values, as d3.
+    """
+
+    if callable(thresholds):
+        lo, hi = extent(values)
+        thresholds = thresholds(values, lo, hi)
+    if np.ndim(thresholds) == 0:
+        lo, hi = extent(values)
+        if not lo < hi:
+            return np.empty(0)
+        count = int(thresholds)
+        tz = ticks(*nice(lo, hi, count), count)
+        while tz and tz[-1] >= hi:
+            tz.pop()
+        while len(tz) > 1 and tz[1] < lo:
+            tz.pop(0)
+        thresholds = tz
+    return np.sort(np.asarray(thresholds, dtype=float).ravel())
+
+
+def _rings(values, thresholds):
+    """
+    Rings of all thresholds as flat arrays: threshold index, ring start
+    offsets and points (in half cells), ordered along rings.
+    """
+
+    height, width = values.shape
+
+    # Cells (including a border of cells around the grid, such that rings
+    # are closed) are crossed by thresholds in ]min, max] of their corners
+    padded = np.full((height + 2, width + 2), -np.inf)
+    padded[1:-1, 1:-1] = values
+    corners = [padded[1:, :-1], padded[1:, 1:], padded[:-1, 1:], padded[:-1, :-1]]
+    lower = np.minimum(np.minimum(corners[0], corners[1]), np.minimum(corners[2], corners[3]))
+    upper = np.maximum(np.maximum(corners[0], corners[1]), np.maximum(corners[2], corners[3]))
+    first = np.searchsorted(thresholds, lower.ravel(), side="right")
+    counts = np.searchsorted(thresholds, upper.ravel(), side="right") - first
+    cells = np.flatnonzero(counts)
+    counts = counts[cells]
+    cells = np.repeat(cells, counts)
+    level = first[cells] + np.arange(len(cells)) - np.repeat(np.cumsum(counts) - counts, counts)
+    y, x = np.divmod(cells, width + 1)
+
+    # Cases of crossed cells only
+    value = thresholds[level]
+    padded = padded.ravel()
+    top_left = y * (width + 2) + x
+    cases = np.zeros(len(cells), dtype=np.intp)
+    for bit, offset in enumerate((width + 2, width + 3, 1, 0)):
+        cases |= (padded[top_left + offset] >= value) << bit
+
+    # Segments (saddles have two) in half cells
+    second = _case_count[cases] == 2
+    level = np.concatenate([level, level[second]])
+    x = np.concatenate([x, x[second]]) * 2
+    y = np.concatenate([y, y[second]]) * 2
+    offsets = np.concatenate([_case_segments[cases, 0], _case_segments[cases[second], 1]])
+    x0, y0 = x + offsets[:, 0], y + offsets[:, 1]
+    x1, y1 = x + offsets[:, 2], y + offsets[:, 3]
+    n = len(level)
+    if not n:
+        return level, np.zeros(1, dtype=np.intp), np.empty((0, 2), dtype=np.int64)
+
+    # Each point ends exactly one segment and starts exactly one segment:
+    # the successors of segments form cycles, which are the rings
+    def key(level, x, y):
+        return (level * (2*height + 4) + y + 1) * (2*width + 4) + x + 1
+    starts = key(level, x0, y0)
+    order = np.argsort(starts, kind="stable")
+    successor = order[np.searchsorted(starts, key(level, x1, y1), sorter=order)]
+
+    # Rings are labelled with their smallest segment (pointer jumping)
+    label = np.arange(n)
+    jump = successor
+    while True:
+        updated = np.minimum(label, label[jump])
+        if np.array_equal(updated, label):
+            break
+        label, jump = updated, jump[jump]
+
+    # Rank of segments along rings, starting from their label
+    last = label[successor] == successor
+    jump = np.where(last, np.arange(n), successor)
+    distance = (~last).astype(np.intp)
+    while True:
+        done = jump[jump] == jump
+        distance = distance + np.where(done, 0, distance[jump])
+        jump = jump[jump]
+        if done.all():
+            break
+    order = np.lexsort((-distance, label))
+    ring_starts = np.flatnonzero(np.diff(np.concatenate([[-1], label[order]])))
+    points = np.column_stack([x0[order], y0[order]])
+    return level[order][ring_starts], np.append(ring_starts, n), points
+
+
+def _smooth(values, points, levels, thresholds):
+    """
+    Interpolates (in grid coordinates) the points lying on cell edges.
+    """
+
+    height, width = values.shape
+    result = points / 2
+    value = thresholds[levels]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for axis, size in ((0, width), (1, height)):
+            coordinate = result[:, axis].copy()
+            integer = coordinate == np.floor(coordinate)
+            selected = integer & (coordinate > 0) & (coordinate < size)
+            xi = np.floor(result[selected, 0]).astype(np.intp)
+            yi = np.floor(result[selected, 1]).astype(np.intp)
+            v1 = values[yi, xi]
+            v0 = values[yi, xi - 1] if axis == 0 else values[yi - 1, xi]
+            a, b = value[selected] - v0, v1 - v0
+            d = np.where(np.isfinite(a) | np.isfinite(b), a / b, np.sign(a) / np.sign(b))
+            c = coordinate[selected]
+            result[selected, axis] = np.where(np.isnan(d), c, c + d - 0.5)
+    return result
+
+
+def _left(levels, starts, points, level, x, y):
+    """
+    Index of the nearest ring (of the given threshold index) crossed by a ray
+    cast to the left of each point (in half cells), or -1 if there is none.
+    """
+
+    count = len(levels)
+    ring = np.repeat(np.arange(count), np.diff(starts))
+    px, py = points[:, 0], points[:, 1]
+    following = np.arange(1, len(points) + 1)
+    following[starts[1:] - 1] = starts[:-1]
+    xn, yn = px[following], py[following]
+
+    # Segments (in half cells) cross at most one horizontal line, at the
+    # lower end of the segment (half-open rule)
+    crossing = py != yn
+    if not crossing.any():
+        return np.full(len(level), -1)
+    span = max(int(np.abs(points).max()), int(np.abs(x).max(initial=0)),
+               int(np.abs(y).max(initial=0))) * 2 + 4
+    def key(level, y, x):
+        return (level * span + y + span // 2) * span + x + span // 2
+    keys = key(levels[ring[crossing]], np.minimum(py, yn)[crossing],
+               np.where(py < yn, px, xn)[crossing])
+    order = np.argsort(keys, kind="stable")
+    keys, crossed = keys[order], ring[crossing][order]
+
+    query = key(level, y, x)
+    index = np.maximum(np.searchsorted(keys, query) - 1, 0)
+    found = (keys[index] < query) & (keys[index] // span == query // span)
+    return np.where(found, crossed[index], -1)
+
+
+def _parents(levels, starts, points, exterior):
+    """
+    Index of the smallest ring (of the same threshold) enclosing each ring,
+    or -1: holes are enclosed by exteriors and exteriors by holes.
+
+    The nearest ring crossed by a ray cast to the left of the leftmost point
+    of a ring is a boundary of the region around the ring: either the ring
+    enclosing this region or another ring within it, which has the same
+    parent (and whose leftmost point is further left).
+    """
+
+    ring = np.repeat(np.arange(len(levels)), np.diff(starts))
+    leftmost = np.lexsort((points[:, 0], ring))[starts[:-1]]
+    parent = _left(levels, starts, points, levels, points[leftmost, 0], points[leftmost, 1])
+    while True:
+        same = (parent >= 0) & (exterior[parent] == exterior)
+        if not same.any():
+            return parent
+        parent = np.where(same, parent[parent], parent)
+
+
+class Contours(object):
+    """
+    Contour generator: computes contour polygons of a grid of values for the
+    given thresholds (an array, a count or a function of (values, min, max)
+    returning one or the other, Sturges’ formula by default). Values are
+    linearly interpolated between grid points unless smooth is False.
+    """
+
+    def __init__(self, thresholds=None, smooth=True):
+        self._thresholds = thresholds if thresholds is not None else threshold_sturges
+        self._smooth = smooth
+
+    @property
+    def thresholds(self):
+        """ Thresholds (an array, a count or a function) """
+        return self._thresholds
+
+    @thresholds.setter
+    def thresholds(self, thresholds):
+        self._thresholds = thresholds
+
+    @property
+    def smooth(self):
+        """ Whether contours are linearly interpolated """
+        return self._smooth
+
+    @smooth.setter
+    def smooth(self, smooth):
+        self._smooth = smooth
+
+    def _values(self, values):
+        values = np.array(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError("Values must be a 2D array")
+        values[np.isnan(values)] = -np.inf
+        return values
+
+    def _rings(self, values, thresholds):
+        """
+        Rings (arrays of points in grid coordinates) and their threshold
+        index, area, offsets and points in half cells.
+        """
+
+        levels, starts, points = _rings(values, thresholds)
+        if self._smooth:
+            counts = np.diff(starts)
+            coordinates = _smooth(values, points, np.repeat(levels, counts), thresholds)
+        else:
+            coordinates = points / 2
+
+        # Signed areas (in half cells), as d3
+        previous = np.arange(len(points)) - 1
+        previous[starts[:-1]] = starts[1:] - 1
+        px, py = points[previous, 0], points[previous, 1]
+        cross = py * points[:, 0] - px * points[:, 1]
+        areas = np.add.reduceat(cross, starts[:-1]) if len(levels) else np.empty(0)
+
+        # Rings are closed (views of a single array)
+        count = len(levels)
+        ring = np.repeat(np.arange(count), np.diff(starts))
+        closed = np.empty((len(points) + count, 2))
+        closed[np.arange(len(points)) + ring] = coordinates
+        closed[starts[1:] + np.arange(count)] = coordinates[starts[:-1]]
+        rings = np.split(closed, starts[1:-1] + np.arange(1, count)) if count else []
+        return levels, rings, areas, starts, points
+
+    def __call__(self, values):
+        """
+        Returns the contours (MultiPolygon) of values, a 2D array, for all
+        thresholds.
+        """
+        return self._contours(values, _thresholds(values, self._thresholds))
+
+    def contour(self, values, value):
+        """
+        Returns the contour (MultiPolygon) of values for a single threshold.
+        """
+        return self._contours(values, np.array([value], dtype=float))[0]
+
+    def _contours(self, values, thresholds):
+        values = self._values(values)
+        levels, rings, areas, starts, points = self._rings(values, thresholds)
+
+        # Rings of positive area are exteriors, others are holes
+        exterior = areas > 0
+        parents = np.where(exterior, np.arange(len(levels)),
+                           _parents(levels, starts, points, exterior)).tolist()
+        polygons = [[] for _ in thresholds]
+        owners = {}
+        for i, parent in enumerate(parents):
+            if i == parent:
+                owners[i] = [rings[i]]
+                polygons[levels[i]].append(owners[i])
+        for i, parent in enumerate(parents):
+            if i != parent:
+                owners[parent].append(rings[i])
+
+        return [{"type": "MultiPolygon", "value": float(value), "coordinates": polygons[i]}
+                for i, value in enumerate(thresholds.tolist())]
+
+    def isolines(self, values):
+        """
+        Returns the isolines (MultiLineString) of values, a 2D array, for all
+        thresholds: the rings of contours, without their polygon structure
+        (which is cheaper to compute).
+        """
+
+        thresholds = _thresholds(values, self._thresholds)
+        levels, rings = self._rings(self._values(values), thresholds)[:2]
+        lines = [[] for _ in thresholds]
+        for level, ring in zip(levels.tolist(), rings):
+            lines[level].append(ring)
+        return [{"type": "MultiLineString", "value": float(value), "coordinates": lines[i]}
+                for i, value in enumerate(thresholds.tolist())]
+
+    def isobands(self, values):
+        """
+        Returns the isobands (MultiPolygon) of values, a 2D array, between
+        consecutive thresholds: the band of a threshold encloses the points
+        where the value is greater than or equal to this threshold and less
+        than the next one (if any). Band values are (lower, upper) pairs.
+        """
+
+        thresholds = _thresholds(values, self._thresholds)
+        values = self._values(values)
+        levels, rings, areas, starts, points = self._rings(values, thresholds)
+        exterior = areas > 0
+        parents = _parents(levels, starts, points, exterior)
+        count, n = len(levels), len(thresholds)
+
+        # Grid points (odd half cells) on the low and high sides of the edge
+        # crossed by the first point of each ring
+        height, width = values.shape
+        padded = np.full((height + 2, width + 2), -np.inf)
+        padded[1:-1, 1:-1] = values
+        def value(points):
+            return padded[(points[:, 1] + 1) // 2, (points[:, 0] + 1) // 2]
+        first = points[starts[:-1]]
+        offset = np.zeros_like(first)
+        offset[:, 0] = first[:, 0] % 2 == 0
+        offset[:, 1] = 1 - offset[:, 0]
+        above = (value(first + offset) >= thresholds[levels])[:, np.newaxis]
+        high = np.where(above, first + offset, first - offset)
+        low = np.where(above, first - offset, first + offset)
+
+        # Smallest rings of the next threshold enclosing each ring (seen from
+        # its low side) and of the previous threshold (from its high side),
+        # rings of different thresholds never crossing
+        lower, upper = np.flatnonzero(levels < n - 1), np.flatnonzero(levels > 0)
+        level = np.concatenate([levels[lower] + 1, levels[upper] - 1])
+        query = np.concatenate([low[lower], high[upper]])
+        found = _left(levels, starts, points, level, query[:, 0], query[:, 1])
+        inside = value(query) >= thresholds[level]
+        found = np.where((found < 0) | (exterior[found] == inside), found, parents[found])
+        up, down = np.full(count, -1), np.full(count, -1)
+        up[lower], down[upper] = found[:len(lower)], found[len(lower):]
+
+        # Bands are bounded by the exteriors and holes of their lower
+        # threshold and by the (reversed) holes and exteriors of their upper
+        # one. Holes belong to the smallest of the two exteriors enclosing
+        # them, one of each threshold (the exterior of the upper threshold
+        # being a reversed hole, second in keys)
+        hole = ~exterior
+        outer = np.where(hole, parents, down)
+        inner = np.where(hole, up, parents)
+        second = (inner >= 0) & (up[outer] != inner)
+        owners = list(zip(np.where(second, inner, outer).tolist(), second.tolist()))
+        bands = [[] for _ in thresholds]
+        polygons = {}
+        for i, level in enumerate(levels.tolist()):
+            if exterior[i]:
+                polygons[i, False] = [rings[i]]
+                bands[level].append(polygons[i, False])
+            elif level:
+                polygons[i, True] = [rings[i][::-1]]
+                bands[level - 1].append(polygons[i, True])
+        for i, level in enumerate(levels.tolist()):
+            if hole[i]:
+                polygons[owners[i]].append(rings[i])
+            elif level:
+                polygons[owners[i]].append(rings[i][::-1])
+
+        bounds = thresholds.tolist() + [np.inf]
+        return [{"type": "MultiPolygon", "value": (bounds[i], bounds[i + 1]),
+                 "coordinates": bands[i]} for i in range(n)]
+
+
+contours = Contours
+
+
+class ContourDensity(object):
+    """
+    Density estimator: estimates the density of points in a width x height
+    area with a (separable) gaussian approximation of kernel density
+    estimation, on a grid of cells of size cell_size (a power of two), and
+    computes contours of this density. Thresholds (an array, a count or a
+    function) are density values, by default 20 ticks of the density.
+    """
+
+    def __init__(self, size=(960, 500), cell_size=4, bandwidth=20.4939015319192,
+                 thresholds=20):
+        self.size = size
+        self.cell_size = cell_size
+        self.bandwidth = bandwidth
+        self.thresholds = thresholds
+
+    @property
+    def size(self):
+        """ Size (width, height) of the area """
+        return self._size
+
+    @size.setter
+    def size(self, size):
+        width, height = size
+        if not (width >= 0 and height >= 0):
+            raise ValueError("Invalid size")
+        self._size = width, height
+
+    @property
+    def cell_size(self):
+        """ Size of grid cells (floored to a power of two) """
+        return 2 ** self._k
+
+    @cell_size.setter
+    def cell_size(self, size):
+        if not size >= 1:
+            raise ValueError("Invalid cell size")
+        self._k = int(np.floor(np.log2(size)))
+
+    @property
+    def bandwidth(self):
+        """ Standard deviation of the gaussian kernel (approximately) """
+        return np.sqrt(self._radius * (self._radius + 1))
+
+    @bandwidth.setter
+    def bandwidth(self, bandwidth):
+        if not bandwidth >= 0:
+            raise ValueError("Invalid bandwidth")
+        self._radius = int(round((np.sqrt(4 * bandwidth * bandwidth + 1) - 1) / 2))
+
+    def grid(self, x, y, weights=None):
+        """
+        Returns the density grid of points (x, y), weighted if weights are
+        given. The grid covers the area extended by three times the blur
+        radius on each side (see transform).
+        """
+
+        k, r = self._k, self._radius
+        o = r * 3
+        width, height = self._size
+        n, m = (int(width) + o * 2) >> k, (int(height) + o * 2) >> k
+        xi = (np.asarray(x, dtype=float).ravel() + o) * 2.0**-k
+        yi = (np.asarray(y, dtype=float).ravel() + o) * 2.0**-k
+        wi = np.broadcast_to(1.0 if weights is None else np.asarray(weights, dtype=float), xi.shape)
+        with np.errstate(invalid="ignore"):
+            keep = (wi != 0) & (xi >= 0) & (xi < n) & (yi >= 0) & (yi < m)
+        xi, yi, wi = xi[keep], yi[keep], wi[keep]
+
+        # Bilinear splat of points on the four nearest cells
+        x0, y0 = np.floor(xi).astype(np.intp), np.floor(yi).astype(np.intp)
+        xt, yt = xi - x0 - 0.5, yi - y0 - 0.5
+        values = np.zeros((m + 1) * (n + 1))
+        for dx, dy, w in ((0, 0, (1 - xt) * (1 - yt)), (1, 0, xt * (1 - yt)),
+                          (1, 1, xt * yt), (0, 1, (1 - xt) * yt)):
+            values += np.bincount((y0 + dy) * (n + 1) + x0 + dx, w * wi,
+                                  minlength=len(values))
+        # Splats out of the grid (right and bottom) are dropped. This
+        # deliberately differs from d3, whose flat indexing wraps splats out
+        # of the right edge into the first cell of the next row
+        values = values.reshape(m + 1, n + 1)[:m, :n]
+        return blur2(values, r * 2.0**-k)
+
+    def transform(self, points):
+        """
+        Converts points from grid coordinates to area coordinates.
+        """
+        return np.asarray(points) * 2**self._k - self._radius * 3
+
+    def __call__(self, x, y, weights=None):
+        """
+        Returns the contours (MultiPolygon) of the density of points (x, y)
+        in area coordinates, values being densities (per squared pixel).
+        """
+
+        values = self.grid(x, y, weights)
+        scale = 2.0 ** (2 * self._k)
+        tz = self.thresholds
+        if callable(tz):
+            tz = tz(values, *extent(values))
+        if np.ndim(tz) == 0:
+            tz = ticks(5e-324, values.max() / scale, int(tz)) if values.max() > 0 else []
+        tz = np.asarray(tz, dtype=float)
+        geometries = Contours(tz * scale)(values)
+        for geometry, value in zip(geometries, tz.tolist()):
+            geometry["value"] = value
+            geometry["coordinates"] = [[self.transform(ring) for ring in polygon]
+                                       for polygon in geometry["coordinates"]]
+        return geometries
+
+
+contour_density = ContourDensity
+
+
+def path(geometry, digits=3):
+    """
+    Returns the SVG path data of a contour (MultiPolygon) or isolines
+    (MultiLineString), rings being closed.
+    """
+
+    rings = geometry["coordinates"]
+    if geometry["type"] == "MultiPolygon":
+        rings = [ring for polygon in rings for ring in polygon]
+    if not rings:
+        return None
+    # Closing points are replaced by a close command
+    lengths = np.array([len(ring) - 1 for ring in rings])
+    points = np.concatenate([ring[:-1] for ring in rings])
+    total = 2 * len(points) + len(rings)
+
+    # Tokens of ring i start at offset 2*starts[i] + i
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    ring_of = np.repeat(np.arange(len(rings)), lengths)
+    offsets = 2 * np.arange(len(points)) + ring_of
+    prefixes = np.full(total, ord("Z"), dtype=np.uint8)
+    prefixes[offsets] = ord("L")
+    prefixes[2 * starts + np.arange(len(rings))] = ord("M")
+    prefixes[offsets + 1] = ord(",")
+    values = np.zeros(total)
+    values[offsets] = points[:, 0]
+    values[offsets + 1] = points[:, 1]
+    numbered = np.zeros(total, dtype=bool)
+    numbered[offsets] = numbered[offsets + 1] = True
+    return shape._write(prefixes, values, numbered, digits)
@@ -0,0 +1,128 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+Decimation of series before shape generation.
+
+When a series has many more points than its axis has pixels, most of them
+are wasted work for the line generator and the renderer. Decimation selects
+the points worth drawing, once the series has been mapped to pixels::
+
+   x, y = xscale(t), yscale(values)          # 50M points
+   index = decimate.m4(x, y, xscale.range)   # at most 4 points per pixel
+   path = shape.line()(x[index], y[index])
+
+M4 keeps the first, last, minimum and maximum point of each pixel column,
+which yields the same rasterized line as the full series. LTTB (largest
+triangle three buckets) keeps a given number of points that preserve the
+visual shape of the series, at the cost of exactness.
+
+Both functions return the (sorted) indices of the points to keep, such that
+other arrays (colors, sizes, etc.) can be decimated alike.
+"""
+import numpy as np
+
+
+def m4(x, y, range=None):
+    """
+    Returns the indices of the first, last, minimum and maximum points of
+    each pixel column (x being in pixels). Columns are the runs of
+    consecutive points falling in the same pixel, hence x is expected to be
+    monotonic for an effective decimation (but results are exact anyway).
+
+    If a range (e.g. the range of the x scale) is given, all points before
+    (after) the range fall in the same column. Undefined points (NaN
+    coordinates) are all kept.
+    """
+
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    n = len(x)
+    if n < 5:
+        return np.arange(n)
+
+    valid = np.isfinite(x) & np.isfinite(y)
+    columns = np.floor(np.where(valid, x, 0))
+    if range is not None:
+        start, stop = min(range[0], range[-1]), max(range[0], range[-1])
+        columns = np.clip(columns - np.floor(start), -1, np.ceil(stop - start) + 1)
+
+    # Groups of consecutive points in the same column (undefined points are
+    # alone in their group)
+    boundaries = np.ones(n, dtype=bool)
+    boundaries[1:] = (columns[1:] != columns[:-1]) | ~valid[1:] | ~valid[:-1]
+    starts = np.flatnonzero(boundaries)
+    stops = np.append(starts[1:], n)
+    if len(starts) * 4 >= n:
+        return np.arange(n)
+
+    values = np.where(valid, y, 0)
+    lengths = stops - starts
+    index = np.arange(n)
+    minimum = values == np.repeat(np.minimum.reduceat(values, starts), lengths)
+    maximum = values == np.repeat(np.maximum.reduceat(values, starts), lengths)
+    first_minimum = np.minimum.reduceat(np.where(minimum, index, n), starts)
+    first_maximum = np.minimum.reduceat(np.where(maximum, index, n), starts)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[starts] = True
+    keep[stops - 1] = True
+    keep[first_minimum] = True
+    keep[first_maximum] = True
+    return np.flatnonzero(keep)
+
+
+def lttb(x, y, threshold):
+    """
+    Returns the indices of threshold points selected with the largest
+    triangle three buckets algorithm: the first and last points are kept and
+    the other points are split in threshold - 2 buckets, from each of which
+    the point forming the largest triangle with the previously selected
+    point and the average of the next bucket is kept. Coordinates are
+    expected to be defined.
+
+    Bucket bounds and averages are computed at once, but the point selected
+    in a bucket depends on the point selected in the previous one: this
+    takes threshold - 2 Python iterations, each of them reducing a bucket
+    (a view of the coordinates) in preallocated buffers.
+    """
+
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    n = len(x)
+    threshold = int(threshold)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket bounds and averages (the average after the last bucket is the
+    # last point)
+    bounds = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(int) + 1
+    bounds[-1] = n - 1
+    sums_x = np.add.reduceat(x[:-1], bounds[:-1])
+    sums_y = np.add.reduceat(y[:-1], bounds[:-1])
+    lengths = np.diff(bounds)
+    average_x = np.append(sums_x / lengths, x[-1])[1:].tolist()
+    average_y = np.append(sums_y / lengths, y[-1])[1:].tolist()
+
+    # Areas of bucket points are computed in preallocated buffers
+    size = int(lengths.max())
+    areas, other = np.empty(size), np.empty(size)
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    starts, stops = bounds[:-1].tolist(), bounds[1:].tolist()
+    for i in range(threshold - 2):
+        start, stop = starts[i], stops[i]
+        ax, ay = x[a], y[a]
+        area, temporary = areas[:stop - start], other[:stop - start]
+        np.subtract(y[start:stop], ay, out=area)
+        area *= ax - average_x[i]
+        np.subtract(ax, x[start:stop], out=temporary)
+        temporary *= average_y[i] - ay
+        area -= temporary
+        np.abs(area, out=area)
+        a = start + int(area.argmax())
+        selected[i+1] = a
+    return selected
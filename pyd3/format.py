@@ -0,0 +1,613 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of the `d3-format
+<https://github.com/d3/d3-format>`_ javascript module.
+
+Ever noticed how sometimes floating point numbers don’t display the way you
+expect? For example, 0.1 * 3 displays 0.30000000000000004. Yet rounding
+numbers is only one aspect of number formatting: you may also want grouping
+by thousands, fixed or significant precision, SI prefixes or currencies::
+
+   format(".0%")(0.123)   # rounded percentage, "12%"
+   format("$.2f")(3.5)    # localized fixed-point currency, "$3.50"
+   format("+20")(42)      # space-filled and signed, "                 +42"
+   format(".^20")(42)     # dot-filled and centered, ".........42........."
+   format(".2s")(42e6)    # SI-prefix with two significant digits, "42M"
+   format("#x")(48879)    # prefixed lowercase hexadecimal, "0xbeef"
+   format(",.2r")(4223)   # grouped thousands with two significant digits, "4,200"
+
+A specifier is parsed once into a formatter (formatters are cached by
+specifier) that accepts a single number or whole arrays of numbers. Arrays
+are formatted in a single pass, with the digits produced by the python (C)
+number formatting, and returned as numpy string arrays::
+
+   format(",.2f")(np.array([1234.5, -0.001]))  # ["1,234.50", "0.00"]
+
+As in d3, negative numbers use the minus sign (U+2212) by default, which can
+be changed by using another locale.
+"""
+import re
+import math
+from fractions import Fraction
+import numpy as np
+
+py_format = format
+
+
+# [[fill]align][sign][symbol][0][width][,][.precision][~][type]
+_specifier = re.compile(
+    r"^(?:(.)?([<>=^]))?([+\-( ])?([$#])?(0)?(\d+)?(,)?(\.\d+)?(~)?([a-z%])?$", re.I)
+
+# SI prefixes from yocto (1e-24) to yotta (1e24)
+_prefixes = ["y", "z", "a", "f", "p", "n", "µ", "m", "", "k",
+             "M", "G", "T", "P", "E", "Z", "Y"]
+
+
+class FormatSpecifier(object):
+    """
+    Parsed format specifier, whose fields (fill, align, sign, symbol, zero,
+    width, comma, precision, trim and type) can be modified before being
+    passed to format (str(specifier) returns the equivalent specifier).
+    Fields that are not given are None (False for flags, "" for the type).
+    """
+
+    def __init__(self, specifier=""):
+        if isinstance(specifier, FormatSpecifier):
+            specifier = str(specifier)
+        match = _specifier.match(specifier)
+        if match is None:
+            raise ValueError("Invalid format: %s" % specifier)
+        fill, align, sign, symbol, zero, width, comma, precision, trim, type = match.groups()
+        self.fill = fill
+        self.align = align
+        self.sign = sign
+        self.symbol = symbol
+        self.zero = zero is not None
+        self.width = int(width) if width is not None else None
+        self.comma = comma is not None
+        self.precision = int(precision[1:]) if precision is not None else None
+        self.trim = trim is not None
+        self.type = type if type is not None else ""
+
+    def __str__(self):
+        return ((self.fill or "") + (self.align or "")
+                + (self.sign or "") + (self.symbol or "")
+                + ("0" if self.zero else "")
+                + (str(max(1, self.width)) if self.width is not None else "")
+                + ("," if self.comma else "")
+                + ("." + str(max(0, self.precision)) if self.precision is not None else "")
+                + ("~" if self.trim else "")
+                + self.type)
+
+    def __repr__(self):
+        return "FormatSpecifier(%r)" % str(self)
+
+    def copy(self):
+        """ Returns a copy of this specifier """
+        return FormatSpecifier(str(self))
+
+
+# Decimal notations of a non negative number x with precision p, as computed
+# by javascript (toFixed, toExponential, toPrecision). Python rounds exact
+# ties to even while javascript rounds them up (e.g. 2.5 to 3): ties are
+# detected in floating point and confirmed with exact fractions.
+
+def _tie(x, k):
+    """
+    Whether x * 10^k lies exactly halfway between two integers, in which
+    case the lower one is returned.
+    """
+    # x = (n + 1/2) / 10^k is a binary float only if 5^k divides 2n+1 < 2^54
+    if not -308 <= k <= 23:
+        return None
+    t = x * 10.0**k if k >= 0 else x / 10.0**-k
+    n = math.floor(t)
+    if t - n == 0.5 and (Fraction(x) * Fraction(10)**k).denominator == 2:
+        return n
+    return None
+
+def _decimal_parts(x, p=None):
+    """
+    Significant digits (p of them if given) and decimal exponent of x, such
+    that x ≈ 0.digits * 10^(exponent+1).
+    """
+    if not p:
+        # Shortest representation, as javascript toExponential()
+        s = np.format_float_scientific(float(x))
+        mantissa, exponent = s.split("e")
+        return mantissa.replace(".", ""), int(exponent)
+    mantissa, exponent = py_format(x, ".%de" % (p - 1)).split("e")
+    digits, exponent = mantissa.replace(".", ""), int(exponent)
+    n = _tie(x, p - 1 - exponent)
+    if n is not None:
+        digits = str(n + 1)
+        if len(digits) > p:
+            digits, exponent = digits[:p], exponent + 1
+    return digits, exponent
+
+def exponent(x):
+    """ Decimal exponent of x (e.g. 2 for 123.4) """
+    x = abs(x)
+    if not math.isfinite(x) or x == 0:
+        return 0
+    return _decimal_parts(x)[1]
+
+def _exponential(x, p):
+    digits, exponent = _decimal_parts(x, p + 1)
+    return "%s%se%+d" % (digits[0], "." + digits[1:] if p else "", exponent)
+
+def _fixed(x, p):
+    n = _tie(x, p)
+    if n is None:
+        return py_format(x, ".%df" % p)
+    digits = str(n + 1).rjust(p + 1, "0")
+    return digits[:-p] + "." + digits[-p:] if p else digits
+
+def _precision(x, p):
+    digits, exponent = _decimal_parts(x, p)
+    if -6 <= exponent < p:
+        if exponent < 0:
+            return "0." + "0"*(-exponent-1) + digits
+        if exponent + 1 < p:
+            return digits[:exponent+1] + "." + digits[exponent+1:]
+        return digits
+    return "%s%se%+d" % (digits[0], "." + digits[1:] if p > 1 else "", exponent)
+
+def _rounded(x, p):
+    digits, exponent = _decimal_parts(x, p)
+    if exponent < 0:
+        return "0." + "0"*(-exponent-1) + digits
+    if len(digits) > exponent + 1:
+        return digits[:exponent+1] + "." + digits[exponent+1:]
+    return digits + "0"*(exponent - len(digits) + 1)
+
+def _prefix_auto(x, p):
+    """
+    Formats x with p significant digits and the SI prefix of its magnitude,
+    returns the digits and the prefix.
+    """
+    digits, exponent = _decimal_parts(x, p)
+    prefix = max(-8, min(8, exponent // 3))
+    i = exponent - prefix*3 + 1
+    n = len(digits)
+    if i == n:
+        value = digits
+    elif i > n:
+        value = digits + "0"*(i - n)
+    elif i > 0:
+        value = digits[:i] + "." + digits[i:]
+    else:
+        # Less than 1 yocto
+        value = "0." + "0"*(-i) + _decimal_parts(x, max(0, p + i - 1))[0]
+    return value, _prefixes[8 + prefix]
+
+def _round(x):
+    return int(math.floor(x + 0.5))
+
+_format_types = {
+    "%": lambda x, p: _fixed(x*100, p),
+    "b": lambda x, p: py_format(_round(x), "b"),
+    "c": lambda x, p: str(x),
+    "d": lambda x, p: str(_round(x)),
+    "e": _exponential,
+    "f": _fixed,
+    "g": _precision,
+    "o": lambda x, p: py_format(_round(x), "o"),
+    "p": lambda x, p: _rounded(x*100, p),
+    "r": _rounded,
+    "s": _prefix_auto,
+    "X": lambda x, p: py_format(_round(x), "X"),
+    "x": lambda x, p: py_format(_round(x), "x"),
+}
+
+def _fixed_many(values, p, comma=False):
+    """
+    Fixed notation of an array of non negative values, with python
+    grouping of thousands if comma is true.
+    """
+    spec = (",.%df" if comma else ".%df") % p
+    strings = [py_format(x, spec) for x in values.tolist()]
+    with np.errstate(invalid='ignore', over='ignore'):
+        t = values * 10.0**p
+        candidates = np.flatnonzero(t - np.floor(t) == 0.5)
+    for i in candidates.tolist():
+        integer, dot, decimals = _fixed(float(values[i]), p).partition(".")
+        strings[i] = py_format(int(integer), ",d" if comma else "d") + dot + decimals
+    return strings
+
+def _integer_many(values, comma=False):
+    """
+    Rounded integer notation of an array of non negative values.
+    """
+    spec = ",d" if comma else "d"
+    with np.errstate(invalid='ignore'):
+        rounded = np.floor(values + 0.5)
+    if len(rounded) and np.all(np.isfinite(rounded)) and rounded.max() < 2**63:
+        return [py_format(n, spec) for n in rounded.astype(np.int64).tolist()]
+    return [py_format(int(n), spec) if math.isfinite(n) else "" for n in rounded.tolist()]
+
+_scientific = re.compile(r"^(\d)\.?(\d*)e([+-]\d+)$", re.M)
+
+def _decimal_parts_many(values, p):
+    """
+    Significant digits (a list) and decimal exponents (an array) of an
+    array of non negative values (see _decimal_parts).
+    """
+    spec = ".%de" % (p - 1)
+    parts = _scientific.findall("\n".join([py_format(x, spec) for x in values.tolist()]))
+    digits = [first + others for first, others, _ in parts]
+    exponents = np.array([exponent for _, _, exponent in parts], dtype=int).reshape(-1)
+    k = p - 1 - exponents
+    with np.errstate(invalid='ignore', over='ignore'):
+        t = np.where(k >= 0, values * 10.0**np.maximum(k, 0), values / 10.0**np.maximum(-k, 0))
+        candidates = np.flatnonzero(t - np.floor(t) == 0.5)
+    for i in candidates.tolist():
+        digits[i], exponents[i] = _decimal_parts(float(values[i]), p)
+    return digits, exponents
+
+def _exponential_many(values, p):
+    digits, exponents = _decimal_parts_many(values, p + 1)
+    return ["%s%se%+d" % (d[0], "." + d[1:] if p else "", e)
+            for d, e in zip(digits, exponents.tolist())]
+
+def _precision_many(values, p):
+    digits, exponents = _decimal_parts_many(values, p)
+    return ["0." + "0"*(-e-1) + d if -6 <= e < 0 else
+            d[:e+1] + "." + d[e+1:] if 0 <= e < p - 1 else
+            d if e == p - 1 else
+            "%s%se%+d" % (d[0], "." + d[1:] if p > 1 else "", e)
+            for d, e in zip(digits, exponents.tolist())]
+
+def _rounded_many(values, p):
+    digits, exponents = _decimal_parts_many(values, p)
+    return ["0." + "0"*(-e-1) + d if e < 0 else
+            d[:e+1] + "." + d[e+1:] if len(d) > e + 1 else
+            d + "0"*(e - len(d) + 1)
+            for d, e in zip(digits, exponents.tolist())]
+
+def _prefix_many(values, p):
+    """
+    SI notation of an array of non negative values (see _prefix_auto):
+    returns the digits and the prefixes (lists).
+    """
+    digits, exponents = _decimal_parts_many(values, p)
+    prefixes = np.clip(exponents // 3, -8, 8)
+    positions = (exponents - prefixes*3 + 1).tolist()
+    strings = [d if i == len(d) else
+               d + "0"*(i - len(d)) if i > len(d) else
+               d[:i] + "." + d[i:] if i > 0 else None
+               for d, i in zip(digits, positions)]
+    for i in [i for i, s in enumerate(strings) if s is None]:
+        strings[i] = _prefix_auto(float(values[i]), p)[0]
+    return strings, [_prefixes[8 + k] for k in prefixes.tolist()]
+
+# Formatting of arrays of non negative values, python groups the integer
+# part of fixed and integer notations (if comma is true)
+_format_many = {
+    "%": lambda values, p, comma: _fixed_many(values*100, p, comma),
+    "d": lambda values, p, comma: _integer_many(values, comma),
+    "e": lambda values, p, comma: _exponential_many(values, p),
+    "f": _fixed_many,
+    "g": lambda values, p, comma: _precision_many(values, p),
+    "p": lambda values, p, comma: _rounded_many(values*100, p),
+    "r": lambda values, p, comma: _rounded_many(values, p),
+    "s": lambda values, p, comma: _prefix_many(values, p),
+}
+_native_grouping = frozenset("%df")
+
+_integer_part = re.compile(r"^(\d*)(.*)$", re.M)
+_trailing_zeros = re.compile(r"^(\d*)(?:\.(\d*?)0*|\.)(?=[^\d\n]|$)", re.M)
+
+def _trim(strings):
+    """
+    Removes insignificant trailing zeros of the decimal part of strings.
+    """
+    lines = _trailing_zeros.sub(lambda m: m.group(1) + ("." + m.group(2) if m.group(2) else ""),
+                                "\n".join(strings))
+    return lines.split("\n")
+
+
+class Format(object):
+    """
+    Compiled formatter of a specifier in a given locale. Formatting a
+    number returns a string, formatting an array (or a list) returns a
+    numpy array of strings of the same shape.
+    """
+
+    def __init__(self, locale, specifier):
+        specifier = FormatSpecifier(specifier)
+        self._specifier = specifier
+        fill, align = specifier.fill or " ", specifier.align or ">"
+        sign, symbol = specifier.sign or "-", specifier.symbol or ""
+        zero, width = specifier.zero, specifier.width
+        comma, precision = specifier.comma, specifier.precision
+        trim, type = specifier.trim, specifier.type
+
+        # The "n" type is an alias for ",g"
+        if type == "n":
+            comma, type = True, "g"
+        # The default type is "g" with trimmed zeros
+        elif type not in _format_types:
+            if precision is None:
+                precision = 12
+            trim, type = True, "g"
+
+        # Zero fill with the sign before padding
+        if zero or (fill == "0" and align == "="):
+            zero, fill, align = True, "0", "="
+
+        # Prefix and suffix
+        if symbol == "$":
+            prefix, suffix = locale.currency
+        else:
+            prefix = "0" + type.lower() if symbol == "#" and type in "boxX" else ""
+            suffix = locale.percent if type in "%p" else ""
+
+        # Precision: significant digits for gprs, decimal places otherwise
+        if precision is None:
+            precision = 6
+        elif type in "gprs":
+            precision = max(1, min(21, precision))
+        else:
+            precision = max(0, min(20, precision))
+
+        self._locale = locale
+        self._type = type
+        self._precision = precision
+        self._trim = trim
+        self._paren = sign == "("
+        self._positive = (sign if sign not in "-(" else "") + prefix
+        self._negative = ("(" if sign == "(" else locale.minus) + prefix
+        self._keep_zero_sign = sign == "+"
+        self._prefix, self._suffix = prefix, suffix
+        self._fill, self._align, self._zero = fill, align, zero
+        self._width = width if width is not None else 0
+
+        # Grouping is made by python (then translated) when possible, by the
+        # locale on the integer part (before the decimal point or exponent)
+        # otherwise. Without grouping, only the decimal point is translated.
+        self._comma = comma
+        native = (type in _native_grouping and not trim and not (comma and zero)
+                  and set(locale.grouping) == {3})
+        self._native_comma = comma and native
+        self._group = comma and not self._native_comma
+        self._split = self._group and type in "defgprs%"
+        self._function = _format_many.get(type) or (
+            lambda values, p, comma, f=_format_types[type]: [f(x, p) for x in values.tolist()])
+        table = {}
+        if locale.decimal != ".":
+            table["."] = locale.decimal
+        if self._native_comma and locale.thousands != ",":
+            table[","] = locale.thousands
+        self._translation = str.maketrans(table) if table and not self._split else None
+
+    @property
+    def specifier(self):
+        """ Parsed specifier (a copy) """
+        return self._specifier.copy()
+
+    def __repr__(self):
+        return "Format(%r)" % str(self._specifier)
+
+    def _strings(self, values):
+        """
+        Formatted absolute values (digits, decimal part and exponent) and
+        their suffixes. All values are processed at each step.
+        """
+
+        strings = self._function(values, self._precision, self._native_comma)
+        suffixes = None
+        if self._type == "s":
+            strings, prefixes = strings
+            suffixes = [si + self._suffix for si in prefixes]
+        if self._trim:
+            strings = _trim(strings)
+        return strings, suffixes
+
+    def _format(self, values):
+        """
+        Formats a list of values and returns a list of strings.
+        """
+
+        locale = self._locale
+        n = len(values)
+        if self._type == "c":
+            prefixes = [self._prefix] * n
+            integers = [""] * n
+            suffixes = [str(value) + self._suffix for value in values]
+        else:
+            values = np.array(values, dtype=float)
+            absolute = np.abs(values)
+            finite = np.isfinite(values)
+            strings, suffixes = self._strings(np.where(finite, absolute, 0))
+            for i in np.flatnonzero(~finite).tolist():
+                strings[i] = locale.nan if values[i] != values[i] else "Infinity"
+
+            # A negative value that rounds to zero is zero (unless signed)
+            negative = np.signbit(values) & ~np.isnan(values)
+            if not self._keep_zero_sign:
+                for i in np.flatnonzero(negative & (absolute < 1)).tolist():
+                    negative[i] = absolute[i] != 0 and bool(strings[i].strip("0."))
+            negative = negative.tolist()
+            prefixes = [self._negative if sign else self._positive for sign in negative]
+            if suffixes is None:
+                suffixes = [self._suffix] * n
+            if self._paren:
+                suffixes = [s + ")" if sign else s for s, sign in zip(suffixes, negative)]
+            if self._translation is not None:
+                strings = [s.translate(self._translation) for s in strings]
+
+            # Decimal part and exponent are not grouped
+            if self._split:
+                parts = _integer_part.findall("\n".join(strings))
+                integers = [integer for integer, _ in parts]
+                decimal = locale.decimal
+                suffixes = [(decimal + rest[1:] if rest[:1] == "." else rest) + s
+                            for (_, rest), s in zip(parts, suffixes)]
+            else:
+                integers = strings
+
+        if self._group and not self._zero:
+            integers = [locale._group(value, math.inf) for value in integers]
+
+        # Padding
+        width = self._width
+        if not width:
+            return [p + i + s for p, i, s in zip(prefixes, integers, suffixes)]
+        fill, align = self._fill, self._align
+        strings = []
+        for prefix, value, suffix in zip(prefixes, integers, suffixes):
+            length = len(prefix) + len(value) + len(suffix)
+            padding = fill * (width - length) if length < width else ""
+            if self._group and self._zero:
+                value = locale._group(padding + value, width - len(suffix) if padding else math.inf)
+                padding = ""
+            if align == "<":
+                strings.append(prefix + value + suffix + padding)
+            elif align == "=":
+                strings.append(prefix + padding + value + suffix)
+            elif align == "^":
+                k = len(padding) // 2
+                strings.append(padding[:k] + prefix + value + suffix + padding[k:])
+            else:
+                strings.append(padding + prefix + value + suffix)
+        return strings
+
+    def __call__(self, values):
+        """
+        Formats a number or an array of numbers.
+        """
+
+        if isinstance(values, (int, float, str)):
+            return self._format([values])[0]
+        values = np.asarray(values)
+        if values.ndim == 0:
+            return self._format([values.item()])[0]
+        strings = self._format(values.ravel().tolist())
+        return np.array(strings, dtype=str).reshape(values.shape)
+
+
+class FormatPrefix(object):
+    """
+    Formatter with a fixed SI prefix (see format_prefix).
+    """
+
+    def __init__(self, locale, specifier, value):
+        specifier = FormatSpecifier(specifier)
+        specifier.type = "f"
+        self._format = locale.format(specifier)
+        e = max(-8, min(8, exponent(value) // 3)) * 3
+        self._k = math.pow(10, -e)
+        self._prefix = _prefixes[8 + e // 3]
+
+    def __call__(self, values):
+        if isinstance(values, (int, float)):
+            return self._format(self._k * values) + self._prefix
+        values = np.asarray(values, dtype=float)
+        strings = self._format(self._k * values)
+        if values.ndim == 0:
+            return strings + self._prefix
+        return np.char.add(strings, self._prefix)
+
+
+class FormatLocale(object):
+    """
+    A locale definition: decimal point, group separator, grouping sizes
+    (from right to left, repeated), currency prefix and suffix, minus sign,
+    percent sign and representation of not-a-number.
+    """
+
+    def __init__(self, decimal=".", thousands=",", grouping=[3], currency=["$", ""],
+                 minus="−", percent="%", nan="NaN"):
+        self.decimal = decimal
+        self.thousands = thousands
+        self.grouping = list(grouping)
+        self.currency = tuple(currency)
+        self.minus = minus
+        self.percent = percent
+        self.nan = nan
+        self._cache = {}
+
+    def _group(self, value, width):
+        """
+        Inserts thousands separators in the digits of value, truncating to
+        the given width.
+        """
+        grouping = self.grouping
+        i, groups, j, length = len(value), [], 0, 0
+        g = grouping[0] if grouping else 0
+        while i > 0 and g > 0:
+            if length + g + 1 > width:
+                g = max(1, int(width - length))
+            groups.append(value[max(0, i-g):i])
+            i -= g
+            length += g + 1
+            if length > width:
+                break
+            j = (j + 1) % len(grouping)
+            g = grouping[j]
+        return self.thousands.join(reversed(groups))
+
+    def format(self, specifier):
+        """
+        Returns a new format function for the given specifier (cached).
+        """
+        key = str(specifier)
+        try:
+            return self._cache[key]
+        except KeyError:
+            formatter = self._cache[key] = Format(self, key)
+            return formatter
+
+    def format_prefix(self, specifier, value):
+        """
+        Equivalent to format, except the returned function converts values to
+        the units of the SI prefix of the given reference value (the type of
+        specifier is always "f").
+        """
+        return FormatPrefix(self, specifier, value)
+
+
+def precision_fixed(step):
+    """
+    Returns a suggested decimal precision for fixed point notation given the
+    specified numeric step value, i.e. the minimum absolute difference
+    between values that will be formatted.
+    """
+    return max(0, -exponent(abs(step)))
+
+def precision_prefix(step, value):
+    """
+    Returns a suggested decimal precision for use with format_prefix given
+    the specified numeric step and reference value.
+    """
+    return max(0, max(-8, min(8, exponent(value) // 3)) * 3 - exponent(abs(step)))
+
+def precision_round(step, value):
+    """
+    Returns a suggested decimal precision for format types that round to
+    significant digits given the specified numeric step and max values.
+    """
+    step = abs(step)
+    precision = exponent(abs(value) - step) - exponent(step)
+    return (precision if precision > 0 else 0) + 1
+
+
+default_locale = FormatLocale()
+
+def format(specifier):
+    """
+    Returns a new format function for the given specifier in the default
+    locale (see FormatLocale.format).
+    """
+    return default_locale.format(specifier)
+
+def format_prefix(specifier, value):
+    """
+    Returns a new format function with a fixed SI prefix in the default
+    locale (see FormatLocale.format_prefix).
+    """
+    return default_locale.format_prefix(specifier, value)
@@ -0,0 +1,339 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of the `d3-hexbin
+<https://github.com/d3/d3-hexbin>`_ javascript module.
+
+Hexagonal binning is useful for aggregating data into a coarser
+representation for display. Rather than rendering a scatterplot of tens of
+thousands of points, bin the points into a few hundred hexagons to show the
+distribution. Points are given as arrays of coordinates, already mapped to
+pixels by scales::
+
+   h = hexbin.hexbin(radius=10, extent=[[0, 0], [960, 500]])
+   bins = h(x(data_x), y(data_y))
+   color = scale.sequential([0, bins.count.max()], "viridis")
+   # Each bin is drawn as: "M%s,%s%s" % (bins.x[k], bins.y[k], h.hexagon())
+
+Hexagons of all points are computed at once and counts (or sums of weights)
+are aggregated with bincount. When points do not fit in memory, counts of
+the hexagons covering the extent can be accumulated chunk by chunk (and
+merged across workers) with HexbinCounts.
+"""
+import math
+import collections
+import numpy as np
+from pyd3 import shape
+
+
+Bins = collections.namedtuple("Bins", [
+    "x",        # x coordinates of hexagon centers
+    "y",        # y coordinates of hexagon centers
+    "count",    # number of points in each hexagon
+    "sum"])     # sum of weights of points in each hexagon (None if unweighted)
+
+
+class Hexbin(object):
+    """
+    Hexbin generator with the given radius (of hexagons) and extent
+    [[x0, y0], [x1, y1]] (used by centers, mesh and HexbinCounts). Paths
+    are written with the given number of digits.
+    """
+
+    # Points are binned by chunks such that temporary arrays are bounded
+    _chunk_size = 2**20
+
+    def __init__(self, radius=1, extent=((0, 0), (1, 1)), digits=3):
+        self.radius = radius
+        self.extent = extent
+        self.digits = digits
+
+    @property
+    def radius(self):
+        """ Radius of hexagons """
+        return self._radius
+
+    @radius.setter
+    def radius(self, radius):
+        self._radius = float(radius)
+        self._dx = self._radius * 2 * math.sin(math.pi / 3)
+        self._dy = self._radius * 1.5
+
+    @property
+    def extent(self):
+        """ Extent [[x0, y0], [x1, y1]] of the binned area """
+        return [list(self._extent[0]), list(self._extent[1])]
+
+    @extent.setter
+    def extent(self, extent):
+        (x0, y0), (x1, y1) = extent
+        self._extent = (float(x0), float(y0)), (float(x1), float(y1))
+
+    @property
+    def digits(self):
+        """ Number of digits of paths numbers (None for exact numbers) """
+        return self._digits
+
+    @digits.setter
+    def digits(self, digits):
+        self._digits = digits
+
+    @property
+    def size(self):
+        """ Size [width, height] of the extent """
+        (x0, y0), (x1, y1) = self._extent
+        return [x1 - x0, y1 - y0]
+
+    @size.setter
+    def size(self, size):
+        self.extent = (0, 0), size
+
+    def _locate(self, x, y):
+        """
+        Hexagon indices (i, j) of points, as floats (NaN if undefined).
+        """
+
+        with np.errstate(invalid="ignore"):
+            py = np.multiply(y, 1 / self._dy)
+            pj = np.floor(py + 0.5)
+            py -= pj
+            odd = np.remainder(pj, 2)
+            px = np.multiply(x, 1 / self._dx)
+            px -= 0.5 * odd
+            pi = np.floor(px + 0.5)
+            px -= pi
+
+            # Points near the pointy tops of hexagons may belong to the
+            # neighbouring row: only those are tested. Unlike d3, distances
+            # are euclidean ((dy/dx)^2 = 3/4) such that points are binned in
+            # the hexagon of the nearest center.
+            near = np.flatnonzero(np.abs(py) > 1 / 3)
+            px1, py1 = px[near], py[near]
+            sx, sy = np.copysign(0.5, px1), np.copysign(1, py1)
+            px2, py2 = px1 - sx, py1 - sy
+            other = px1 * px1 + 0.75 * py1 * py1 > px2 * px2 + 0.75 * py2 * py2
+            near = near[other]
+            pi[near] += sx[other] + odd[near] - 0.5
+            pj[near] += sy[other]
+        return pi, pj
+
+    def index(self, x, y):
+        """
+        Returns the hexagon indices (i, j) of points (x, y), as integer
+        arrays, j being the row and i the column. Undefined points are
+        indexed (0, 0).
+        """
+
+        pi, pj = self._locate(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        pi = np.nan_to_num(pi, nan=0, posinf=0, neginf=0).astype(np.int64)
+        pj = np.nan_to_num(pj, nan=0, posinf=0, neginf=0).astype(np.int64)
+        return pi, pj
+
+    def center(self, i, j):
+        """
+        Returns the center (x, y) of hexagons of indices (i, j).
+        """
+        i, j = np.asarray(i), np.asarray(j)
+        return (i + (j % 2) / 2) * self._dx, j * self._dy
+
+    def _bounds(self, x0, y0, x1, y1):
+        """
+        Range of hexagon indices (i0, j0, columns, rows) covering a region.
+        """
+        j0 = int(np.floor(y0 / self._dy + 0.5)) - 1
+        j1 = int(np.floor(y1 / self._dy + 0.5)) + 1
+        i0 = int(np.floor(x0 / self._dx)) - 1
+        i1 = int(np.floor(x1 / self._dx + 0.5)) + 1
+        return i0, j0, i1 - i0 + 1, j1 - j0 + 1
+
+    def _accumulate(self, bounds, x, y, weights, counts, sums):
+        """
+        Adds points, by chunks, to counts and sums of the hexagons of bounds
+        (flat arrays, row major). Points out of bounds are ignored.
+        """
+
+        i0, j0, columns, rows = bounds
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if weights is not None:
+            weights = np.broadcast_to(np.asarray(weights, dtype=float), x.shape)
+        size = columns * rows + 1
+        for start in range(0, len(x), self._chunk_size):
+            stop = start + self._chunk_size
+            i, j = self._locate(x[start:stop], y[start:stop])
+            i -= i0
+            j -= j0
+            # Points out of bounds (or undefined) go to a discarded last hexagon
+            with np.errstate(invalid="ignore"):
+                inside = (i >= 0) & (i < columns) & (j >= 0) & (j < rows)
+            index = np.where(inside, j * columns + i, size - 1).astype(np.intp)
+            counts += np.bincount(index, minlength=size)[:-1]
+            if weights is not None:
+                sums += np.bincount(index, weights[start:stop], minlength=size)[:-1]
+
+    def __call__(self, x, y, weights=None):
+        """
+        Returns the bins (hexagon centers, counts and sums of weights if
+        given) of the points (x, y) that are defined. Only non-empty
+        hexagons are returned, ordered by row and column.
+        """
+
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        defined = ~(np.isnan(x) | np.isnan(y))
+        if not defined.all():
+            x, y = x[defined], y[defined]
+            if weights is not None:
+                weights = np.broadcast_to(np.asarray(weights, dtype=float), defined.shape)[defined]
+        if not len(x):
+            empty = np.empty(0)
+            return Bins(empty, empty, np.empty(0, dtype=np.int64),
+                        empty if weights is not None else None)
+
+        # Hexagons are counted on the rectangle of hexagons covering points,
+        # unless it is much larger than the number of points
+        bounds = self._bounds(x.min(), y.min(), x.max(), y.max())
+        i0, j0, columns, rows = bounds
+        if columns * rows <= max(4 * len(x), 2**16):
+            counts = np.zeros(columns * rows, dtype=np.int64)
+            sums = np.zeros(columns * rows) if weights is not None else None
+            self._accumulate(bounds, x, y, weights, counts, sums)
+            index = np.flatnonzero(counts)
+            counts = counts[index]
+            sums = sums[index] if sums is not None else None
+        else:
+            i, j = self.index(x, y)
+            index, inverse = np.unique((j - j0) * columns + (i - i0), return_inverse=True)
+            counts = np.bincount(inverse)
+            sums = np.bincount(inverse, weights) if weights is not None else None
+        j, i = np.divmod(index, columns)
+        cx, cy = self.center(i + i0, j + j0)
+        return Bins(cx, cy, counts, sums)
+
+    def _hexagon(self, radius):
+        angles = np.arange(6) * (math.pi / 3)
+        corners = np.column_stack([np.sin(angles) * radius, -np.cos(angles) * radius])
+        return np.diff(np.concatenate([[[0, 0]], corners]), axis=0)
+
+    def hexagon(self, radius=None):
+        """
+        Returns the SVG path string for the hexagon centered at the origin
+        ⟨0,0⟩. The path string is relative: position it with a move to the
+        center of a bin. If radius is not specified, the hexbin’s current
+        radius is used.
+        """
+        moves = self._hexagon(self._radius if radius is None else float(radius))
+        return shape._format([("m", moves[:1]), ("l", moves[1:]), ("z", np.empty((1, 0)))], self._digits)
+
+    def _grid(self):
+        """
+        Hexagons covering the extent (as d3): indices bounds and mask of the
+        hexagons whose center is within the extent, extended by half a
+        hexagon.
+        """
+
+        (x0, y0), (x1, y1) = self._extent
+        j0 = int(np.floor(y0 / self._dy + 0.5))
+        i0 = int(np.floor(x0 / self._dx + 0.5))
+        rows = max(0, int(np.ceil((y1 + self._radius) / self._dy)) - j0)
+        columns = max(0, int(np.ceil((x1 + self._dx / 2) / self._dx)) - i0)
+        j, i = np.mgrid[j0:j0 + rows, i0:i0 + columns]
+        cx, cy = self.center(i, j)
+        valid = (cx < x1 + self._dx / 2) & (cy < y1 + self._radius)
+        return (i0, j0, columns, rows), valid.ravel()
+
+    def centers(self):
+        """
+        Returns the centers (an array of shape (n, 2)) of all hexagons that
+        cover the extent, ordered by row and column.
+        """
+        (i0, j0, columns, rows), valid = self._grid()
+        j, i = np.divmod(np.flatnonzero(valid), columns)
+        return np.column_stack(self.center(i + i0, j + j0))
+
+    def mesh(self):
+        """
+        Returns the SVG path string for the hexagonal mesh that covers the
+        extent; the returned path is intended to be stroked. The mesh may
+        extend slightly beyond the extent and may need to be clipped.
+        """
+
+        centers = self.centers()
+        if not len(centers):
+            return None
+        fragment = self._hexagon(self._radius)[:4].ravel()
+        values = np.hstack([centers, np.tile(fragment, (len(centers), 1))])
+        prefixes = np.tile(np.array([ord(c) for c in "M,m,l,l,l,"], dtype=np.uint8),
+                           len(centers))
+        return shape._write(prefixes, values.ravel(), np.ones(values.size, dtype=bool), self._digits)
+
+    def counts(self):
+        """
+        Returns a new (empty) accumulator of the counts of points in the
+        hexagons covering the extent.
+        """
+        return HexbinCounts(self)
+
+
+hexbin = Hexbin
+
+
+class HexbinCounts(object):
+    """
+    Counts (and sums of weights) of points in the hexagons covering the
+    extent of a hexbin generator (see Hexbin.centers). Points are added
+    chunk by chunk (points out of these hexagons are ignored) and counts
+    computed by different workers can be merged.
+    """
+
+    def __init__(self, hexbin):
+        self._hexbin = hexbin
+        self._bounds, self._valid = hexbin._grid()
+        self._counts = np.zeros(len(self._valid), dtype=np.int64)
+        self._sums = np.zeros(len(self._valid))
+
+    @property
+    def centers(self):
+        """ Centers of hexagons """
+        return self._hexbin.centers()
+
+    @property
+    def count(self):
+        """ Number of points in each hexagon (ordered as centers) """
+        return self._counts[self._valid]
+
+    @property
+    def sum(self):
+        """ Sum of weights of points in each hexagon (ordered as centers) """
+        return self._sums[self._valid]
+
+    def update(self, x, y, weights=None):
+        """
+        Adds points (x, y) with the given weights (1 by default) and
+        returns the accumulator.
+        """
+        self._hexbin._accumulate(self._bounds, x, y, 1.0 if weights is None else weights,
+                                 self._counts, self._sums)
+        return self
+
+    def merge(self, other):
+        """
+        Merges the counts of another accumulator (of the same hexagons)
+        into this one and returns this one.
+        """
+        if self._bounds != other._bounds or not np.array_equal(self._valid, other._valid):
+            raise ValueError("Accumulators have different hexagons")
+        self._counts += other._counts
+        self._sums += other._sums
+        return self
+
+    def bins(self):
+        """
+        Returns the bins of non-empty hexagons.
+        """
+        count, total = self.count, self.sum
+        index = np.flatnonzero(count)
+        centers = self.centers[index]
+        return Bins(centers[:, 0], centers[:, 1], count[index], total[index])
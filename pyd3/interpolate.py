@@ -67,7 +67,7 @@ def interpolate_value(a,b):
     array.
     """
     
-    if isinstance(b, str):
+    if isinstance(b, (str, Color)):
         try:
             a, b = Color(a), Color(b)
         except ValueError:
@@ -0,0 +1,230 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+Process-based evaluation of scales.
+
+Threads (see scale.map_chunked) only help when numpy does the work: for
+color or string ranges, the per-element Python code holds the GIL. A scale
+pool evaluates a scale in worker processes instead::
+
+   color = scale.linear([0, 100], ["white", "steelblue"])
+   with ScalePool(color, workers=8) as pool:
+       colors = pool.map(values)                  # array of "#rrggbb"
+       pixels = pool.map(pixels, method="invert") # (numeric ranges only)
+
+The compiled state of the scale (domain, range and lookup arrays) is
+published once, when the pool starts, in a shared memory block that workers
+map without copy. Each call copies the values into a shared input buffer and
+workers receive only chunk descriptors (buffer names and bounds): they write
+their results straight into a shared output buffer, such that neither scales
+nor results are pickled per chunk. Interpolated strings (e.g. colors) have no
+fixed width: the output is sized from a sample and the (rare) chunks holding
+wider strings are sent back to widen it.
+
+Workers are forked when the platform allows it, otherwise the scale (minus
+its arrays) must be picklable.
+"""
+import os
+import copy
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+
+# Worker state: the scale (with arrays mapped from shared memory), the shared
+# memory of its state and the input/output buffers of the current call
+_scale = None
+_state = None
+_buffers = {}
+
+
+def _aligned(size, alignment=64):
+    return (size + alignment - 1) // alignment * alignment
+
+
+def _publish(scale):
+    """
+    Copies the numeric array attributes of a scale into a new shared memory
+    block. Returns the block, a copy of the scale without these arrays and
+    the layout {attribute: (offset, shape, dtype)} of the block.
+    """
+
+    arrays = {name: value for name, value in vars(scale).items()
+              if isinstance(value, np.ndarray) and not value.dtype.hasobject}
+    size = sum(_aligned(array.nbytes) for array in arrays.values())
+    memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    skeleton = copy.copy(scale)
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        view = np.ndarray(array.shape, array.dtype, buffer=memory.buf, offset=offset)
+        view[...] = array
+        layout[name] = offset, array.shape, array.dtype.str
+        setattr(skeleton, name, None)
+        offset += _aligned(array.nbytes)
+    return memory, skeleton, layout
+
+
+def _initialize(name, skeleton, layout):
+    """
+    Worker initializer: maps the arrays of the scale from shared memory
+    """
+
+    global _scale, _state
+    _state = shared_memory.SharedMemory(name=name)
+    for attribute, (offset, shape, dtype) in layout.items():
+        array = np.ndarray(shape, dtype, buffer=_state.buf, offset=offset)
+        array.setflags(write=False)
+        setattr(skeleton, attribute, array)
+    _scale = skeleton
+
+
+def _attach(buffers):
+    """
+    Maps the shared buffers (name, dtype, shape) of the current call, those
+    of the previous call are released.
+    """
+
+    names = set(name for name, _, _ in buffers)
+    if names != set(_buffers):
+        for memory in _buffers.values():
+            memory.close()
+        _buffers.clear()
+        for name in names:
+            _buffers[name] = shared_memory.SharedMemory(name=name)
+    return [np.ndarray(shape, dtype, buffer=_buffers[name].buf)
+            for name, dtype, shape in buffers]
+
+
+def _map_chunk(task):
+    """
+    Worker task: maps values[start:stop] into out[start:stop]. Strings of
+    variable width (variable is True) that do not fit in out are returned
+    as (start, strings) instead.
+    """
+
+    method, source, destination, start, stop, variable = task
+    values, out = _attach([source, destination])
+    result = None
+    if variable:
+        objects = np.empty(len(values[start:stop]), dtype=object)
+        getattr(_scale, method)(values[start:stop], out=objects)
+        strings = objects.astype(out.dtype.kind)
+        if strings.dtype.itemsize <= out.dtype.itemsize:
+            out[start:stop] = strings
+        else:
+            result = start, strings
+    else:
+        getattr(_scale, method)(values[start:stop], out=out[start:stop])
+    # Drop views such that buffers can be released by the next call
+    del values, out
+    return result
+
+
+class ScalePool(object):
+    """
+    A pool of worker processes evaluating a scale (any scale accepting an out
+    argument). The pool should be closed when done, or used as a context
+    manager.
+    """
+
+    def __init__(self, scale, workers=None):
+        self._scale = scale
+        self._workers = workers or os.cpu_count() or 1
+        self._state, skeleton, layout = _publish(scale)
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        self._pool = context.Pool(self._workers, initializer=_initialize,
+                                  initargs=(self._state.name, skeleton, layout))
+
+    @property
+    def scale(self):
+        """ The scale evaluated by the pool """
+        return self._scale
+
+    @property
+    def workers(self):
+        """ Number of worker processes """
+        return self._workers
+
+    def map(self, values, method="__call__", out=None, dtype=None, chunk_size=65536):
+        """
+        Maps values (any shape) with the given method of the scale (e.g.
+        "invert" or "rgba" for sequential scales), chunk by chunk in the
+        worker processes. Results are written into *out* when given, dtype
+        sets the type of the result otherwise (non numeric results such as
+        colors are returned as strings, as wide as the widest one).
+        Interpolated strings wider than a given out or dtype raise a
+        ValueError.
+        """
+
+        values = np.asarray(values)
+        flat = np.ascontiguousarray(values).reshape(-1)
+        n = len(flat)
+
+        # Interpolated strings have no fixed width: the output is first
+        # sized from a sample of values, then widened if needed
+        sample = getattr(self._scale, method)(flat[::max(1, n // 64)][:64])
+        variable = not isinstance(sample, np.ndarray)
+        sample = np.asarray(sample)
+        variable = variable and sample.dtype.kind in 'USO'
+        if sample.dtype.hasobject:
+            sample = sample.astype(str)
+        trailing = sample.shape[1:]
+        if out is not None:
+            dtype = out.dtype
+        widen = variable and dtype is None
+        dtype = np.dtype(dtype if dtype is not None else sample.dtype)
+
+        source = shared_memory.SharedMemory(create=True, size=max(flat.nbytes, 1))
+        size = n * dtype.itemsize * int(np.prod(trailing))
+        destination = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            np.ndarray(flat.shape, flat.dtype, buffer=source.buf)[...] = flat
+            source_info = source.name, flat.dtype.str, (n,)
+            destination_info = destination.name, dtype.str, (n,) + trailing
+            chunk_size = max(1, int(chunk_size))
+            tasks = [(method, source_info, destination_info, start, start + chunk_size, variable)
+                     for start in range(0, n, chunk_size)]
+            wide = [chunk for chunk in self._pool.imap_unordered(_map_chunk, tasks)
+                    if chunk is not None]
+            if wide and not widen:
+                raise ValueError("Mapped strings are wider than %s" % dtype)
+            result = np.ndarray((n,) + trailing, dtype, buffer=destination.buf)
+            if wide:
+                for _, strings in wide:
+                    dtype = np.promote_types(dtype, strings.dtype)
+                result = result.astype(dtype)
+                for start, strings in wide:
+                    result[start:start + len(strings)] = strings
+            if out is None:
+                out = np.empty(values.shape + trailing, dtype=dtype)
+            out[...] = result.reshape(values.shape + trailing)
+            del result
+        finally:
+            source.close()
+            source.unlink()
+            destination.close()
+            destination.unlink()
+        return out if values.ndim else out[()]
+
+    def close(self):
+        """
+        Stops the worker processes and releases the shared scale state.
+        """
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._state.close()
+            self._state.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
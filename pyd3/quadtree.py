@@ -0,0 +1,363 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of (part of) the `d3-quadtree
+<https://github.com/d3/d3-quadtree>`_ javascript module.
+
+A quadtree recursively partitions two-dimensional space into squares,
+dividing each square into four equally-sized squares, until leaves hold
+only a few points. Quadtrees can accelerate various spatial operations,
+such as the Barnes–Hut approximation for computing many-body forces,
+collision detection, and searching for nearby points::
+
+   x = scale.linear(domain=[0, 1], range=[0, 960])
+   y = scale.linear(domain=[0, 1], range=[500, 0])
+   tree = quadtree.quadtree(x(data_x), y(data_y))
+   index = tree.find(mouse_x, mouse_y, radius=10)   # None if no point
+   brushed = tree.search(100, 100, 200, 150)       # indices of points
+
+The tree is built at once from arrays of coordinates: points are sorted by
+their Morton (z-order) codes, such that each node holds a contiguous range
+of points, and nodes are stored in flat arrays (range, bounding box and
+children). Queries are answered for many points (or rectangles) at once by
+walking the tree level by level.
+"""
+import numpy as np
+
+
+# Number of bits of grid coordinates (Morton codes fit in 60 bits)
+_bits = 30
+
+
+def _spread(v):
+    """
+    Spreads the bits of (unsigned 64 bits) v such that there is a zero bit
+    between each pair of bits.
+    """
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+
+def _ranges(starts, counts):
+    """
+    Concatenation of the ranges [start, start+count[.
+    """
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(len(offsets))
+
+
+def _codes(x, y, cover):
+    """
+    Morton codes of points (clipped to the cover (x0, y0, size)).
+    """
+    x0, y0, size = cover
+    scale = 2**_bits / size
+    gx = np.clip(np.floor((x - x0) * scale), 0, 2**_bits - 1).astype(np.uint64)
+    gy = np.clip(np.floor((y - y0) * scale), 0, 2**_bits - 1).astype(np.uint64)
+    # Children are ordered as d3: [x0, y0], [x1, y0], [x0, y1], [x1, y1]
+    return (_spread(gx) | (_spread(gy) << np.uint64(1))).astype(np.int64)
+
+
+def _tree(x, y, leaf_size):
+    """
+    Quadtree of (defined) points as flat arrays: cover (x0, y0, size) of
+    the root, order of points (by Morton codes), children (-1 if none),
+    start and stop of the range of points of nodes (in breadth first
+    order).
+    """
+
+    if len(x):
+        x0, y0 = x.min(), y.min()
+        size = max(x.max() - x0, y.max() - y0)
+        # The extent is slightly enlarged such that all points are in
+        size = size * (1 + 2**-20) if size > 0 else 1.0
+    else:
+        x0, y0, size = 0.0, 0.0, 1.0
+    cover = float(x0), float(y0), float(size)
+    codes = _codes(x, y, cover)
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+
+    # Nodes are split level by level into (non-empty) quadrants until they
+    # hold few enough points
+    starts, stops, prefixes = [np.zeros(1, np.int64)], [np.array([len(x)])], [np.zeros(1, np.int64)]
+    children = []
+    count = 1
+    for level in range(_bits):
+        start, stop, prefix = starts[-1], stops[-1], prefixes[-1]
+        child = np.full((len(start), 4), -1, dtype=np.int64)
+        children.append(child)
+        split = np.flatnonzero(stop - start > leaf_size)
+        if not len(split):
+            break
+        shift = 2 * (_bits - level - 1)
+        quadrants = (prefix[split, None] * 4 + np.arange(4)) << shift
+        bounds = np.searchsorted(codes, quadrants)
+        bounds = np.column_stack([bounds, stop[split]])
+        nonempty = bounds[:, 1:] > bounds[:, :-1]
+        child[split] = np.where(nonempty, count + np.cumsum(nonempty).reshape(nonempty.shape) - 1, -1)
+        count += np.count_nonzero(nonempty)
+        starts.append(bounds[:, :-1][nonempty])
+        stops.append(bounds[:, 1:][nonempty])
+        prefixes.append((quadrants >> shift)[nonempty])
+    if len(children) < len(starts):
+        children.append(np.full((len(starts[-1]), 4), -1, dtype=np.int64))
+    children = np.concatenate(children)
+    starts, stops = np.concatenate(starts), np.concatenate(stops)
+
+    # Leaves still too large are cells of the finest grid (e.g. a cluster
+    # far from an outlier): their points (all of the same code) are split
+    # by a quadtree of their own extent, grafted in place of the leaf
+    large = np.flatnonzero((stops - starts > leaf_size) & (children < 0).all(axis=1))
+    grafts = [children]
+    for node in large.tolist():
+        start, stop = int(starts[node]), int(stops[node])
+        xs, ys = x[order[start:stop]], y[order[start:stop]]
+        if xs.min() == xs.max() and ys.min() == ys.max():
+            continue
+        tree = _tree(xs, ys, leaf_size)
+        order[start:stop] = order[start:stop][tree["order"]]
+        offset = count - 1
+        nodes = np.where(tree["children"] > 0, tree["children"] + offset, -1)
+        children[node] = nodes[0]
+        grafts.append(nodes[1:])
+        starts = np.concatenate([starts, tree["starts"][1:] + start])
+        stops = np.concatenate([stops, tree["stops"][1:] + start])
+        count += len(nodes) - 1
+    children = np.concatenate(grafts)
+    return dict(cover=cover, order=order, children=children, starts=starts, stops=stops)
+
+
+class Quadtree(object):
+    """
+    Quadtree of the points of coordinates (x, y), or of the points of x if
+    y is None (an array of shape (n, 2)). Undefined points (NaN) are
+    ignored. Points are identified by their index in the given arrays.
+    """
+
+    # Nodes with more points than this are split
+    _leaf_size = 16
+
+    # Queries are answered by chunks such that temporary arrays are bounded
+    _chunk_size = 2**16
+
+    def __init__(self, x, y=None):
+        if y is None:
+            x = np.asarray(x, dtype=float).reshape(-1, 2)
+            x, y = x[:, 0], x[:, 1]
+        self._x = np.asarray(x, dtype=float).ravel()
+        self._y = np.asarray(y, dtype=float).ravel()
+        if self._x.shape != self._y.shape:
+            raise ValueError("x and y must have the same size")
+        self._build()
+
+    @property
+    def x(self):
+        """ x coordinates of points """
+        return self._x
+
+    @property
+    def y(self):
+        """ y coordinates of points """
+        return self._y
+
+    @property
+    def extent(self):
+        """
+        Extent [[x0, y0], [x1, y1]] of the (square) root node, or None if
+        the quadtree is empty.
+        """
+        if not len(self._index):
+            return None
+        x0, y0, size = self._cover
+        return [[x0, y0], [x0 + size, y0 + size]]
+
+    def __len__(self):
+        return len(self._index)
+
+    def _build(self):
+        """
+        Sorts points by Morton codes into a tree of flat arrays, and
+        computes the bounding boxes of nodes.
+        """
+
+        index = np.flatnonzero(~(np.isnan(self._x) | np.isnan(self._y)))
+        x, y = self._x[index], self._y[index]
+        tree = _tree(x, y, self._leaf_size)
+        self._cover = tree["cover"]
+        self._index = index[tree["order"]]
+        self._xs, self._ys = x[tree["order"]], y[tree["order"]]
+        self._children, self._starts, self._stops = tree["children"], tree["starts"], tree["stops"]
+        self._leaf = (self._children < 0).all(axis=1)
+
+        # Bounding boxes of the points of nodes (empty for the empty root),
+        # reduced over [start, stop[ (the padding makes stop a valid index)
+        if len(index):
+            bounds = np.column_stack([self._starts, self._stops]).ravel()
+            xs, ys = np.append(self._xs, 0), np.append(self._ys, 0)
+            self._x0 = np.minimum.reduceat(xs, bounds)[::2]
+            self._x1 = np.maximum.reduceat(xs, bounds)[::2]
+            self._y0 = np.minimum.reduceat(ys, bounds)[::2]
+            self._y1 = np.maximum.reduceat(ys, bounds)[::2]
+        else:
+            self._x0 = self._y0 = np.array([np.inf])
+            self._x1 = self._y1 = np.array([-np.inf])
+
+        # Leaves of coincident points (sorted by index) only need their
+        # first point to be considered when looking for the nearest one
+        self._coincident = self._leaf & (self._x0 == self._x1) & (self._y0 == self._y1)
+
+    def _distance2(self, node, x, y):
+        """
+        Squared distance from (x, y) to the bounding boxes of nodes.
+        """
+        dx = np.maximum(np.maximum(self._x0[node] - x, x - self._x1[node]), 0)
+        dy = np.maximum(np.maximum(self._y0[node] - y, y - self._y1[node]), 0)
+        return dx * dx + dy * dy
+
+    def _points(self, q, node):
+        """
+        Pairs (query, position) of the points of leaves to be compared to
+        queries (only the first point of leaves of coincident points).
+        """
+        start, count = self._starts[node], self._stops[node] - self._starts[node]
+        count[self._coincident[node]] = 1
+        return np.repeat(q, count), _ranges(start, count)
+
+    def _find(self, x, y, radius):
+        """
+        Positions (in Morton order) of the points nearest to (x, y) within
+        radius, or -1.
+        """
+
+        best = np.full(len(x), -1, dtype=np.int64)
+        best2 = np.full(len(x), radius * radius, dtype=float)
+        if not len(self._index):
+            return best
+
+        def offer(q, p):
+            # Ties are broken by the (smallest) index of points
+            d2 = (self._xs[p] - x[q]) ** 2 + (self._ys[p] - y[q]) ** 2
+            index = self._index[p]
+            current = np.where(best[q] >= 0, self._index[best[q]], -1)
+            keep = (d2 < best2[q]) | ((d2 == best2[q]) & (index < current))
+            q, p, d2, index = q[keep], p[keep], d2[keep], index[keep]
+            order = np.lexsort((index, d2, q))
+            q, p, d2 = q[order], p[order], d2[order]
+            first = np.ones(len(q), dtype=bool)
+            first[1:] = q[1:] != q[:-1]
+            best[q[first]], best2[q[first]] = p[first], d2[first]
+
+        # The leaf reached by descending to the nearest child bounds the
+        # search (undefined positions have no nearest point)
+        defined = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+        q, node = defined, np.zeros(len(defined), dtype=np.int64)
+        while len(q):
+            leaf = self._leaf[node]
+            offer(*self._points(q[leaf], node[leaf]))
+            q, children = q[~leaf], self._children[node[~leaf]]
+            d2 = self._distance2(children, x[q, None], y[q, None])
+            d2[children < 0] = np.inf
+            node = children[np.arange(len(q)), np.argmin(d2, axis=1)]
+
+        q, node = defined, np.zeros(len(defined), dtype=np.int64)
+        while len(q):
+            keep = self._distance2(node, x[q], y[q]) <= best2[q]
+            q, node = q[keep], node[keep]
+            leaf = self._leaf[node]
+            offer(*self._points(q[leaf], node[leaf]))
+            children = self._children[node[~leaf]]
+            nonempty = children >= 0
+            q, node = np.repeat(q[~leaf], 4).reshape(-1, 4)[nonempty], children[nonempty]
+        return best
+
+    def find(self, x, y, radius=None):
+        """
+        Returns the index of the point closest to the position ⟨x,y⟩ with
+        the given search radius. If radius is not specified, it defaults to
+        infinity. If there is no point within the search area, returns
+        None. If several points are at the same distance, the smallest
+        index is returned. If x and y are arrays, returns the indices of
+        the points closest to each position (-1 if none).
+        """
+
+        scalar = np.ndim(x) == 0 and np.ndim(y) == 0
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        shape = x.shape
+        x, y = x.ravel(), y.ravel()
+        radius = np.inf if radius is None else float(radius)
+        result = np.empty(len(x), dtype=np.int64)
+        for start in range(0, len(x), self._chunk_size):
+            stop = start + self._chunk_size
+            result[start:stop] = self._find(x[start:stop], y[start:stop], radius)
+        result = np.where(result >= 0, self._index[np.maximum(result, 0)] if len(self) else -1, -1)
+        if scalar:
+            return int(result[0]) if result[0] >= 0 else None
+        return result.reshape(shape)
+
+    def _search(self, x0, y0, x1, y1):
+        """
+        Pairs (query, position) of points within rectangles.
+        """
+
+        queries, positions = [], []
+        q, node = np.arange(len(x0)), np.zeros(len(x0), dtype=np.int64)
+        while len(q) and len(self):
+            nx0, nx1 = self._x0[node], self._x1[node]
+            ny0, ny1 = self._y0[node], self._y1[node]
+            keep = (nx0 < x1[q]) & (nx1 >= x0[q]) & (ny0 < y1[q]) & (ny1 >= y0[q])
+            inside = (nx0 >= x0[q]) & (nx1 < x1[q]) & (ny0 >= y0[q]) & (ny1 < y1[q])
+
+            # Nodes within the rectangle: all points
+            full = keep & inside
+            start, count = self._starts[node[full]], self._stops[node[full]] - self._starts[node[full]]
+            queries.append(np.repeat(q[full], count))
+            positions.append(_ranges(start, count))
+
+            # Leaves crossing the rectangle: points are tested
+            partial = keep & ~inside & self._leaf[node]
+            start, count = self._starts[node[partial]], self._stops[node[partial]] - self._starts[node[partial]]
+            qq, p = np.repeat(q[partial], count), _ranges(start, count)
+            xs, ys = self._xs[p], self._ys[p]
+            within = (xs >= x0[qq]) & (xs < x1[qq]) & (ys >= y0[qq]) & (ys < y1[qq])
+            queries.append(qq[within])
+            positions.append(p[within])
+
+            # Nodes crossing the rectangle: children are visited
+            split = keep & ~inside & ~self._leaf[node]
+            children = self._children[node[split]]
+            nonempty = children >= 0
+            q, node = np.repeat(q[split], 4).reshape(-1, 4)[nonempty], children[nonempty]
+        if not queries:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(queries), np.concatenate(positions)
+
+    def search(self, x0, y0, x1, y1):
+        """
+        Returns the (sorted) indices of points ⟨x,y⟩ such that x0 <= x < x1
+        and y0 <= y < y1. If the rectangles bounds are arrays, returns a
+        list of indices for each rectangle.
+        """
+
+        scalar = all(np.ndim(v) == 0 for v in (x0, y0, x1, y1))
+        x0, y0, x1, y1 = [v.ravel() for v in np.broadcast_arrays(
+            *[np.asarray(v, dtype=float) for v in (x0, y0, x1, y1)])]
+        result = []
+        for start in range(0, len(x0), self._chunk_size):
+            stop = start + self._chunk_size
+            q, p = self._search(x0[start:stop], y0[start:stop], x1[start:stop], y1[start:stop])
+            index = self._index[p]
+            order = np.lexsort((index, q))
+            q, index = q[order], index[order]
+            counts = np.bincount(q, minlength=len(x0[start:stop]))
+            result.extend(np.split(index, np.cumsum(counts)[:-1]))
+        return result[0] if scalar else result
+
+
+quadtree = Quadtree
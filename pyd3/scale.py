@@ -35,85 +35,212 @@ Scales have no intrinsic visual representation. However, most scales can
 generate and format ticks for reference marks to aid in the construction of
 axes.
 """
+import os
+import copy
 import math
+import bisect
+import asyncio
+import collections
+import concurrent.futures
 import numpy as np
 from pyd3 import interpolate
+from pyd3 import format as formats
+from pyd3 import time as intervals
+from pyd3.color import Color
+from pyd3.scale_chromatic import Scheme
+from pyd3.sketch import QuantileSketch
 
 py_range = range
 
 
-def interpolate_number(x, xp, yp, clamp=True):
+def _output_dtype(x, out, dtype):
     """
-    Specialized interpolation for array of scalars
+    Resolve the dtype of an evaluation: an explicit *out* buffer wins, then an
+    explicit *dtype*, then floating point inputs keep their own precision and
+    anything else is evaluated in float64.
     """
-    x = np.asarray(x)
-    
-    # Specific case for empty domain
-    if xp[0] == xp[-1] or len(xp)<2:
-        if len(x.shape) == 0:
-            return yp[0]
-        else:
-            return [yp[0],]*len(x)
-
-    # Extrapolate
-    if not clamp:
-        # Single value
-        if len(x.shape) == 0:
-            if   x < xp[0]:
-                return yp[ 0] + (x-xp[ 0])*(yp[ 0]-yp[ 1]) / (xp[ 0]-xp[ 1])
-            elif x > xp[-1]:
-                return yp[-1] + (x-xp[-1])*(yp[-1]-yp[-2]) / (xp[-1]-xp[-2])
-            else:
-                return np.interp(x, xp, yp)
-        # Values list
-        else:
-            # Specific case for empty domain
-            if xp[0] == xp[-1] or len(xp)<2:
-                return [yp[0],]*len(x)
-            y = np.interp(x, xp, yp)
-            y[x < xp[ 0]] = yp[ 0] + (x[x<xp[ 0]]-xp[ 0]) * (yp[ 0]-yp[ 1]) / (xp[ 0]-xp[ 1])
-            y[x > xp[-1]] = yp[-1] + (x[x>xp[-1]]-xp[-1]) * (yp[-1]-yp[-2]) / (xp[-1]-xp[-2])
-            return y
+    if out is not None:
+        return out.dtype
+    if dtype is not None:
+        return np.dtype(dtype)
+    if x.dtype.kind == 'f':
+        return x.dtype
+    return np.dtype(float)
 
-    # Interpolate
-    return np.interp(x, xp, yp)
 
+def _empty_domain(x, value, out, dtype):
+    """
+    Result of the evaluation of an empty domain (every value maps to value)
+    """
+    if len(x.shape) == 0 and out is None:
+        return value
+    if out is None:
+        if dtype is None:
+            return [value,]*len(x)
+        out = np.empty(x.shape, dtype=dtype)
+    out[...] = value
+    return out
 
 
-def interpolate_time(x, xp, yp, clamp=True):
+def interpolate_number(x, xp, yp, clamp=True, out=None, dtype=None):
     """
-    Specialized interpolation for array of datetime values
+    Specialized interpolation for array of scalars
+
+    Results are written into *out* when given, or in a new array of the
+    requested *dtype* otherwise (see _output_dtype for the default). Floating
+    point outputs are computed in their own precision (float32 in, float32
+    out) while integer outputs (e.g. pixels) are rounded to the nearest
+    integer.
     """
     x = np.asarray(x)
-    
+    n = len(xp)
+
     # Specific case for empty domain
-    if xp[0] == xp[-1] or len(xp)<2:
-        if len(x.shape) == 0:
-            return yp[0]
-        else:
-            return [yp[0],]*len(x)
+    if n < 2 or xp[0] == xp[-1]:
+        return _empty_domain(x, yp[0], out, dtype)
+
+    # Integer domains (e.g. datetime64 counts) are made relative to their
+    # first breakpoint with an exact int64 subtraction before going to floats
+    if x.dtype.kind in 'iu' and np.asarray(xp).dtype.kind in 'iu':
+        origin = xp[0]
+        x = np.subtract(x, origin)
+        xp = np.subtract(xp, origin)
+
+    dtype = _output_dtype(x, out, dtype)
+    ctype = dtype if dtype.kind == 'f' else np.dtype(float)
+    xp = np.asarray(xp, dtype=ctype)
+    yp = np.asarray(yp, dtype=ctype)
+
+    # Output buffer (computation happens in place whenever possible)
+    if out is not None and out.dtype == ctype:
+        y = out
+    else:
+        y = np.empty(x.shape, dtype=ctype)
+
+    # Bilinear domain: y = (x - x0) * k + y0
+    if n == 2:
+        k = (yp[1] - yp[0]) / (xp[1] - xp[0])
+        np.subtract(x, xp[0], out=y, casting='unsafe')
+        np.multiply(y, k, out=y)
+        np.add(y, yp[0], out=y)
+        if clamp:
+            np.clip(y, min(yp[0], yp[1]), max(yp[0], yp[1]), out=y)
+
+    # Polylinear domain: find segment, then y = (x - x[i]) * k[i] + y[i]
+    else:
+        if clamp:
+            x = np.clip(x, xp[0], xp[-1])
+        dx, dy = np.diff(xp), np.diff(yp)
+        k = np.divide(dy, dx, out=np.zeros_like(dy), where=dx!=0)
+        i = np.asarray(np.searchsorted(xp, x, side='right'))
+        np.subtract(i, 1, out=i)
+        np.clip(i, 0, n-2, out=i)
+        np.subtract(x, xp.take(i), out=y, casting='unsafe')
+        np.multiply(y, k.take(i), out=y)
+        np.add(y, yp.take(i), out=y)
 
-    delta = np.cumsum(yp[1:] - yp[:-1])
-    delta = np.insert(delta, 0, 0)
-    dtype = delta.dtype
+    return _cast(y, out, dtype)
+
+
+def _cast(y, out, dtype):
+    """
+    Store a floating point result y into out (or convert it to dtype),
+    rounding to the nearest integer for integer types.
+    """
+    if y is out:
+        return out
+    if out is not None:
+        np.rint(y, out=out, casting='unsafe')
+        return out
+    if y.dtype != dtype:
+        y = np.rint(y).astype(dtype)
+    if len(y.shape) == 0:
+        return y[()]
+    return y
+
+
+def _interpolate_exact(x, xp, yp, clamp):
+    """
+    Interpolation of int64 values yp at integer positions x (of integer
+    breakpoints xp), rounded to the nearest integer (half up) in exact
+    integer arithmetic. Positions and breakpoints must be less than 2**30
+    in magnitude such that no product overflows.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    xp, yp = np.asarray(xp, dtype=np.int64), np.asarray(yp, dtype=np.int64)
+    if xp[-1] < xp[0]:
+        xp, yp = xp[::-1], yp[::-1]
+    if clamp:
+        x = np.clip(x, xp[0], xp[-1])
+    i = np.clip(np.searchsorted(xp, x, side='right') - 1, 0, len(xp) - 2)
+    dx, width = x - xp[i], xp[i+1] - xp[i]
+    width = np.where(width == 0, 1, width)
+    # dx * height / width = dx * quotient + dx * remainder / width
+    quotient, remainder = np.divmod(yp[i+1] - yp[i], width)
+    return yp[i] + dx * quotient + (2 * dx * remainder + width) // (2 * width)
+
+
+def interpolate_time(x, xp, yp, clamp=True, out=None, dtype=None):
+    """
+    Specialized interpolation for array of datetime values
 
-    interpolated = np.array(interpolate_number(x, xp, delta.astype(int), clamp))
-    return yp[0] + interpolated.astype(delta.dtype)
+    The range is handled as int64 offsets relative to its first value:
+    interpolated offsets are rounded to the nearest unit of the range and
+    added back in int64 arithmetic, directly into *out* when given. An
+    optional datetime *dtype* converts the result to another unit.
 
+    Offsets are exact for integer positions x (e.g. pixels) when breakpoints
+    xp are integers too. Otherwise they are computed in float64: they are
+    exact while the range spans less than 2**53 units (about 104 days in
+    nanoseconds, 285,000 years in milliseconds) and have a relative
+    precision of 2**-53 of the span beyond.
+    """
+    x = np.asarray(x)
 
-def interpolate_value(x, xp, yp, clamp=True):    
+    # Specific case for empty domain
+    if len(xp) < 2 or xp[0] == xp[-1]:
+        return _empty_domain(x, yp[0], out, dtype)
+
+    yp = np.asarray(yp)
+    origin = yp[:1].view(np.int64)[0]
+    offsets = yp.view(np.int64) - origin
+
+    positions = np.asarray(xp)
+    exact = (x.dtype.kind in 'iu' and np.all(np.mod(positions, 1) == 0)
+             and np.abs(positions).max() < 2**30
+             and (not x.size or np.abs(x).max() < 2**30))
+    if exact:
+        counts = np.asarray(_interpolate_exact(x, positions, offsets, clamp))
+    elif out is not None and out.dtype == yp.dtype:
+        counts = out.view(np.int64)
+        interpolate_number(x, xp, offsets, clamp, out=counts)
+        np.add(counts, origin, out=counts)
+        return out
+    else:
+        counts = np.asarray(interpolate_number(x, xp, offsets, clamp, dtype=np.int64))
+    counts += origin
+    result = counts.view(yp.dtype)
+    if out is not None:
+        out[...] = result
+        return out
+    if dtype is not None:
+        result = result.astype(dtype)
+    return result[()]
+
+
+def interpolate_value(x, xp, yp, clamp=True, out=None, dtype=None):
     """
     Generic interpolation
+
+    Results are a list unless an *out* buffer or a *dtype* (e.g. object, or a
+    fixed size string such as 'U7' for colors) is given.
     """
     x = np.asarray(x)
     n = len(xp)
     
     # Specific case for empty domain
     if xp[0] == xp[-1] or len(xp)<2:
-        if len(x.shape) == 0:
-            return yp[0]
-        else:
-            return [yp[0],]*len(x)
+        return _empty_domain(x, yp[0], out, dtype)
     
     # Build (n-1) interpolators for each interval in yp
     interpolators = []
@@ -124,7 +251,7 @@ def interpolate_value(x, xp, yp, clamp=True):
     xi = np.searchsorted(xp,x)
     
     # Single value
-    if len(x.shape) == 0:
+    if len(x.shape) == 0 and out is None:
         # Find indices of x within xp
         if xi == 0:
             xi = 1   # index 0 (= prepend) is invalid
@@ -133,23 +260,29 @@ def interpolate_value(x, xp, yp, clamp=True):
         xi -= 1
 
         # Normalized x values in each interval
-        v = np.arange(len(xp))
         nx = interpolate_number(x, xp, np.arange(len(xp)), clamp=clamp) - xi
         return interpolators[xi](nx)
     
     # Values list
     else:
         # Find indices of x within xp
+        xi = np.atleast_1d(xi)
         xi[xi==0] = 1   # index 0 (= prepend) is invalid
         xi[xi==n] = n-1 # index n (= append) is invalid
         xi -= 1
 
         # Normalized x values in each interval
-        v = np.arange(len(xp))
-        nx = interpolate_number(x, xp, np.arange(len(xp)), clamp=clamp) - xi
+        nx = interpolate_number(x, xp, np.arange(len(xp)), clamp=clamp) - xi.reshape(x.shape)
 
         # Get output value for each x
-        return [interpolators[i](x) for i,x in zip(xi,nx)]
+        values = [interpolators[i](x) for i,x in zip(xi,np.ravel(nx))]
+        if out is None and dtype is None:
+            return values
+        if out is None:
+            out = np.empty(x.shape, dtype=dtype)
+        for i, value in enumerate(values):
+            out.flat[i] = value
+        return out
 
 def tick_step(start, stop, count):
     e10 = math.sqrt(50)
@@ -184,7 +317,360 @@ def ticks(start, stop, count):
     return t.tolist()
 
 
-class ContinuousScale(object):
+# Powers of ten as computed by math.pow (np.power may differ in the last bit)
+_powers_of_ten = np.array([math.pow(10, e) for e in py_range(-323, 309)])
+
+def tick_steps(starts, stops, count):
+    """
+    Vectorized tick_step: returns the tick steps of many domains at once
+    (starts, stops and count are broadcast together). The step of an empty
+    or invalid domain is NaN.
+    """
+
+    starts, stops = np.asarray(starts, dtype=float), np.asarray(stops, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        step0 = np.abs(stops - starts) / np.maximum(0, count)
+        exponent = np.floor(np.log(step0) / math.log(10))
+        valid = (exponent >= -323) & (exponent <= 308)
+        index = np.where(valid, exponent, 0).astype(int) + 323
+        step1 = np.where(valid, _powers_of_ten[index], np.nan)
+        error = step0 / step1
+    step1 = step1 * np.select([error >= math.sqrt(50), error >= math.sqrt(10),
+                               error >= math.sqrt(2)], [10, 5, 2], 1)
+    step1 = np.where(np.isfinite(step1) & (step1 > 0), step1, np.nan)
+    return np.where(stops < starts, -step1, step1)[()]
+
+def ticks_many(starts, stops, count):
+    """
+    Returns the ticks of many domains at once (see ticks), for example the
+    axes of small multiples. Since each domain has its own number of ticks,
+    the result is ragged: a flat array of values and an array of n+1 offsets
+    such that values[offsets[i]:offsets[i+1]] are the ticks of domain i. A
+    domain whose start equals its stop has a single tick.
+    """
+
+    starts, stops = np.broadcast_arrays(np.asarray(starts, dtype=float).ravel(),
+                                        np.asarray(stops, dtype=float).ravel())
+    step = np.broadcast_to(tick_steps(starts, stops, count), starts.shape)
+    valid = np.isfinite(step)
+    step = np.where(valid, step, 1)
+    first = np.ceil(starts / step)
+    last = np.floor(stops / step)
+    counts = np.where(valid, np.maximum(np.rint(last - first) + 1, 0), 0)
+
+    # Degenerate domains (start == stop) have a single tick
+    single = (starts == stops) & np.isfinite(starts)
+    first[single], step[single], counts[single] = starts[single], 1, 1
+
+    counts = counts.astype(np.intp)
+    offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    index = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+    values = (np.repeat(first, counts) + index) * np.repeat(step, counts)
+    return values, offsets
+
+def tick_format(start, stop, count, specifier=None):
+    """
+    Returns a number format function suitable for displaying the ticks of
+    the domain [start, stop]. If the specifier has no precision, it is
+    computed from the tick step (see format.precision_fixed,
+    format.precision_round and format.precision_prefix). The default
+    specifier is ",f".
+    """
+
+    step = tick_step(start, stop, count)
+    specifier = formats.FormatSpecifier(specifier if specifier is not None else ",f")
+    value = max(abs(start), abs(stop))
+    if specifier.type == "s":
+        if specifier.precision is None:
+            specifier.precision = formats.precision_prefix(step, value)
+        return formats.format_prefix(specifier, value)
+    elif specifier.type in ("", "e", "g", "p", "r"):
+        if specifier.precision is None:
+            specifier.precision = formats.precision_round(step, value) - (specifier.type == "e")
+    elif specifier.type in ("f", "%"):
+        if specifier.precision is None:
+            specifier.precision = max(0, formats.precision_fixed(step) - 2*(specifier.type == "%"))
+    return formats.format(specifier)
+
+
+def _nice_linear(domain, count):
+    """
+    Returns a copy of domain whose extent is extended to multiples of the tick
+    step (see ContinuousScale.nice).
+    """
+    d = list(domain)
+    start, stop = d[0], d[-1]
+
+    # Degenerate case
+    if start == stop: return d
+
+    step = tick_step(start, stop, count)
+    if step:
+        step = tick_step(math.floor(start/step)*step, math.ceil(stop/step)*step, count)
+        d[0] = math.floor(start / step) * step
+        d[-1] = math.ceil(stop / step) * step
+    return d
+
+
+# Transforms used by non linear continuous scales. They are plain numpy ufunc
+# compositions that accept an optional out argument such that they can be
+# applied to very large arrays without intermediate copies (scalars are
+# returned as 0-d arrays).
+
+def _transform_log(x, out=None):
+    return np.log(x, out=out)
+
+def _transform_exp(x, out=None):
+    return np.exp(x, out=out)
+
+def _transform_logn(x, out=None):
+    out = np.asarray(np.log(np.negative(x), out=out))
+    return np.negative(out, out=out)
+
+def _transform_expn(x, out=None):
+    out = np.asarray(np.exp(np.negative(x), out=out))
+    return np.negative(out, out=out)
+
+def _transform_signed(f):
+    """
+    Returns the transform sign(x)·f(|x|) where f is computed in place.
+    """
+    def transform(x, out=None):
+        a = np.asarray(np.abs(x))
+        a = f(a, out=a) if a.dtype.kind == 'f' else f(a)
+        return np.copysign(a, x, out=out)
+    return transform
+
+def _transform_pow(exponent):
+    if exponent == 0.5:
+        return _transform_signed(np.sqrt)
+    def power(x, out=None):
+        return np.power(x, float(exponent), out=out)
+    return _transform_signed(power)
+
+def _transform_symlog(constant):
+    def log1p(x, out=None):
+        out = np.asarray(np.divide(x, constant, out=out))
+        return np.log1p(out, out=out)
+    return _transform_signed(log1p)
+
+def _transform_symexp(constant):
+    def expm1(x, out=None):
+        out = np.asarray(np.expm1(x, out=out))
+        return np.multiply(out, constant, out=out)
+    return _transform_signed(expm1)
+
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+def _range_interpolate(range):
+    """
+    Interpolation function suited to the type of the range values
+    """
+    if len(range) and isinstance(range[0], (int,float)):
+        return interpolate_number
+    elif len(range) and isinstance(range[0], np.datetime64):
+        return interpolate_time
+    return interpolate_value
+
+
+def _map_chunks(mapping, values, out, start, chunk_size, workers):
+    """
+    Applies mapping(chunk, out=...) to flat values from start, chunk by
+    chunk, using a pool of worker threads (as many as CPUs if None).
+    """
+
+    def map_chunk(index):
+        mapping(values[index:index+chunk_size], out=out[index:index+chunk_size])
+
+    chunks = py_range(start, len(values), chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) < 2:
+        for index in chunks:
+            map_chunk(index)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            # Consuming results propagates exceptions raised by workers
+            for _ in pool.map(map_chunk, chunks):
+                pass
+
+
+
+class Scale(object):
+    """
+    Base class of scales that can write their output into a preallocated
+    array (scale(values, out=...)). This class is not constructed directly.
+    """
+
+    # Number of changes of the scale, see version
+    _version = 0
+
+    @property
+    def version(self):
+        """
+        Number of changes of the scale (domain, range or any other setting)
+        since its creation, such that values derived from the scale (ticks,
+        lookup tables, axis layouts, ...) can be cached and invalidated only
+        when needed.
+        """
+        return self._version
+
+    def map_chunked(self, values, chunk_size=65536, workers=None, out=None):
+        """
+        Maps a (very large) array of values, chunk by chunk, using a pool of
+        workers threads (as many as CPUs by default). Chunks are small enough
+        to stay in cache and numpy releases the GIL while processing them, so
+        throughput scales with cores while temporary memory is bounded by
+        about workers × chunk_size values.
+
+        Results are written into *out* when given (it must be C-contiguous
+        with the shape of values), otherwise a single output is allocated.
+        """
+
+        values = np.asarray(values)
+        if not values.ndim:
+            return self(values, out=out)
+        flat = values.reshape(-1)
+        n, chunk_size = len(flat), max(1, int(chunk_size))
+
+        if out is None:
+            first = self(flat[:chunk_size])
+            fixed = isinstance(first, np.ndarray)
+            first = np.asarray(first)
+            if first.dtype.kind in 'USO' and not fixed:
+                # Interpolated strings (e.g. colors) have no fixed width: they
+                # are mapped as objects and converted once all are known
+                objects = np.empty(values.shape + first.shape[1:], dtype=object)
+                flat_objects = objects.reshape((n,) + first.shape[1:])
+                _map_chunks(self, flat, flat_objects, 0, chunk_size, workers)
+                return objects if first.dtype.kind == 'O' else objects.astype(first.dtype.kind)
+            out = np.empty(values.shape + first.shape[1:], dtype=first.dtype)
+            start = len(first)
+            out.reshape((n,) + first.shape[1:])[:start] = first
+        elif out.shape[:values.ndim] != values.shape or not out.flags.c_contiguous:
+            raise ValueError("Output must be C-contiguous with the shape of values")
+        else:
+            start = 0
+        flat_out = out.reshape((n,) + out.shape[values.ndim:])
+        _map_chunks(self, flat, flat_out, start, chunk_size, workers)
+        return out
+
+    async def amap(self, chunks, method="__call__", concurrency=4, executor=None):
+        """
+        Asynchronous generator mapping the chunks of an (async) iterable with
+        the given method of the scale (e.g. "invert" or "rgba" for
+        sequential scales). Chunks are mapped in an executor (the event loop
+        default one if None) such that mapping overlaps with the production
+        of the next chunks, while the event loop is never blocked.
+
+        At most *concurrency* chunks are mapped at once: no further chunk is
+        pulled from the source until the oldest one has been consumed. Mapped
+        chunks are yielded in the order of the source.
+        """
+
+        loop = asyncio.get_running_loop()
+        mapping = getattr(self, method)
+        pending = collections.deque()
+        try:
+            if hasattr(chunks, "__aiter__"):
+                async for chunk in chunks:
+                    pending.append(loop.run_in_executor(executor, mapping, chunk))
+                    if len(pending) >= concurrency:
+                        yield await pending.popleft()
+            else:
+                for chunk in chunks:
+                    pending.append(loop.run_in_executor(executor, mapping, chunk))
+                    if len(pending) >= concurrency:
+                        yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+
+def _checked_width(mapping):
+    """
+    Wraps a mapping to strings of variable width such that strings wider
+    than the output raise a ValueError instead of being truncated.
+    """
+
+    def checked(values, out):
+        result = np.empty(out.shape, dtype=object)
+        mapping(values, out=result)
+        result = result.astype(out.dtype.kind)
+        if result.dtype.itemsize > out.dtype.itemsize:
+            raise ValueError("Mapped strings are wider than %s" % out.dtype)
+        out[...] = result
+        return out
+    return checked
+
+
+def map_file(mapping, source, destination, dtype=None, memory=2**26, workers=1):
+    """
+    Maps values stored on disk to another file, window by window, such that
+    arrays much larger than the memory can be processed.
+
+    mapping is any method accepting an out argument, e.g. a scale, its
+    invert method or the rgba method of a sequential scale. source is a .npy
+    path (memory-mapped) or an array such as a np.memmap. destination is a
+    .npy path (created as a memory-mapped file with the shape of the source
+    plus the trailing shape of the mapping, e.g. (4,) for rgba) or an
+    array. dtype sets the type of the destination (e.g. np.int32 for pixel
+    coordinates), the one of the mapping is used by default. Interpolated
+    strings (e.g. colors) have no fixed width: dtype must be given (e.g.
+    'U7') and a ValueError is raised if a string does not fit.
+
+    memory is the RAM budget in bytes: windows are sized such that the
+    source, destination and temporaries of all workers fit in it. Returns
+    the destination array.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        source = np.load(source, mmap_mode='r')
+    if not source.flags.c_contiguous:
+        raise ValueError("Source must be C-contiguous")
+    values = source.reshape(-1)
+
+    sample = mapping(values[:1])
+    fixed = isinstance(sample, np.ndarray)
+    sample = np.asarray(sample)
+    trailing = sample.shape[1:]
+    if not isinstance(destination, (str, os.PathLike)):
+        dtype = destination.dtype
+    elif dtype is None and sample.dtype.kind in 'USO' and not fixed:
+        raise ValueError("Interpolated strings have no fixed width: dtype must be given")
+    dtype = np.dtype(dtype if dtype is not None else sample.dtype)
+    if dtype.hasobject:
+        raise ValueError("Destination must have a fixed width dtype")
+    if sample.dtype.kind in 'USO' and not fixed:
+        mapping = _checked_width(mapping)
+    if isinstance(destination, (str, os.PathLike)):
+        destination = np.lib.format.open_memmap(destination, mode='w+', dtype=dtype,
+                                                shape=source.shape + trailing)
+    elif destination.shape != source.shape + trailing or not destination.flags.c_contiguous:
+        raise ValueError("Destination must be C-contiguous with shape %s"
+                         % (source.shape + trailing,))
+    out = destination.reshape((len(values),) + trailing)
+
+    # Source item, destination items and a few float temporaries per value
+    size = values.itemsize + destination.dtype.itemsize * int(np.prod(trailing)) + 3*8
+    workers = workers or os.cpu_count() or 1
+    window = max(1, int(memory // (size * workers)))
+    _map_chunks(mapping, values, out, 0, window, workers)
+    if isinstance(destination, np.memmap):
+        destination.flush()
+    return destination
+
+
+
+class ContinuousScale(Scale):
     """
     Continuous scales map a continuous, quantitative input domain to a
     continuous output range. If the range is also numeric, the mapping may be
@@ -207,18 +693,27 @@ class ContinuousScale(object):
     color = scale.linear(domain=[10, 100], range=["brown", "steelblue"])
     color(20) # "#9a3439"
     color(50) # "#7b5167"
+
+    Methods never modify a scale: nice, with_domain or with_range return new
+    scales that share the unchanged (read-only) arrays, such that copies are
+    cheap and scales can be shared across threads. Only the property setters
+    and update_extent modify a scale in place. Derived values (ticks, inverse
+    tables) are computed on demand and cached until the next change.
     """
+
+    # Transform (and its inverse) applied to domain values before
+    # interpolation (None means identity)
+    _transform = None
+    _untransform = None
+
+    # Running extent of streamed values
+    _extent = None
     
     def __init__(self, domain=[0,1], range=[0,1], clamp=False, interpolate=None):
 
         self._update_domain_range(domain, range)
         self._clamp  = bool(clamp)
-        if isinstance(range[0], (int,float)):
-            self._interpolate = interpolate_number
-        elif isinstance(range[0], np.datetime64):
-            self._interpolate = interpolate_time
-        else:
-            self._interpolate = interpolate_value
+        self._interpolate = _range_interpolate(range)
 
     @property
     def clamp(self):
@@ -227,10 +722,11 @@ class ContinuousScale(object):
     @clamp.setter
     def clamp(self, clamp):
         self._clamp = bool(clamp)
+        self._version += 1
 
     @property
     def domain(self):
-        return self._domain
+        return list(self._domain)
 
     @domain.setter
     def domain(self, domain):
@@ -245,24 +741,30 @@ class ContinuousScale(object):
         required for invert.
         """
         
-        return self._range
+        return list(self._range)
 
     @range.setter
     def range(self, range):
-        self._update_domain_range(self._domain, range)
-
+        self._set_range(range)
+
+    def _set_range(self, range):
+        self._interpolate = _range_interpolate(range)
+        if len(range) == len(self._range):
+            # Same pairing with the domain: the sorted domain is kept
+            self._range = list(range)
+            self._update_range()
+        else:
+            self._update_domain_range(self._domain, range)
 
     def _update_domain_range(self, domain, range):
 
         # Store domain and range
-        self._domain = domain
-        self._range = range
-        
+        self._domain = list(domain)
+        self._range = list(range)
+
         # Ensure len(domain) == len(range)
         n = min(len(domain), len(range))
         domain = domain[:n]
-        range  = range[:n]
-
 
         # Coerce domain values if necessary
         # (domain may have been given as ["1", "2"])
@@ -272,42 +774,231 @@ class ContinuousScale(object):
             except:
                 pass
 
-        # Forward domain & range
+        # Forward domain
         # (domain must be sorted in increasing order)
         domain = np.asarray(domain)
-        sorted = np.argsort(domain)
-        self._forward_domain = domain[sorted]
-        if isinstance(range, np.ndarray):
-            self._forward_range = range[sorted]
-        else:
-            self._forward_range = [range[i] for i in sorted]
+        if self._transform is not None and len(domain):
+            domain = self._transform(domain.astype(float))
+        self._order = np.argsort(domain)
+        self._ticks = {}
+        self._forward_domain = _readonly(domain[self._order])
+        self._update_range()
+
+    def _update_range(self):
+
+        # Forward range, in the order of the forward domain
+        range = [self._range[i] for i in self._order]
 
         # Try to convert range to a numpy array if possible
-        if len(self._forward_range):
-            if isinstance(self._forward_range[0], (int,float, np.datetime64)):
-                self._forward_range = np.asarray(self._forward_range)
-            
-        # Inverse domain & range
-        # (range must be sorted in increasing order)
-        if not isinstance(range, np.ndarray):
+        if len(range) and isinstance(range[0], (int,float, np.datetime64)):
+            range = _readonly(np.asarray(range))
+        self._forward_range = range
+
+        # Derived values are invalidated
+        self._cache = {}
+        self._version += 1
+
+    def _cached(self, key, compute):
+        """
+        Value of compute() cached until the next change of the scale
+        """
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = compute()
+            return value
+
+    def _inverse(self):
+        """
+        Inverse range and domain (range must be sorted in increasing order)
+        or None if the range is not numeric.
+        """
+
+        def compute():
+            n = len(self._order)
             try:
-                range = [float(v) for v in range]
-            except:
-                self._inverse_domain = None
-                self._inverse_range = None
-                return
-        range = np.asarray(range)
-        sorted = np.argsort(range)        
-        self._inverse_range = range[sorted]
-        self._inverse_domain = domain[sorted]
-            
+                range = np.array([float(v) for v in self._range[:n]])
+            except (TypeError, ValueError):
+                return None
+            # Domain in its given order (ties of the range keep this order)
+            domain = np.empty_like(self._forward_domain)
+            domain[self._order] = self._forward_domain
+            order = np.argsort(range)
+            return _readonly(range[order]), _readonly(domain[order])
+        return self._cached("inverse", compute)
+
+
+    def __call__(self, values, out=None, dtype=None):
+        """
+        Maps values from the domain to the range.
+
+        If *out* is given, results are written into it (no allocation) and it
+        is returned. Otherwise *dtype* sets the type of the result, e.g.
+        np.float32 to halve memory or np.int32 for pixel coordinates rounded
+        to the nearest integer. Floating point values keep their own dtype by
+        default.
+        """
+
+        if self._transform is not None:
+            values = np.asarray(values)
+            if self._interpolate is not interpolate_number:
+                values = self._transform(values)
+            else:
+                # Transform straight into the output buffer when possible, the
+                # interpolation is then made in place.
+                dtype = _output_dtype(values, out, dtype)
+                if out is not None and out.dtype == dtype and dtype.kind == 'f':
+                    values = self._transform(values, out=out)
+                else:
+                    values = self._transform(values)
+                    if out is None and values.dtype == dtype and len(values.shape):
+                        out = values
+        return self._interpolate(values, self._forward_domain, self._forward_range,
+                                 self._clamp, out=out, dtype=dtype)
+
+    def invert(self, values, out=None, dtype=None):
+        """
+        Maps values from the range back to the domain (see __call__ for the
+        meaning of *out* and *dtype*).
+        """
+
+        inverse = self._inverse()
+        if inverse is None:
+            return None
+        range, domain = inverse
+        if self._untransform is None:
+            return interpolate_number(values, range, domain,
+                                      self._clamp, out=out, dtype=dtype)
+        values = np.asarray(values)
+        dtype = _output_dtype(values, out, dtype)
+        if dtype.kind == 'f':
+            y = interpolate_number(values, range, domain,
+                                   self._clamp, out=out, dtype=dtype)
+        else:
+            y = interpolate_number(values, range, domain,
+                                   self._clamp, dtype=float)
+        if isinstance(y, np.ndarray):
+            y = self._untransform(y, out=y)
+        else:
+            y = self._untransform(y)
+        return _cast(np.asarray(y), out, dtype)
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale. Changes to this scale will not
+        affect the returned scale, and vice versa. Since arrays of a scale are
+        never modified in place, they are shared with the copy.
+        """
+        return copy.copy(self)
+
+    def with_domain(self, domain):
+        """
+        Returns a copy of this scale with the given domain.
+        """
+        scale = self.copy()
+        scale._update_domain_range(domain, self._range)
+        return scale
+
+    def with_range(self, range):
+        """
+        Returns a copy of this scale with the given range. If the range has
+        as many values as the current one, the sorted domain is shared.
+        """
+        scale = self.copy()
+        scale._set_range(range)
+        return scale
+
+    def nice(self, count=10):
+        """
+        Returns a copy of the scale whose domain starts and ends on nice round
+        values. An optional tick count argument allows greater control over
+        the step size used to extend the bounds. If the domain has more than
+        two values, nicing the domain only affects the first and last value.
+        """
+
+        scale = self.copy()
+        if len(self._domain):
+            scale._update_domain_range(self._nice_domain(self._domain, count), scale._range)
+        return scale
+
+    def _nice_domain(self, domain, count):
+        return _nice_linear(domain, count)
+
+    @property
+    def extent(self):
+        """
+        Extent (min, max) of the values seen by update_extent (None before)
+        """
+        return self._extent
+
+    def update_extent(self, values, count=10):
+        """
+        Tracks the extent of streamed values: the running extent is updated
+        with the given chunk of values (NaN are ignored) and the domain is
+        extended to cover it, only if it does not already. The new domain is
+        niced (see nice) unless count is None, such that changes are rare.
+        On first call, the domain is set from the values. Returns whether the
+        domain changed (the version of the scale is then incremented).
+        """
+
+        values = np.asarray(values)
+        if not values.size:
+            return False
+        lo = np.fmin.reduce(values, axis=None)
+        hi = np.fmax.reduce(values, axis=None)
+        if lo != lo:
+            return False
+        if self._extent is not None:
+            lo, hi = min(lo, self._extent[0]), max(hi, self._extent[1])
+            changed = False
+        else:
+            changed = True
+        self._extent = lo, hi
+
+        d = list(self._domain)
+        i0, i1 = 0, len(d)-1
+        if d[i1] < d[i0]:
+            i0, i1 = i1, i0
+        if not changed and d[i0] <= lo and hi <= d[i1]:
+            return False
+        d[i0], d[i1] = lo, hi
+        if count is not None:
+            d = self._nice_domain(d, count)
+        self._update_domain_range(d, self._range)
+        return True
+
+    def _untransform_domain(self, values):
+        """
+        Domain values corresponding to (float) transformed domain values
+        """
+        values = np.asarray(values, dtype=float)
+        if self._untransform is not None:
+            values = self._untransform(values)
+        return values
 
     def ticks(self, count=10):
+        """
+        Returns approximately count representative values from the scale’s
+        domain (cached per domain and count, see also ticks_many).
+        """
 
         if not isinstance(count, int) or count < 1:
             return []
+        key = self._domain[0], self._domain[-1], count
+        if key not in self._ticks:
+            self._ticks[key] = ticks(*key)
+        return list(self._ticks[key])
+
+    def tick_format(self, count=10, specifier=None):
+        """
+        Returns a number format function suitable for displaying a tick
+        value, automatically computing the appropriate precision based on the
+        fixed interval between tick values. The specified count should have
+        the same value as the count that is used to generate the tick
+        values. The returned function formats numbers or arrays of numbers.
+        """
         domain = self._domain
-        return ticks(domain[0], domain[-1], count)
+        return tick_format(float(domain[0]), float(domain[-1]), count, specifier)
 
 
 
@@ -323,78 +1014,1544 @@ class LinearScale(ContinuousScale):
     def __init__(self, domain=[0,1], range=[0,1], clamp=False):
         ContinuousScale.__init__(self, domain, range, clamp)
 
-    def __call__(self, values):
-        return self._interpolate(values, self._forward_domain, self._forward_range, self._clamp)
+linear = LinearScale
+
+
+def _log_ticks(start, stop, count, base):
+    """
+    Ticks for the strictly positive interval [start, stop] with start < stop
+    (see LogScale.ticks).
+    """
+
+    logs, pows = _log_pow(base)
+    i, j = logs(start), logs(stop)
+    if base % 1 == 0 and j - i < count:
+        # Every integer multiple of the powers of base spanning the interval
+        e = np.arange(math.floor(i), math.ceil(j)+1, dtype=float).reshape(-1,1)
+        k = np.arange(1, base, dtype=float).reshape(1,-1)
+        t = np.where(e < 0, k / np.power(base, -e), k * np.power(base, e)).ravel()
+        t = t[(t >= start) & (t <= stop)]
+        if len(t)*2 < count:
+            return ticks(start, stop, count)
+        return t.tolist()
+    return [pows(e) for e in ticks(i, j, min(j - i, count))]
+
+
+def _log_pow(base):
+    """
+    Returns the (log, pow) functions for the given base, using the exact
+    variants for the usual bases.
+    """
+
+    if base == 10:
+        return math.log10, lambda x: float("1e%d" % x) if x % 1 == 0 else 10**x
+    elif base == 2:
+        return math.log2, lambda x: 2.0**x
+    elif base == math.e:
+        return math.log, math.exp
+    return lambda x: math.log(x)/math.log(base), lambda x: float(base)**x
+
+
+
+class LogScale(ContinuousScale):
+    """
+    Log scales are similar to linear scales, except a logarithmic transform is
+    applied to the input domain value before the output range value is
+    computed. The mapping to the range value y can be expressed as a function
+    of the domain value x: y = m log(x) + b.
+
+    As log(0) = -∞, a log scale domain must be strictly-positive or
+    strictly-negative; the domain must not include or cross zero. A log scale
+    with a positive domain has a well-defined behavior for positive values,
+    and a log scale with a negative domain has a well-defined behavior for
+    negative values. (For a negative domain, input and output values are
+    implicitly multiplied by -1.)
+
+    Constructs a new log scale with the domain [1, 10], the unit range [0, 1],
+    the base 10, a value interpolator and clamping disabled.
+    """
+
+    def __init__(self, domain=[1,10], range=[0,1], base=10, clamp=False):
+        self._base = base
+        ContinuousScale.__init__(self, domain, range, clamp)
+
+    @property
+    def base(self):
+        """
+        Base of the logarithm used for ticks and nicing (the mapping itself
+        does not depend on the base).
+        """
+        return self._base
+
+    @base.setter
+    def base(self, base):
+        self._base = base
+        self._ticks = {}
+        self._cache = {}
+        self._version += 1
 
-    def invert(self, values):
-        if self._inverse_range is not None:
-            return self._interpolate(values, self._inverse_range, self._inverse_domain, self._clamp)
+    def _update_domain_range(self, domain, range):
+        if len(domain) and float(domain[0]) < 0:
+            self._transform = _transform_logn
+            self._untransform = _transform_expn
         else:
-            return None
+            self._transform = _transform_log
+            self._untransform = _transform_exp
+        ContinuousScale._update_domain_range(self, domain, range)
 
-    def nice(self, count = 10):
+    def ticks(self, count=10):
         """
-        Extends the domain so that it starts and ends on nice round values. This
-        method typically modifies the scale’s domain, and may only extend the
-        bounds to the nearest round value. An optional tick count argument
-        allows greater control over the step size used to extend the bounds,
-        guaranteeing that the returned ticks will exactly cover the
-        domain. Nicing is useful if the domain is computed from data, say using
-        extent, and may be irregular. For example, for a domain of [0.201479…,
-        0.996679…], a nice domain might be [0.2, 1.0]. If the domain has more
-        than two values, nicing the domain only affects the first and last
-        value.
+        Like continuous.ticks, but customized for a log scale. If the base is
+        an integer, the returned ticks are uniformly spaced within each integer
+        power of base; otherwise, one tick per power of base is returned. The
+        returned ticks are guaranteed to be within the extent of the domain. If
+        the orders of magnitude in the domain is greater than count, then at
+        most one tick per power is returned. Otherwise, the tick values are
+        unfiltered, but note that you can use log.tick_format to filter the
+        display of tick labels.
         """
-        
-        scale = LinearScale(domain=self._domain, range=self._range, clamp=self._clamp)
-        d = self._domain
-        n = count
-        start, stop = d[0], d[-1]
 
-        # Degenerate case
-        if start == stop: return scale
-        
-        step = tick_step(start, stop, n)
-        if step:
-            step = tick_step(math.floor(start/step)*step, math.ceil(stop/step)*step, n)
-            d[0] = math.floor(start / step) * step
-            d[-1] = math.ceil(stop / step) * step
-            scale._update_domain_range(d, self._range)
-        return scale
-    
-            
-linear = LinearScale
-    
+        if not isinstance(count, int) or count < 1:
+            return []
+        start, stop = float(self._domain[0]), float(self._domain[-1])
+        reverse = stop < start
+        if reverse:
+            start, stop = stop, start
+        if start > 0:
+            t = _log_ticks(start, stop, count, self._base)
+        elif stop < 0:
+            t = [-v for v in _log_ticks(-stop, -start, count, self._base)][::-1]
+        else:
+            return []
+        return t[::-1] if reverse else t
+
+    def tick_format(self, count=10, specifier=None):
+        """
+        Like continuous.tick_format, but customized for a log scale. If
+        count is None, labels of all ticks are returned; otherwise labels of
+        ticks that would be too dense are blank (empty strings). The default
+        specifier is "s" for base 10 and "," otherwise.
+        """
+
+        if specifier is None:
+            specifier = "s" if self._base == 10 else ","
+        specifier = formats.FormatSpecifier(specifier)
+        if not self._base % 1 and specifier.precision is None:
+            specifier.trim = True
+        format = formats.format(specifier)
+        if count is None:
+            return format
+        base = self._base
+        k = max(1, base * count / max(1, len(self.ticks())))
+
+        def log_format(values):
+            labels = format(values)
+            d = np.abs(np.asarray(values, dtype=float))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                i = d / float(base)**np.round(np.log(d) / math.log(base))
+            i = np.where(i * base < base - 0.5, i * base, i)
+            return np.where(i <= k, labels, "")[()]
+        return log_format
+
+    def _nice_domain(self, domain, count):
+        logs, pows = _log_pow(self._base)
+        def floor(x):
+            if x < 0: return -pows(math.ceil(logs(-x)))
+            return pows(math.floor(logs(x)))
+        def ceil(x):
+            if x < 0: return -pows(math.floor(logs(-x)))
+            return pows(math.ceil(logs(x)))
+
+        d = list(domain)
+        i0, i1 = 0, len(d)-1
+        if d[i1] < d[i0]:
+            i0, i1 = i1, i0
+        d[i0], d[i1] = floor(float(d[i0])), ceil(float(d[i1]))
+        return d
+
+log = LogScale
+
+
+
+class PowScale(ContinuousScale):
+    """
+    Power scales are similar to linear scales, except an exponential transform
+    is applied to the input domain value before the output range value is
+    computed. Each range value y can be expressed as a function of the domain
+    value x: y = mx^k + b, where k is the exponent value. Power scales also
+    support negative domain values, in which case the input value and the
+    resulting output value are multiplied by -1.
+
+    Constructs a new continuous scale with the unit domain [0, 1], the unit
+    range [0, 1], the exponent 1, a value interpolator and clamping disabled.
+    (Note that this is effectively a linear scale until you set a different
+    exponent.)
+    """
+
+    def __init__(self, domain=[0,1], range=[0,1], exponent=1, clamp=False):
+        self._exponent = exponent
+        self._update_transform()
+        ContinuousScale.__init__(self, domain, range, clamp)
+
+    @property
+    def exponent(self):
+        """
+        Current exponent of the scale. If the exponent is 1, the power scale is
+        effectively a linear scale.
+        """
+        return self._exponent
+
+    @exponent.setter
+    def exponent(self, exponent):
+        self._exponent = exponent
+        self._update_transform()
+        self._update_domain_range(self._domain, self._range)
+
+    def _update_transform(self):
+        if self._exponent == 1:
+            self._transform = self._untransform = None
+        else:
+            self._transform = _transform_pow(self._exponent)
+            self._untransform = _transform_pow(1.0/self._exponent)
+
+pow = PowScale
+
+
+
+class SqrtScale(PowScale):
+    """
+    Constructs a new continuous power scale with the unit domain [0, 1], the
+    unit range [0, 1], the exponent 0.5, a value interpolator and clamping
+    disabled.
+    """
+
+    def __init__(self, domain=[0,1], range=[0,1], clamp=False):
+        PowScale.__init__(self, domain, range, 0.5, clamp)
+
+sqrt = SqrtScale
+
+
+
+class SymlogScale(ContinuousScale):
+    """
+    Symlog scales are similar to log scales but work with domains that
+    include (or cross) zero: the transform sign(x)·log(1 + |x/c|) is linear
+    around zero and logarithmic far from it. The constant c (1 by default)
+    sets the extent of the linear region.
+
+    Constructs a new continuous scale with the unit domain [0, 1], the unit
+    range [0, 1], the constant 1, a value interpolator and clamping disabled.
+    """
+
+    def __init__(self, domain=[0,1], range=[0,1], constant=1, clamp=False):
+        self._constant = constant
+        self._update_transform()
+        ContinuousScale.__init__(self, domain, range, clamp)
+
+    @property
+    def constant(self):
+        """
+        Symlog constant, i.e. the extent of the linear region around zero.
+        """
+        return self._constant
+
+    @constant.setter
+    def constant(self, constant):
+        self._constant = constant
+        self._update_transform()
+        self._update_domain_range(self._domain, self._range)
+
+    def _update_transform(self):
+        self._transform = _transform_symlog(float(self._constant))
+        self._untransform = _transform_symexp(float(self._constant))
+
+symlog = SymlogScale
+
+
+
+# Durations (in milliseconds) used to pick a time tick interval
+_duration_second = 1000
+_duration_minute = _duration_second * 60
+_duration_hour   = _duration_minute * 60
+_duration_day    = _duration_hour * 24
+_duration_week   = _duration_day * 7
+_duration_month  = _duration_day * 30
+_duration_year   = _duration_day * 365
+
+_tick_intervals = [
+    (intervals.second,  1,      _duration_second),
+    (intervals.second,  5,  5 * _duration_second),
+    (intervals.second, 15, 15 * _duration_second),
+    (intervals.second, 30, 30 * _duration_second),
+    (intervals.minute,  1,      _duration_minute),
+    (intervals.minute,  5,  5 * _duration_minute),
+    (intervals.minute, 15, 15 * _duration_minute),
+    (intervals.minute, 30, 30 * _duration_minute),
+    (intervals.hour,    1,      _duration_hour  ),
+    (intervals.hour,    3,  3 * _duration_hour  ),
+    (intervals.hour,    6,  6 * _duration_hour  ),
+    (intervals.hour,   12, 12 * _duration_hour  ),
+    (intervals.day,     1,      _duration_day   ),
+    (intervals.day,     2,  2 * _duration_day   ),
+    (intervals.week,    1,      _duration_week  ),
+    (intervals.month,   1,      _duration_month ),
+    (intervals.month,   3,  3 * _duration_month ),
+    (intervals.year,    1,      _duration_year  )
+]
+_tick_durations = [duration for _, _, duration in _tick_intervals]
+
+
+def _finest(dtype, unit):
+    """
+    Finest of a datetime64 dtype and a datetime64 unit
+    """
+    return np.result_type(dtype, np.dtype('datetime64[%s]' % unit))
+
+
+def _tick_interval(start, stop, count):
+    """
+    Returns the time interval giving about count ticks between the
+    datetime64 start and stop (start < stop).
+    """
+
+    milliseconds = np.array([start, stop]).astype('datetime64[ms]').view(np.int64)
+    target = abs(milliseconds[1] - milliseconds[0]) / count
+    i = bisect.bisect_right(_tick_durations, target)
+    if i == len(_tick_intervals):
+        step = tick_step(milliseconds[0] / _duration_year,
+                         milliseconds[1] / _duration_year, count)
+        return intervals.year.every(max(1, int(round(abs(step)))))
+    elif i:
+        if target / _tick_durations[i-1] < _tick_durations[i] / target:
+            i -= 1
+        interval, step, _ = _tick_intervals[i]
+        return interval.every(step)
+
+    # Sub-second intervals: uniform ticks in (at least) milliseconds
+    dtype = _finest(np.result_type(start, stop), 'ms')
+    counts = np.array([start, stop]).astype(dtype).view(np.int64)
+    step = max(1, int(round(abs(tick_step(counts[0], counts[1], count)))))
+    return intervals.Interval(np.datetime_data(dtype)[0], step)
+
+
+
+class TimeScale(ContinuousScale):
+    """
+    Time scales are a variant of linear scales that have a temporal domain:
+    domain values are numpy datetime64 (or anything numpy can convert, such
+    as ISO 8601 strings) and invert returns datetime64 values. Time scales
+    implement ticks based on calendar intervals, taking the pain out of
+    generating axes for temporal domains.
+
+    The mapping is made on the int64 representation of dates, relative to
+    the domain start, such that precision depends on the extent of the
+    domain rather than on its distance to the epoch. Inverting integer
+    positions (e.g. pixels) is exact whatever the unit (down to
+    nanoseconds); inverting float positions is exact while the domain spans
+    less than 2**53 units (about 104 days in nanoseconds), see
+    interpolate_time. Since numpy dates carry no time zone, time and utc
+    scales are the same.
+
+    Constructs a new time scale with the domain [2000-01-01, 2000-01-02],
+    the unit range [0, 1], the default interpolator and clamping disabled.
+    """
+
+    def __init__(self, domain=[np.datetime64("2000-01-01"), np.datetime64("2000-01-02")],
+                 range=[0,1], clamp=False):
+        ContinuousScale.__init__(self, domain, range, clamp)
+
+    def _update_domain_range(self, domain, range):
+        if len(domain):
+            dates = np.asarray(domain, dtype='datetime64')
+        else:
+            dates = np.empty(0, dtype='datetime64[ms]')
+        self._dtype = dates.dtype
+        ContinuousScale._update_domain_range(self, dates.view(np.int64), range)
+        self._domain = list(dates)
+
+    def _inverse(self):
+        def compute():
+            inverse = ContinuousScale._inverse(self)
+            if inverse is None:
+                return None
+            range, domain = inverse
+            dtype = _finest(self._dtype, 'ms')
+            return range, domain.view(self._dtype).astype(dtype)
+        return self._cached("inverse dates", compute)
+
+    def __call__(self, values, out=None, dtype=None):
+        """
+        Maps dates from the domain to the range (see continuous.__call__ for
+        the meaning of *out* and *dtype*).
+        """
+
+        values = np.asarray(values)
+        if values.dtype.kind != 'M':
+            values = values.astype('datetime64')
+        unit = np.result_type(values.dtype, self._dtype)
+        domain = self._forward_domain
+        if unit != self._dtype:
+            domain = domain.view(self._dtype).astype(unit).view(np.int64)
+        values = values.astype(unit, copy=False).view(np.int64)
+        return self._interpolate(values, domain, self._forward_range,
+                                 self._clamp, out=out, dtype=dtype)
+
+    def invert(self, values, out=None, dtype=None):
+        """
+        Maps values from the range back to dates (with at least a millisecond
+        resolution). Results are written into *out* when given, *dtype* may
+        be used to request another datetime64 unit.
+        """
+
+        inverse = self._inverse()
+        if inverse is None:
+            return None
+        range, dates = inverse
+        return interpolate_time(values, range, dates, self._clamp, out=out, dtype=dtype)
+
+    def ticks(self, interval=10):
+        """
+        Returns representative dates from the scale’s domain. The returned
+        tick values are uniformly-spaced (mostly), have sensible values (such
+        as every day at midnight), and are guaranteed to be within the extent
+        of the domain.
+
+        An optional count may be specified to affect how many ticks are
+        generated (10 by default). Alternatively, a time interval may be
+        specified to explicitly set the ticks, e.g. time.minute.every(15).
+        """
+
+        if not len(self._domain):
+            return []
+        start, stop = self._domain[0], self._domain[-1]
+        reverse = stop < start
+        if reverse:
+            start, stop = stop, start
+        if not isinstance(interval, intervals.Interval):
+            if not isinstance(interval, int) or interval < 1:
+                return []
+            if start == stop:
+                return [start]
+            interval = _tick_interval(start, stop, interval)
+        dtype = _finest(np.result_type(start, stop), 'ms')
+        stop = stop.astype(dtype) + np.timedelta64(1, np.datetime_data(dtype)[0])
+        ticks = interval.range(start, stop)
+        return list(ticks[::-1] if reverse else ticks)
+
+    def tick_format(self, interval=10, specifier=None):
+        """
+        Returns a time format function suitable for displaying tick values:
+        dates are formatted as ISO 8601 strings down to the unit of the tick
+        interval (a count or a time interval, as for ticks). A numpy datetime
+        unit (e.g. "D" or "m") may be given as specifier instead.
+        """
+
+        unit = specifier
+        if unit is None:
+            unit = np.datetime_data(self._dtype)[0]
+            start, stop = min(self._domain), max(self._domain)
+            if isinstance(interval, intervals.Interval):
+                unit = interval.unit
+            elif start < stop and isinstance(interval, int) and interval > 0:
+                unit = _tick_interval(start, stop, interval).unit
+            if unit == 'W':
+                unit = 'D'
+
+        def time_format(values):
+            values = np.asarray(values)
+            if values.dtype.kind != 'M':
+                values = values.astype('datetime64')
+            strings = np.datetime_as_string(values, unit=unit)
+            return strings if values.ndim else str(strings)
+        return time_format
+
+    def _untransform_domain(self, values):
+        counts = np.rint(np.asarray(values, dtype=float)).astype(np.int64)
+        return counts.view(self._dtype)
+
+    def _nice_domain(self, domain, interval):
+        d = list(domain)
+        i0, i1 = 0, len(d)-1
+        if d[i1] < d[i0]:
+            i0, i1 = i1, i0
+        if not isinstance(interval, intervals.Interval):
+            if d[i0] == d[i1]:
+                return d
+            interval = _tick_interval(d[i0], d[i1], interval)
+        d[i0], d[i1] = interval.floor(d[i0]), interval.ceil(d[i1])
+        return d
+
+    def nice(self, interval=10):
+        """
+        Returns a copy of the scale whose domain is extended to nice round
+        dates, according to the tick interval for the given count (10 by
+        default) or the given time interval (e.g. time.day).
+        """
+        return ContinuousScale.nice(self, interval)
+
+time = TimeScale
+utc = TimeScale
+
+
+
+def compose(first, second):
+    """
+    Returns a single continuous scale equivalent to second(first(x)), such
+    that a chain of mappings runs in one pass with one output allocation.
+
+    The first scale may be any continuous scale with a numeric range (linear,
+    log, pow, time, ...) while the second one must be piecewise linear in its
+    input (linear scale, with any range supported by the interpolator). Both
+    piecewise mappings are fused analytically: breakpoints of the result are
+    the domain values of the first scale plus the values where it crosses a
+    domain value of the second one. The result has the type (and transform)
+    of the first scale and is clamped if either scale is clamped.
+    """
+
+    if not isinstance(first, ContinuousScale) or not isinstance(second, ContinuousScale):
+        raise ValueError("Only continuous scales can be composed")
+    if second._transform is not None or isinstance(second, TimeScale):
+        raise ValueError("Second scale must be piecewise linear in its input")
+    yp = first._forward_range
+    if not isinstance(yp, np.ndarray) or yp.dtype.kind not in 'iuf':
+        raise ValueError("First scale must have a numeric range")
+
+    if isinstance(first, TimeScale):
+        # Crossings fall between dates: fuse with (at least) milliseconds
+        first = first.copy()
+        first.domain = np.asarray(first.domain).astype(_finest(first._dtype, 'ms'))
+
+    up = np.asarray(first._forward_domain, dtype=float)
+    yp = yp.astype(float)
+    breaks = np.asarray(second._forward_domain, dtype=float)
+
+    # Crossings of the breakpoints of second by each segment of first, as a
+    # fraction s of the segment (unclamped end segments extend to infinity)
+    u0, u1 = up[:-1, np.newaxis], up[1:, np.newaxis]
+    y0, y1 = yp[:-1, np.newaxis], yp[1:, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = (breaks - y0) / (y1 - y0)
+    inside = (s > 0) & (s < 1)
+    if not first._clamp and len(s):
+        inside[0] |= s[0] <= 0
+        inside[-1] |= s[-1] >= 1
+    crossings = (u0 + s * (u1 - u0))[inside & np.isfinite(s)]
+
+    domain = first._untransform_domain(np.unique(np.concatenate([up, crossings])))
+    scale = first.copy()
+    scale._clamp = first._clamp or second._clamp
+    scale._interpolate = second._interpolate
+    scale._update_domain_range(list(domain), list(second(first(domain))))
+    return scale
+
+
+
+def _rgba(color):
+    """
+    RGBA components (in [0,1]) of an interpolated color, which may be a Color,
+    a color string or a rgb(a) tuple.
+    """
+    if isinstance(color, (tuple, list)):
+        return tuple(color) + (1.0,) * (4 - len(color))
+    color = Color(color)
+    return tuple(color.rgb) + (color.alpha,)
+
+
+def _sample(interpolator, resolution):
+    """
+    Samples an interpolator on [0,1] into lookup tables. Returns the table of
+    values (numbers or hex colors) and the RGBA8 table (None for numbers),
+    each with an extra last entry for unknown values.
+    """
+
+    if isinstance(interpolator, Scheme):
+        # Chromatic schemes provide (cached) lookup tables
+        rgba = interpolator.lut(resolution)
+    else:
+        samples = [interpolator(t) for t in np.linspace(0, 1, resolution)]
+        if all(isinstance(v, (int, float, np.number)) for v in samples):
+            return np.append(np.asarray(samples, dtype=float), np.nan), None
+        rgba = np.array([_rgba(color) for color in samples], dtype=float)
+        rgba = np.rint(np.clip(rgba, 0, 1) * 255).astype(np.uint8)
+    rgba = np.concatenate([rgba, np.zeros((1, 4), dtype=np.uint8)])
+    colors = ["#%02x%02x%02x" % tuple(c) for c in rgba[:-1, :3].tolist()]
+    return np.array(colors + ["none"]), rgba
+
+
+
+class SequentialScale(Scale):
+    """
+    Sequential scales are similar to continuous scales in that they map a
+    continuous, numeric input domain to a continuous output range. However,
+    unlike continuous scales, the output range of a sequential scale is fixed
+    by its interpolator, a function of t in [0,1] returning numbers or colors
+    (e.g. interpolate.rgb("white", "steelblue")).
+
+    The interpolator is sampled once into a lookup table of *resolution*
+    entries such that mapping an array costs one multiply-add and one gather
+    per element. Values outside the domain map to the extremities of the
+    interpolator and NaN maps to "none" (transparent for rgba).
+
+    Constructs a new sequential scale with the given interpolator (identity by
+    default) and the unit domain [0, 1].
+    """
+
+    def __init__(self, interpolator=None, domain=[0,1], resolution=256):
+        if resolution < 2:
+            raise ValueError("Resolution must be at least 2")
+        self._interpolator = interpolator if interpolator is not None else lambda t: t
+        self._resolution = int(resolution)
+        self._domain = [float(x) for x in domain]
+        self._sample()
+        self._rescale()
+
+    @property
+    def interpolator(self):
+        """ The scale’s interpolator (setting it resamples the lookup table) """
+        return self._interpolator
+
+    @interpolator.setter
+    def interpolator(self, interpolator):
+        self._interpolator = interpolator
+        self._sample()
+
+    @property
+    def resolution(self):
+        """ Number of samples of the interpolator in the lookup table """
+        return self._resolution
+
+    @resolution.setter
+    def resolution(self, resolution):
+        if resolution < 2:
+            raise ValueError("Resolution must be at least 2")
+        self._resolution = int(resolution)
+        self._sample()
+        self._rescale()
+
+    @property
+    def domain(self):
+        """ The scale’s domain, a two-element array of numbers """
+        return self._domain
+
+    @domain.setter
+    def domain(self, domain):
+        self._domain = [float(x) for x in domain]
+        self._rescale()
+
+    def _sample(self):
+        self._values, self._rgba = _sample(self._interpolator, self._resolution)
+        self._version += 1
+
+    def _rescale(self):
+        # index = x * scale + offset where offset includes the rounding term
+        x0, x1 = self._domain[0], self._domain[-1]
+        n = self._resolution - 1
+        k = 0 if x0 == x1 else 1 / (x1 - x0)
+        self._scale = k * n
+        self._offset = (0.5 if x0 == x1 else -x0 * k) * n + 0.5
+        self._version += 1
+
+    def _normalize(self, values):
+        values = np.asarray(values, dtype=float)
+        return np.add(values * self._scale, self._offset)
+
+    def _index(self, values):
+        """
+        Lookup table index of each value (the last entry for NaN)
+        """
+        index = np.asarray(self._normalize(values))
+        np.clip(index, 0, self._resolution - 0.5, out=index)
+        np.nan_to_num(index, copy=False, nan=self._resolution)
+        return index.astype(np.intp)
+
+    def __call__(self, values, out=None):
+        """
+        Maps values from the domain to the interpolator output: numbers or hex
+        color strings. Results are written into *out* when given.
+        """
+        return self._values.take(self._index(values), out=out)
+
+    def rgba(self, values, out=None):
+        """
+        Maps values from the domain to RGBA colors as uint8, with shape
+        values.shape + (4,). Results are written into *out* when given.
+        """
+        if self._rgba is None:
+            raise ValueError("Interpolator does not produce colors")
+        return self._rgba.take(self._index(values), axis=0, out=out)
+
+    def ticks(self, count=10):
+        """
+        Equivalent to continuous.ticks.
+        """
+        if not isinstance(count, int) or count < 1:
+            return []
+        return ticks(self._domain[0], self._domain[-1], count)
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale (the lookup tables are shared).
+        """
+        return copy.copy(self)
+
+sequential = SequentialScale
+
+
+
+class DivergingScale(SequentialScale):
+    """
+    Diverging scales are similar to sequential scales, except the domain has
+    three values: the interpolator is evaluated at 0 for the first, 0.5 for
+    the middle (e.g. a neutral value) and 1 for the last domain value, each
+    half of the domain being mapped linearly.
+
+    Constructs a new diverging scale with the given interpolator (identity by
+    default) and the domain [0, 0.5, 1]. The default resolution is odd such
+    that the middle of the interpolator is sampled exactly.
+    """
+
+    def __init__(self, interpolator=None, domain=[0,0.5,1], resolution=257):
+        SequentialScale.__init__(self, interpolator, domain, resolution)
+
+    def _rescale(self):
+        x0, x1, x2 = self._domain
+        n = self._resolution - 1
+        k10 = 0 if x0 == x1 else 0.5 / (x1 - x0)
+        k21 = 0 if x1 == x2 else 0.5 / (x2 - x1)
+        self._sign = -1 if x1 < x0 else 1
+        self._scales = np.array([k21 * n, k10 * n])
+        self._offset = 0.5 * n + 0.5
+        self._version += 1
+
+    def _normalize(self, values):
+        values = np.asarray(values, dtype=float)
+        x1 = self._domain[1]
+        lower = (values * self._sign < x1 * self._sign).astype(np.intp)
+        return np.add((values - x1) * self._scales.take(lower), self._offset)
+
+diverging = DivergingScale
+    
+
+
+def _as_array(values):
+    """
+    Converts a list of range values to a one dimensional array (numbers and
+    strings get a native dtype, anything else is stored as objects).
+    """
+    array = np.asarray(values) if len(values) else np.empty(0, dtype=object)
+    if array.dtype.kind not in "biufcUSM" or len(array.shape) != 1:
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+    return array
+
+
+def _build_index(values):
+    """
+    Hash index from (hashable) values to their first position.
+    """
+    index = {}
+    for i, value in enumerate(values):
+        try:
+            index.setdefault(value, i)
+        except TypeError:
+            pass
+    return index
+
+
+def _as_values(values):
+    """
+    Converts categorical input values to an array. numpy would silently turn
+    a list mixing strings and numbers into strings, such lists are kept as
+    objects.
+    """
+    if isinstance(values, np.ndarray):
+        return values
+    array = np.asarray(values)
+    if (array.dtype.kind == 'U' and len(array.shape) == 1 and
+        not all(isinstance(v, str) for v in values)):
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+    return array
+
+
+def _with_unknown(values, unknown):
+    """
+    Lookup table of values followed by the unknown value (index -1), keeping
+    a native dtype when possible (e.g. numbers with a nan unknown value).
+    """
+    table = _as_array(list(values) + [unknown])
+    native = _as_array(list(values))
+    kinds = [native.dtype.kind, np.asarray(unknown).dtype.kind]
+    if table.dtype == object and unknown is not None and (
+       set(kinds) <= set("biuf") or kinds == ["U", "U"]):
+        table = np.append(native, unknown)
+    return table
+
+
+def _lookup(index, values):
+    """
+    Position (from index, see _build_index) of each of the given values or -1
+    for unknown values. Distinct values are looked up only once, such that
+    the cost is dominated by np.unique.
+    """
+    values = _as_values(values)
+    try:
+        uniques, inverse = np.unique(values, return_inverse=True)
+    except TypeError:
+        # Values cannot be sorted (mixed types)
+        codes = [index.get(value, -1) for value in values.flat]
+        return np.array(codes, dtype=np.intp).reshape(values.shape)
+    codes = np.array([index.get(value, -1) for value in uniques.tolist()], dtype=np.intp)
+    return codes.take(inverse).reshape(values.shape)
+
+
+
+class DiscretizingScale(Scale):
+    """
+    Quantize, quantile and threshold scales map a continuous domain to a
+    discrete range: the domain is divided by a sorted list of thresholds, and
+    a value is mapped to the range element of the segment it falls in. Arrays
+    are classified with a single binary search (np.searchsorted) against the
+    thresholds. Undefined values (NaN) and any value of a scale with an
+    empty range are mapped to the unknown value (None by default, as d3).
+    This class is not constructed directly.
+    """
+
+    _unknown = None
+
+    def _compile(self, thresholds, lower, upper):
+        """
+        Precompute everything needed for mapping and inversion: the sorted
+        thresholds, the range as an array, a hash index of the range values
+        and the extent (lower, upper) of each class.
+        """
+
+        self._thresholds = np.asarray(thresholds)
+        self._values = _as_array(self._range)
+        self._table = _with_unknown(self._range, self._unknown)
+        self._index = _build_index(self._range)
+        self._extents = np.empty((len(lower), 2), dtype=np.result_type(
+            np.asarray(lower), np.asarray(upper)))
+        self._extents[:,0] = lower
+        self._extents[:,1] = upper
+        self._version += 1
+
+    @property
+    def range(self):
+        return self._range
+
+    @range.setter
+    def range(self, range):
+        self._range = list(range)
+        self._rescale()
+
+    @property
+    def unknown(self):
+        """
+        Value returned for undefined (NaN) input values, or for any value if
+        the range is empty. Use nan to keep numeric outputs numeric.
+        """
+        return self._unknown
+
+    @unknown.setter
+    def unknown(self, unknown):
+        self._unknown = unknown
+        self._table = _with_unknown(self._range, unknown)
+        self._version += 1
+
+    def __call__(self, values, out=None):
+        """
+        Given a value in the input domain, returns the corresponding value in
+        the output range. Arrays are mapped as a whole and the result may be
+        written into *out*.
+        """
+
+        values = np.asarray(values)
+        index = np.asarray(np.searchsorted(self._thresholds, values, side='right'))
+        undefined = np.isnan(values) if values.dtype.kind in 'fc' else np.zeros(values.shape, bool)
+        if len(values.shape) == 0 and out is None:
+            if undefined or not len(self._range):
+                return self._unknown
+            return self._range[int(index)]
+        if len(self._range) and not undefined.any():
+            return self._values.take(index, out=out)
+        # Unknown values are looked up at index -1 of the table
+        index = np.where(undefined | (not len(self._range)), -1, index)
+        return self._table.take(index, out=out)
+
+    def invert_extent(self, values):
+        """
+        Returns the extent of values in the domain [x0, x1] for the
+        corresponding value in the range: the inverse of this scale. This
+        method is useful for interaction, say to determine the value in the
+        domain that corresponds to the pixel location under the mouse. Arrays
+        of range values give an array of shape (n, 2). Unknown values (and
+        unbounded extremities of threshold scales) are nan, or None for non
+        numeric domains.
+        """
+
+        if np.ndim(values) == 0:
+            try:
+                i = self._index.get(values, -1)
+            except TypeError:
+                i = -1
+            if i < 0:
+                return [self._unknown_extent,]*2
+            return self._extents[i].tolist()
+
+        codes = _lookup(self._index, values)
+        extents = self._extents.take(np.maximum(codes, 0), axis=0)
+        extents[codes < 0] = self._unknown_extent
+        return extents
+
+    @property
+    def _unknown_extent(self):
+        return np.nan if self._extents.dtype.kind == 'f' else None
+
+
+
+class QuantizeScale(DiscretizingScale):
+    """
+    Quantize scales are similar to linear scales, except they use a discrete
+    rather than continuous range. The continuous input domain is divided into
+    uniform segments based on the number of values in (i.e., the cardinality
+    of) the output range. Each range value y can be expressed as a quantized
+    linear function of the domain value x: y = m round(x) + b.
+
+    Constructs a new quantize scale with the unit domain [0, 1] and the unit
+    range [0, 1]. Thus, the default quantize scale is equivalent to the round
+    function for numbers; for example quantize(0.49) returns 0, and
+    quantize(0.51) returns 1.
+    """
+
+    def __init__(self, domain=[0,1], range=[0,1], unknown=None):
+        self._domain = list(domain)
+        self._range = list(range)
+        self._unknown = unknown
+        self._rescale()
+
+    @property
+    def domain(self):
+        """
+        The scale’s domain, a two-element array of numbers. If the elements in
+        the given array are not numbers, they will be coerced to numbers.
+        """
+        return self._domain
+
+    @domain.setter
+    def domain(self, domain):
+        self._domain = list(domain)
+        self._rescale()
+
+    def _rescale(self):
+        x0, x1 = float(self._domain[0]), float(self._domain[-1])
+        n = len(self._range) - 1
+        i = np.arange(n)
+        thresholds = ((i + 1) * x1 - (i - n) * x0) / (n + 1)
+        self._compile(thresholds, np.concatenate([[x0], thresholds]),
+                                  np.concatenate([thresholds, [x1]]))
+
+    def thresholds(self):
+        """
+        Returns the array of computed thresholds within the domain.
+        """
+        return self._thresholds.tolist()
+
+    def ticks(self, count=10):
+        """
+        Equivalent to continuous.ticks.
+        """
+        if not isinstance(count, int) or count < 1:
+            return []
+        return ticks(self._domain[0], self._domain[-1], count)
+
+    def nice(self, count=10):
+        """
+        Returns a copy of the scale with a nice domain (see continuous.nice).
+        """
+        return QuantizeScale(_nice_linear(self._domain, count), self._range, self._unknown)
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale.
+        """
+        return QuantizeScale(self._domain, self._range, self._unknown)
+
+quantize = QuantizeScale
+
+
+
+class QuantileScale(DiscretizingScale):
+    """
+    Quantile scales map a sampled input domain to a discrete range. The domain
+    is considered continuous and thus the scale will accept any reasonable
+    input value; however, the domain is specified as a discrete set of sample
+    values. The number of values in (the cardinality of) the output range
+    determines the number of quantiles that will be computed from the
+    domain. To compute the quantiles, the domain is sorted, and treated as a
+    population of discrete values.
+
+    Constructs a new quantile scale with an empty domain and an empty range.
+    The quantile scale is invalid until both a domain and range are
+    specified.
+    """
+
+    def __init__(self, domain=[], range=[], unknown=None):
+        self._domain = self._sort(domain)
+        self._range = list(range)
+        self._unknown = unknown
+        self._rescale()
+
+    @staticmethod
+    def _sort(domain):
+        domain = np.asarray(domain, dtype=float).ravel()
+        return np.sort(domain[~np.isnan(domain)])
+
+    @property
+    def domain(self):
+        """
+        The scale’s domain: a sorted copy of the sample values, NaN being
+        ignored.
+        """
+        return self._domain.tolist()
+
+    @domain.setter
+    def domain(self, domain):
+        self._domain = self._sort(domain)
+        self._rescale()
+
+    def _rescale(self):
+        n = len(self._range)
+        if len(self._domain) == 0 or n == 0:
+            thresholds = np.empty(0)
+            lower = upper = np.full(n, np.nan)
+        else:
+            thresholds = np.quantile(self._domain, np.arange(1, n) / n)
+            lower = np.concatenate([self._domain[:1], thresholds])
+            upper = np.concatenate([thresholds, self._domain[-1:]])
+        self._compile(thresholds, lower, upper)
+
+    def quantiles(self):
+        """
+        Returns the quantile thresholds. If the range contains n discrete
+        values, the returned array will contain n - 1 thresholds. Values less
+        than the first threshold are considered in the first quantile; values
+        greater than or equal to the first threshold but less than the second
+        threshold are in the second quantile, and so on.
+        """
+        return self._thresholds.tolist()
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale.
+        """
+        return QuantileScale(self._domain, self._range, self._unknown)
+
+quantile = QuantileScale
+
+
+
+class StreamingQuantileScale(QuantileScale):
+    """
+    Quantile scale whose domain is summarized by a bounded memory quantile
+    sketch (see pyd3.sketch.QuantileSketch) instead of the full sorted
+    sample. The scale is built incrementally from chunks of data using
+    partial_fit, and scales (or sketches) fed by parallel workers can be
+    merged. Thresholds are estimated with a rank error of roughly 1/k and
+    classification is the same single search as for the quantile scale::
+
+        s = scale.streaming_quantile(range=["low", "mid", "high"])
+        for chunk in chunks:
+            s.partial_fit(chunk)
+        s(values)
+    """
+
+    def __init__(self, range=[], k=200, sketch=None, unknown=None):
+        self._sketch = sketch if sketch is not None else QuantileSketch(k)
+        self._range = list(range)
+        self._unknown = unknown
+        self._rescale()
+
+    @property
+    def sketch(self):
+        """ Quantile sketch summarizing the domain """
+        return self._sketch
+
+    @property
+    def domain(self):
+        """
+        Extent [min, max] of the values seen so far (the sample itself is not
+        retained). Setting the domain resets the sketch with the given values.
+        """
+        if self._sketch.count == 0:
+            return []
+        return [float(self._sketch.min), float(self._sketch.max)]
+
+    @domain.setter
+    def domain(self, domain):
+        self._sketch = QuantileSketch(self._sketch.k)
+        self.partial_fit(domain)
+
+    def partial_fit(self, values):
+        """
+        Adds a chunk of domain values (NaN are ignored) and updates the
+        quantile thresholds. Returns the scale.
+        """
+        self._sketch.update(values)
+        self._rescale()
+        return self
+
+    def merge(self, other):
+        """
+        Merges another streaming quantile scale (or a quantile sketch), built
+        for instance by another worker, into this scale. Returns the scale.
+        """
+        if isinstance(other, StreamingQuantileScale):
+            other = other.sketch
+        self._sketch.merge(other)
+        self._rescale()
+        return self
+
+    def _rescale(self):
+        n = len(self._range)
+        if self._sketch.count == 0 or n == 0:
+            thresholds = np.empty(0)
+            lower = upper = np.full(n, np.nan)
+        else:
+            thresholds = np.atleast_1d(self._sketch.quantile(np.arange(1, n) / n))
+            lower = np.concatenate([[self._sketch.min], thresholds])
+            upper = np.concatenate([thresholds, [self._sketch.max]])
+        self._compile(thresholds, lower, upper)
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale.
+        """
+        return StreamingQuantileScale(self._range, sketch=self._sketch.copy(),
+                                      unknown=self._unknown)
+
+streaming_quantile = StreamingQuantileScale
+
+
+
+class ThresholdScale(DiscretizingScale):
+    """
+    Threshold scales are similar to quantize scales, except they allow you to
+    map arbitrary subsets of the domain to discrete values in the range. The
+    input domain is still continuous, and divided into slices based on a set
+    of threshold values.
+
+    Constructs a new threshold scale with the default domain [0.5] and the
+    default range [0, 1]. Thus, the default threshold scale is equivalent to
+    the round function for numbers; for example threshold(0.49) returns 0,
+    and threshold(0.51) returns 1.
+    """
+
+    def __init__(self, domain=[0.5], range=[0,1], unknown=None):
+        self._domain = list(domain)
+        self._range = list(range)
+        self._unknown = unknown
+        self._rescale()
+
+    @property
+    def domain(self):
+        """
+        The scale’s domain: sorted threshold values. If the number of values
+        in the scale’s range is N+1, the number of values in the scale’s
+        domain must be N.
+        """
+        return self._domain
+
+    @domain.setter
+    def domain(self, domain):
+        self._domain = list(domain)
+        self._rescale()
+
+    def _rescale(self):
+        n = max(0, min(len(self._domain), len(self._range) - 1))
+        thresholds = _as_array(self._domain[:n])
+        bounds = [None] + list(self._domain[:n]) + [None]
+        if thresholds.dtype.kind in "iuf":
+            thresholds = thresholds.astype(float)
+            bounds = [np.nan if b is None else b for b in bounds]
+        self._compile(thresholds, bounds[:-1], bounds[1:])
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale.
+        """
+        return ThresholdScale(self._domain, self._range, self._unknown)
+
+threshold = ThresholdScale
+
+
+
+class _Implicit(object):
+    """
+    Unknown value of ordinal scales that implicitly extends the domain
+    """
+    def __repr__(self):
+        return "implicit"
+
+implicit = _Implicit()
+
+
+
+class OrdinalScale(object):
+    """
+    Unlike continuous scales, ordinal scales have a discrete domain and
+    range. For example, an ordinal scale might map a set of named categories
+    to a set of colors, or determine the horizontal positions of columns in a
+    column chart.
+
+    Constructs a new ordinal scale with an empty domain and an empty
+    range. The ordinal scale always returns None until a non-empty range is
+    defined. If unknown is implicit (the default), unknown values are
+    implicitly added to the domain.
+
+    Arrays are encoded with a hash index built once for the domain, distinct
+    values being looked up only once (np.unique), and codes are mapped to
+    range values with a single take.
+    """
+
+    def __init__(self, domain=[], range=[], unknown=implicit):
+        self._range = list(range)
+        self._unknown = unknown
+        self._set_domain(domain)
+
+    def _set_domain(self, domain):
+        self._domain = []
+        self._index = {}
+        for value in domain:
+            if value not in self._index:
+                self._index[value] = len(self._domain)
+                self._domain.append(value)
+        self._table = None
+
+    @property
+    def domain(self):
+        """
+        The domain, an array of unique values. The first element in domain
+        will be mapped to the first element in the range, the second domain
+        value to the second range value, and so on.
+        """
+        return self._domain
+
+    @domain.setter
+    def domain(self, domain):
+        self._set_domain(domain)
+
+    @property
+    def range(self):
+        """
+        The range. If there are fewer elements in the range than in the
+        domain, the scale will reuse values from the start of the range.
+        """
+        return self._range
+
+    @range.setter
+    def range(self, range):
+        self._range = list(range)
+        self._table = None
+
+    @property
+    def unknown(self):
+        """
+        Value returned for unknown input values (or implicit)
+        """
+        return self._unknown
+
+    @unknown.setter
+    def unknown(self, unknown):
+        self._unknown = unknown
+        self._table = None
+
+    def _extend(self, value):
+        self._index[value] = len(self._domain)
+        self._domain.append(value)
+        self._table = None
+        return self._index[value]
+
+    def _encode(self, values):
+        """
+        Domain index of each value (-1 for unknown values), extending the
+        domain with new values (in order of appearance) if unknown is
+        implicit.
+        """
+
+        try:
+            uniques, first, inverse = np.unique(values, return_index=True,
+                                                return_inverse=True)
+        except TypeError:
+            # Values cannot be sorted (mixed types)
+            codes = []
+            for value in values.flat:
+                code = self._index.get(value, -1)
+                if code < 0 and self._unknown is implicit:
+                    code = self._extend(value)
+                codes.append(code)
+            return np.array(codes, dtype=np.intp).reshape(values.shape)
+
+        uniques = uniques.tolist()
+        codes = np.array([self._index.get(value, -1) for value in uniques], dtype=np.intp)
+        if self._unknown is implicit:
+            missing = np.flatnonzero(codes < 0)
+            for i in missing[np.argsort(first[missing])]:
+                codes[i] = self._extend(uniques[i])
+        return codes.take(inverse).reshape(values.shape)
+
+    def _lookup_table(self):
+        """
+        Range value of each domain element (range is cycled) followed by the
+        unknown value (index -1).
+        """
+        
+        if self._table is None:
+            n = len(self._domain)
+            values = [self._range[i % len(self._range)] for i in py_range(n)]
+            # An implicit scale never looks up the unknown value
+            unknown = self._range[0] if self._unknown is implicit else self._unknown
+            self._table = _with_unknown(values, unknown)
+        return self._table
+
+    def __call__(self, values):
+        """
+        Given a value in the input domain, returns the corresponding value in
+        the output range. Arrays are mapped as a whole.
+        """
+
+        if not len(self._range):
+            return None
+        if np.ndim(values) == 0:
+            i = self._index.get(values, -1)
+            if i < 0:
+                if self._unknown is not implicit:
+                    return self._unknown
+                i = self._extend(values)
+            return self._range[i % len(self._range)]
+        codes = self._encode(_as_values(values))
+        return self._lookup_table().take(codes)
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale.
+        """
+        return OrdinalScale(self._domain, self._range, self._unknown)
+
+ordinal = OrdinalScale
+
+
+
+class BandScale(Scale):
+    """
+    Band scales are like ordinal scales except the output range is continuous
+    and numeric. Discrete output values are automatically computed by the
+    scale by dividing the continuous range into uniform bands. Band scales are
+    typically used for bar charts with an ordinal or categorical dimension.
+
+    Constructs a new band scale with the empty domain, the unit range [0, 1],
+    no padding, no rounding and center alignment. The layout (start of each
+    band, bandwidth and step) is computed once whenever the configuration
+    changes; arrays are encoded with a hash index of the domain and mapped to
+    positions with a single take (unknown values give nan).
+    """
+
+    def __init__(self, domain=[], range=[0,1], padding_inner=0, padding_outer=0,
+                 align=0.5, round=False):
+        self._range = list(range)
+        self._padding_inner = min(1.0, padding_inner)
+        self._padding_outer = padding_outer
+        self._align = max(0.0, min(1.0, align))
+        self._round = bool(round)
+        self._set_domain(domain)
+
+    def _set_domain(self, domain):
+        self._domain = []
+        self._index = {}
+        for value in domain:
+            if value not in self._index:
+                self._index[value] = len(self._domain)
+                self._domain.append(value)
+        self._rescale()
+
+    def _rescale(self):
+        n = len(self._domain)
+        r0, r1 = float(self._range[0]), float(self._range[1])
+        reverse = r1 < r0
+        start, stop = (r1, r0) if reverse else (r0, r1)
+        step = (stop - start) / max(1, n - self._padding_inner + self._padding_outer * 2)
+        if self._round:
+            step = math.floor(step)
+        start += (stop - start - step * (n - self._padding_inner)) * self._align
+        bandwidth = step * (1 - self._padding_inner)
+        if self._round:
+            start, bandwidth = math.floor(start + 0.5), math.floor(bandwidth + 0.5)
+        values = start + step * np.arange(n)
+        if reverse:
+            values = values[::-1]
+        self._step = step
+        self._bandwidth = bandwidth
+        # Last entry is the position of unknown values (index -1)
+        self._positions = np.append(values, np.nan)
+        self._version += 1
+
+    @property
+    def domain(self):
+        """
+        The domain, an array of unique values.
+        """
+        return self._domain
+
+    @domain.setter
+    def domain(self, domain):
+        self._set_domain(domain)
+
+    @property
+    def range(self):
+        """
+        The scale’s range, a two-element array of numbers.
+        """
+        return self._range
+
+    @range.setter
+    def range(self, range):
+        self._range = list(range)
+        self._rescale()
+
+    @property
+    def padding_inner(self):
+        """
+        Proportion of the step reserved for blank space between bands, in
+        [0, 1].
+        """
+        return self._padding_inner
+
+    @padding_inner.setter
+    def padding_inner(self, padding):
+        self._padding_inner = min(1.0, padding)
+        self._rescale()
+
+    @property
+    def padding_outer(self):
+        """
+        Amount of blank space, in terms of multiples of the step, before the
+        first band and after the last band.
+        """
+        return self._padding_outer
+
+    @padding_outer.setter
+    def padding_outer(self, padding):
+        self._padding_outer = padding
+        self._rescale()
+
+    @property
+    def padding(self):
+        """
+        Inner padding (setting it sets both the inner and outer padding)
+        """
+        return self._padding_inner
+
+    @padding.setter
+    def padding(self, padding):
+        self._padding_inner = min(1.0, padding)
+        self._padding_outer = padding
+        self._rescale()
+
+    @property
+    def align(self):
+        """
+        How any outer padding is distributed: 0.5 centers the bands, 0
+        positions them at the range start and 1 at the range end.
+        """
+        return self._align
+
+    @align.setter
+    def align(self, align):
+        self._align = max(0.0, min(1.0, align))
+        self._rescale()
+
+    @property
+    def round(self):
+        """
+        Whether the start and stop of each band are integers.
+        """
+        return self._round
+
+    @round.setter
+    def round(self, round):
+        self._round = bool(round)
+        self._rescale()
+
+    @property
+    def bandwidth(self):
+        """ Width of each band """
+        return self._bandwidth
+
+    @property
+    def step(self):
+        """ Distance between the starts of adjacent bands """
+        return self._step
+
+    def __call__(self, values, out=None):
+        """
+        Given a value in the input domain, returns the start of the
+        corresponding band derived from the output range. Unknown values give
+        None (nan for arrays).
+        """
+
+        if np.ndim(values) == 0:
+            i = self._index.get(values, -1)
+            return None if i < 0 else float(self._positions[i])
+        codes = _lookup(self._index, values)
+        return self._positions.take(codes, out=out)
+
+    def copy(self):
+        """
+        Returns an exact copy of this scale.
+        """
+        return self.__class__.__new__(self.__class__)._copy_from(self)
+
+    def _copy_from(self, other):
+        self.__dict__.update(other.__dict__)
+        self._domain = list(other._domain)
+        self._index = dict(other._index)
+        self._range = list(other._range)
+        return self
+
+band = BandScale
+
+
+
+class PointScale(BandScale):
+    """
+    Point scales are a variant of band scales with the bandwidth fixed to
+    zero. Point scales are typically used for scatterplots with an ordinal or
+    categorical dimension.
+
+    Constructs a new point scale with the empty domain, the unit range [0,
+    1], no padding, no rounding and center alignment.
+    """
+
+    def __init__(self, domain=[], range=[0,1], padding=0, align=0.5, round=False):
+        BandScale.__init__(self, domain, range, 1, padding, align, round)
+
+    @property
+    def padding(self):
+        """
+        Outer padding, the amount of blank space, in terms of multiples of the
+        step, to reserve before the first point and after the last point.
+        """
+        return self._padding_outer
+
+    @padding.setter
+    def padding(self, padding):
+        self._padding_outer = padding
+        self._rescale()
+
+point = PointScale
 
 
-# class QuantizeScale(object):
-#     def __init__(self, domain=[0,1], range=[0,1], clamp=True):
-#         self._domain = domain
-#         self._range  = np.linspace(0,len(range)-1,num=len(domain))
-#         self._values = list(range)
-#         self._clamp  = clamp
-#         self._interpolate = interpolate
-        
-#     def __call__(self, values):
-#         indices = np.round(self._interpolate(values, self._domain, self._range))
-#         return self._values[indices.astype(int)]
-
-#     def invert(self, values):
-#         values = np.asarray(values)
-#         if len(values.shape) == 0:
-#             index = self._values.index(values)
-#             return self._interpolate(index, self._range, self._domain)
-#         else:
-#             indices = [self._values.index(value) for value in values]
-#             return self._interpolate(indices, self._range, self._domain)
-
-
-# x = QuantizeScale(domain=[10,100], range=[1,2,4])
-# print(x(20))
-# print(x(50))
-# print(x(80))
-# print(x.invert(4))
-# print(x.invert([1,2,4]))
 
 # x = LinearScale(domain=[0,100], range=[0,1])
 # print(x.invert(x(np.linspace(0,100,11))))
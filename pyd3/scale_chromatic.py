@@ -0,0 +1,380 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of the `d3-scale-chromatic
+<https://github.com/d3/d3-scale-chromatic>`_ javascript module.
+
+This module provides sequential, diverging and categorical color schemes
+designed to work with pyd3.scale. Most of them are derived from Cynthia A.
+Brewer’s ColorBrewer, the perceptually uniform ones (viridis, magma, inferno,
+plasma and cividis) come from matplotlib. For example::
+
+   color = scale.sequential(scale_chromatic.viridis, [0, 100])
+   color(50)                                # "#21918c"
+   color.rgba(values)                       # uint8 array (n, 4)
+
+   color = scale.diverging(scale_chromatic.rd_bu, [-1, 0, 1])
+   color = scale.ordinal(range=scale_chromatic.category10)
+
+Schemes are stored as compact strings of hexadecimal stops. Sequential and
+diverging schemes expand lazily, on first use, into lookup tables that are
+cached and shared by all the scales using them. Categorical schemes are tuples
+of hex colors. Schemes are also available by their d3 name in `schemes`
+(e.g. schemes["RdBu"]).
+"""
+import numpy as np
+
+
+def _colors(specifier):
+    """
+    Splits a string of 6-digit hexadecimal colors into a tuple of hex colors
+    """
+    return tuple("#" + specifier[i:i+6] for i in range(0, len(specifier), 6))
+
+
+def _stops(specifier):
+    """
+    Splits a string of 6-digit hexadecimal colors into a (n,3) float array
+    of 0-255 components
+    """
+    stops = np.frombuffer(bytes.fromhex(specifier), dtype=np.uint8)
+    return stops.reshape(-1, 3).astype(float)
+
+
+def _ramp(stops, t):
+    """
+    Discrete ramp: t in [0,1] selects one of the stops (as in d3)
+    """
+    n = len(stops)
+    i = np.clip(np.floor(t * n), 0, n - 1).astype(np.intp)
+    return stops[i]
+
+
+def _basis(stops, t):
+    """
+    Uniform B-spline through the stops (d3 interpolateRgbBasis)
+    """
+    n = len(stops) - 1
+    t = np.clip(t, 0, 1)
+    i = np.minimum(np.floor(t * n), n - 1).astype(np.intp)
+    # Ghost stops at both ends mirror the first and last segments
+    v = np.concatenate([2*stops[:1] - stops[1:2], stops,
+                        2*stops[-1:] - stops[-2:-1]])
+    t1 = ((t - i / n) * n)[..., np.newaxis]
+    t2 = t1 * t1
+    t3 = t2 * t1
+    return ((1 - 3*t1 + 3*t2 - t3) * v[i] + (4 - 6*t2 + 3*t3) * v[i+1]
+            + (1 + 3*t1 + 3*t2 - 3*t3) * v[i+2] + t3 * v[i+3]) / 6
+
+
+_hex_digits = np.array(["%02x" % i for i in range(256)])
+
+
+class Scheme(object):
+    """
+    A sequential or diverging color scheme, given by its hexadecimal stops.
+    Calling the scheme with t in [0,1] (number or array) returns the
+    corresponding hex color(s), such that a scheme can be used wherever an
+    interpolator is expected. Perceptual schemes (256 stops) are discrete
+    ramps while ColorBrewer schemes are interpolated with a B-spline.
+    """
+
+    def __init__(self, name, kind, specifier, interpolation="basis"):
+        self._name = name
+        self._kind = kind
+        self._specifier = specifier
+        self._interpolation = interpolation
+        self._stops = None
+        self._luts = {}
+
+    def __repr__(self):
+        return "Scheme(%r)" % self._name
+
+    @property
+    def name(self):
+        """ Name of the scheme (as in d3) """
+        return self._name
+
+    @property
+    def kind(self):
+        """ Kind of the scheme ("sequential" or "diverging") """
+        return self._kind
+
+    @property
+    def colors(self):
+        """ Stops of the scheme as a tuple of hex colors """
+        return _colors(self._specifier)
+
+    def _rgb(self, t):
+        if self._stops is None:
+            self._stops = _stops(self._specifier)
+        t = np.asarray(t, dtype=float)
+        if self._interpolation == "ramp":
+            rgb = _ramp(self._stops, t)
+        else:
+            rgb = _basis(self._stops, t)
+        return np.rint(np.clip(rgb, 0, 255)).astype(np.uint8)
+
+    def lut(self, resolution=256):
+        """
+        Returns the scheme sampled at resolution evenly spaced t in [0,1], as
+        a read-only uint8 (resolution, 4) RGBA array. Tables are built on
+        first use and cached.
+        """
+
+        resolution = int(resolution)
+        if resolution not in self._luts:
+            rgba = np.empty((resolution, 4), dtype=np.uint8)
+            rgba[:, :3] = self._rgb(np.linspace(0, 1, resolution))
+            rgba[:, 3] = 255
+            rgba.setflags(write=False)
+            self._luts[resolution] = rgba
+        return self._luts[resolution]
+
+    def __call__(self, t):
+        rgb = self._rgb(t)
+        colors = np.char.add("#", _hex_digits[rgb[..., 0]])
+        colors = np.char.add(colors, _hex_digits[rgb[..., 1]])
+        colors = np.char.add(colors, _hex_digits[rgb[..., 2]])
+        return colors if colors.ndim else str(colors)
+
+
+
+# Categorical schemes
+category10 = _colors(
+    "1f77b4ff7f0e2ca02cd627289467bd8c564be377c27f7f7fbcbd2217becf")
+accent = _colors("7fc97fbeaed4fdc086ffff99386cb0f0027fbf5b17666666")
+dark2 = _colors("1b9e77d95f027570b3e7298a66a61ee6ab02a6761d666666")
+paired = _colors(
+    "a6cee31f78b4b2df8a33a02cfb9a99e31a1cfdbf6fff7f00cab2d66a3d9affff99b15928")
+pastel1 = _colors("fbb4aeb3cde3ccebc5decbe4fed9a6ffffcce5d8bdfddaecf2f2f2")
+pastel2 = _colors("b3e2cdfdcdaccbd5e8f4cae4e6f5c9fff2aef1e2cccccccc")
+set1 = _colors("e41a1c377eb84daf4a984ea3ff7f00ffff33a65628f781bf999999")
+set2 = _colors("66c2a5fc8d628da0cbe78ac3a6d854ffd92fe5c494b3b3b3")
+set3 = _colors(
+    "8dd3c7ffffb3bebadafb807280b1d3fdb462b3de69fccde5d9d9d9bc80bdccebc5ffed6f")
+tableau10 = _colors(
+    "4e79a7f28e2ce1575976b7b259a14fedc949af7aa1ff9da79c755fbab0ab")
+
+# Diverging schemes (ColorBrewer)
+br_bg = Scheme("BrBG", "diverging", (
+    "5430058c510abf812ddfc27df6e8c3f5f5f5c7eae580cdc135978f01665e003c30"))
+pr_gn = Scheme("PRGn", "diverging", (
+    "40004b762a839970abc2a5cfe7d4e8f7f7f7d9f0d3a6dba05aae611b783700441b"))
+pi_yg = Scheme("PiYG", "diverging", (
+    "8e0152c51b7dde77aef1b6dafde0eff7f7f7e6f5d0b8e1867fbc414d9221276419"))
+pu_or = Scheme("PuOr", "diverging", (
+    "7f3b08b35806e08214fdb863fee0b6f7f7f7d8daebb2abd28073ac5427882d004b"))
+rd_bu = Scheme("RdBu", "diverging", (
+    "67001fb2182bd6604df4a582fddbc7f7f7f7d1e5f092c5de4393c32166ac053061"))
+rd_gy = Scheme("RdGy", "diverging", (
+    "67001fb2182bd6604df4a582fddbc7ffffffe0e0e0bababa8787874d4d4d1a1a1a"))
+rd_yl_bu = Scheme("RdYlBu", "diverging", (
+    "a50026d73027f46d43fdae61fee090ffffbfe0f3f8abd9e974add14575b4313695"))
+rd_yl_gn = Scheme("RdYlGn", "diverging", (
+    "a50026d73027f46d43fdae61fee08bffffbfd9ef8ba6d96a66bd631a9850006837"))
+spectral = Scheme("Spectral", "diverging", (
+    "9e0142d53e4ff46d43fdae61fee08bffffbfe6f598abdda466c2a53288bd5e4fa2"))
+
+# Sequential schemes (ColorBrewer)
+blues = Scheme("Blues", "sequential", (
+    "f7fbffdeebf7c6dbef9ecae16baed64292c62171b508519c08306b"))
+greens = Scheme("Greens", "sequential", (
+    "f7fcf5e5f5e0c7e9c0a1d99b74c47641ab5d238b45006d2c00441b"))
+greys = Scheme("Greys", "sequential", (
+    "fffffff0f0f0d9d9d9bdbdbd969696737373525252252525000000"))
+oranges = Scheme("Oranges", "sequential", (
+    "fff5ebfee6cefdd0a2fdae6bfd8d3cf16913d94801a636037f2704"))
+purples = Scheme("Purples", "sequential", (
+    "fcfbfdefedf5dadaebbcbddc9e9ac8807dba6a51a354278f3f007d"))
+reds = Scheme("Reds", "sequential", (
+    "fff5f0fee0d2fcbba1fc9272fb6a4aef3b2ccb181da50f1567000d"))
+bu_gn = Scheme("BuGn", "sequential", (
+    "f7fcfde5f5f9ccece699d8c966c2a441ae76238b45006d2c00441b"))
+bu_pu = Scheme("BuPu", "sequential", (
+    "f7fcfde0ecf4bfd3e69ebcda8c96c68c6bb188419d810f7c4d004b"))
+gn_bu = Scheme("GnBu", "sequential", (
+    "f7fcf0e0f3dbccebc5a8ddb57bccc44eb3d32b8cbe0868ac084081"))
+or_rd = Scheme("OrRd", "sequential", (
+    "fff7ecfee8c8fdd49efdbb84fc8d59ef6548d7301fb300007f0000"))
+pu_bu_gn = Scheme("PuBuGn", "sequential", (
+    "fff7fbece2f0d0d1e6a6bddb67a9cf3690c002818a016c59014636"))
+pu_bu = Scheme("PuBu", "sequential", (
+    "fff7fbece7f2d0d1e6a6bddb74a9cf3690c00570b0045a8d023858"))
+pu_rd = Scheme("PuRd", "sequential", (
+    "f7f4f9e7e1efd4b9dac994c7df65b0e7298ace125698004367001f"))
+rd_pu = Scheme("RdPu", "sequential", (
+    "fff7f3fde0ddfcc5c0fa9fb5f768a1dd3497ae017e7a017749006a"))
+yl_gn_bu = Scheme("YlGnBu", "sequential", (
+    "ffffd9edf8b1c7e9b47fcdbb41b6c41d91c0225ea8253494081d58"))
+yl_gn = Scheme("YlGn", "sequential", (
+    "ffffe5f7fcb9d9f0a3addd8e78c67941ab5d238443006837004529"))
+yl_or_br = Scheme("YlOrBr", "sequential", (
+    "ffffe5fff7bcfee391fec44ffe9929ec7014cc4c02993404662506"))
+yl_or_rd = Scheme("YlOrRd", "sequential", (
+    "ffffccffeda0fed976feb24cfd8d3cfc4e2ae31a1cbd0026800026"))
+
+# Sequential perceptually uniform schemes (matplotlib)
+viridis = Scheme("Viridis", "sequential", (
+    "44015444025645045745055946075a46085c460a5d460b5e470d60470e61471063471164"
+    "47136548146748166848176948186a481a6c481b6d481c6e481d6f481f70482071482173"
+    "482374482475482576482677482878482979472a7a472c7a472d7b472e7c472f7d46307e"
+    "46327e46337f463480453581453781453882443983443a83443b84433d84433e85423f85"
+    "4240864241864142874144874045884046883f47883f48893e49893e4a893e4c8a3d4d8a"
+    "3d4e8a3c4f8a3c508b3b518b3b528b3a538b3a548c39558c39568c38588c38598c375a8c"
+    "375b8d365c8d365d8d355e8d355f8d34608d34618d33628d33638d32648e32658e31668e"
+    "31678e31688e30698e306a8e2f6b8e2f6c8e2e6d8e2e6e8e2e6f8e2d708e2d718e2c718e"
+    "2c728e2c738e2b748e2b758e2a768e2a778e2a788e29798e297a8e297b8e287c8e287d8e"
+    "277e8e277f8e27808e26818e26828e26828e25838e25848e25858e24868e24878e23888e"
+    "23898e238a8d228b8d228c8d228d8d218e8d218f8d21908d21918c20928c20928c20938c"
+    "1f948c1f958b1f968b1f978b1f988b1f998a1f9a8a1e9b8a1e9c891e9d891f9e891f9f88"
+    "1fa0881fa1881fa1871fa28720a38620a48621a58521a68522a78522a88423a98324aa83"
+    "25ab8225ac8226ad8127ad8128ae8029af7f2ab07f2cb17e2db27d2eb37c2fb47c31b57b"
+    "32b67a34b67935b77937b87838b9773aba763bbb753dbc743fbc7340bd7242be7144bf70"
+    "46c06f48c16e4ac16d4cc26c4ec36b50c46a52c56954c56856c66758c7655ac8645cc863"
+    "5ec96260ca6063cb5f65cb5e67cc5c69cd5b6ccd5a6ece5870cf5773d05675d05477d153"
+    "7ad1517cd2507fd34e81d34d84d44b86d54989d5488bd6468ed64590d74393d74195d840"
+    "98d83e9bd93c9dd93ba0da39a2da37a5db36a8db34aadc32addc30b0dd2fb2dd2db5de2b"
+    "b8de29bade28bddf26c0df25c2df23c5e021c8e020cae11fcde11dd0e11cd2e21bd5e21a"
+    "d8e219dae319dde318dfe318e2e418e5e419e7e419eae51aece51befe51cf1e51df4e61e"
+    "f6e620f8e621fbe723fde725"), "ramp")
+magma = Scheme("Magma", "sequential", (
+    "00000401000501010601010802010902020b02020d03030f030312040414050416060518"
+    "06051a07061c08071e0907200a08220b09240c09260d0a290e0b2b100b2d110c2f120d31"
+    "130d34140e36150e38160f3b180f3d19103f1a10421c10441d11471e114920114b21114e"
+    "22115024125325125527125829115a2a115c2c115f2d11612f1163311165331067341069"
+    "36106b38106c390f6e3b0f703d0f713f0f72400f74420f75440f76451077471078491078"
+    "4a10794c117a4e117b4f127b51127c52137c54137d56147d57157e59157e5a167e5c167f"
+    "5d177f5f187f601880621980641a80651a80671b80681c816a1c816b1d816d1d816e1e81"
+    "701f81721f817320817521817621817822817922827b23827c23827e2482802582812581"
+    "8326818426818627818827818928818b29818c29818e2a81902a81912b81932b80942c80"
+    "962c80982d80992d809b2e7f9c2e7f9e2f7fa02f7fa1307ea3307ea5317ea6317da8327d"
+    "aa337dab337cad347cae347bb0357bb2357bb3367ab5367ab73779b83779ba3878bc3978"
+    "bd3977bf3a77c03a76c23b75c43c75c53c74c73d73c83e73ca3e72cc3f71cd4071cf4070"
+    "d0416fd2426fd3436ed5446dd6456cd8456cd9466bdb476adc4869de4968df4a68e04c67"
+    "e24d66e34e65e44f64e55064e75263e85362e95462ea5661eb5760ec5860ed5a5fee5b5e"
+    "ef5d5ef05f5ef1605df2625df2645cf3655cf4675cf4695cf56b5cf66c5cf66e5cf7705c"
+    "f7725cf8745cf8765cf9785df9795df97b5dfa7d5efa7f5efa815ffb835ffb8560fb8761"
+    "fc8961fc8a62fc8c63fc8e64fc9065fd9266fd9467fd9668fd9869fd9a6afd9b6bfe9d6c"
+    "fe9f6dfea16efea36ffea571fea772fea973feaa74feac76feae77feb078feb27afeb47b"
+    "feb67cfeb77efeb97ffebb81febd82febf84fec185fec287fec488fec68afec88cfeca8d"
+    "fecc8ffecd90fecf92fed194fed395fed597fed799fed89afdda9cfddc9efddea0fde0a1"
+    "fde2a3fde3a5fde5a7fde7a9fde9aafdebacfcecaefceeb0fcf0b2fcf2b4fcf4b6fcf6b8"
+    "fcf7b9fcf9bbfcfbbdfcfdbf"), "ramp")
+inferno = Scheme("Inferno", "sequential", (
+    "00000401000501010601010802010a02020c02020e030210040312040314050417060419"
+    "07051b08051d09061f0a07220b07240c08260d08290e092b10092d110a30120a32140b34"
+    "150b37160b39180c3c190c3e1b0c411c0c431e0c451f0c48210c4a230c4c240c4f260c51"
+    "280b53290b552b0b572d0b592f0a5b310a5c320a5e340a5f3609613809623909633b0964"
+    "3d09653e0966400a67420a68440a68450a69470b6a490b6a4a0c6b4c0c6b4d0d6c4f0d6c"
+    "510e6c520e6d540f6d550f6d57106e59106e5a116e5c126e5d126e5f136e61136e62146e"
+    "64156e65156e67166e69166e6a176e6c186e6d186e6f196e71196e721a6e741a6e751b6e"
+    "771c6d781c6d7a1d6d7c1d6d7d1e6d7f1e6c801f6c82206c84206b85216b87216b88226a"
+    "8a226a8c23698d23698f24699025689225689326679526679727669827669a28659b2964"
+    "9d29649f2a63a02a63a22b62a32c61a52c60a62d60a82e5fa92e5eab2f5ead305dae305c"
+    "b0315bb1325ab3325ab43359b63458b73557b93556ba3655bc3754bd3853bf3952c03a51"
+    "c13a50c33b4fc43c4ec63d4dc73e4cc83f4bca404acb4149cc4248ce4347cf4446d04545"
+    "d24644d34743d44842d54a41d74b3fd84c3ed94d3dda4e3cdb503bdd513ade5238df5337"
+    "e05536e15635e25734e35933e45a31e55c30e65d2fe75e2ee8602de9612bea632aeb6429"
+    "eb6628ec6726ed6925ee6a24ef6c23ef6e21f06f20f1711ff1731df2741cf3761bf37819"
+    "f47918f57b17f57d15f67e14f68013f78212f78410f8850ff8870ef8890cf98b0bf98c0a"
+    "f98e09fa9008fa9207fa9407fb9606fb9706fb9906fb9b06fb9d07fc9f07fca108fca309"
+    "fca50afca60cfca80dfcaa0ffcac11fcae12fcb014fcb216fcb418fbb61afbb81dfbba1f"
+    "fbbc21fbbe23fac026fac228fac42afac62df9c72ff9c932f9cb35f8cd37f8cf3af7d13d"
+    "f7d340f6d543f6d746f5d949f5db4cf4dd4ff4df53f4e156f3e35af3e55df2e661f2e865"
+    "f2ea69f1ec6df1ed71f1ef75f1f179f2f27df2f482f3f586f3f68af4f88ef5f992f6fa96"
+    "f8fb9af9fc9dfafda1fcffa4"), "ramp")
+plasma = Scheme("Plasma", "sequential", (
+    "0d088710078813078916078a19068c1b068d1d068e20068f220690240691260591280592"
+    "2a05932c05942e05952f059631059733059735049837049938049a3a049a3c049b3e049c"
+    "3f049c41049d43039e44039e46039f48039f4903a04b03a14c02a14e02a25002a25102a3"
+    "5302a35502a45601a45801a45901a55b01a55c01a65e01a66001a66100a76300a76400a7"
+    "6600a76700a86900a86a00a86c00a86e00a86f00a87100a87201a87401a87501a87701a8"
+    "7801a87a02a87b02a87d03a87e03a88004a88104a78305a78405a78606a68707a68808a6"
+    "8a09a58b0aa58d0ba58e0ca48f0da4910ea3920fa39410a29511a19613a19814a099159f"
+    "9a169f9c179e9d189d9e199da01a9ca11b9ba21d9aa31e9aa51f99a62098a72197a82296"
+    "aa2395ab2494ac2694ad2793ae2892b02991b12a90b22b8fb32c8eb42e8db52f8cb6308b"
+    "b7318ab83289ba3388bb3488bc3587bd3786be3885bf3984c03a83c13b82c23c81c33d80"
+    "c43e7fc5407ec6417dc7427cc8437bc9447aca457acb4679cc4778cc4977cd4a76ce4b75"
+    "cf4c74d04d73d14e72d24f71d35171d45270d5536fd5546ed6556dd7566cd8576bd9586a"
+    "da5a6ada5b69db5c68dc5d67dd5e66de5f65de6164df6263e06363e16462e26561e26660"
+    "e3685fe4695ee56a5de56b5de66c5ce76e5be76f5ae87059e97158e97257ea7457eb7556"
+    "eb7655ec7754ed7953ed7a52ee7b51ef7c51ef7e50f07f4ff0804ef1814df1834cf2844b"
+    "f3854bf3874af48849f48948f58b47f58c46f68d45f68f44f79044f79143f79342f89441"
+    "f89540f9973ff9983ef99a3efa9b3dfa9c3cfa9e3bfb9f3afba139fba238fca338fca537"
+    "fca636fca835fca934fdab33fdac33fdae32fdaf31fdb130fdb22ffdb42ffdb52efeb72d"
+    "feb82cfeba2cfebb2bfebd2afebe2afec029fdc229fdc328fdc527fdc627fdc827fdca26"
+    "fdcb26fccd25fcce25fcd025fcd225fbd324fbd524fbd724fad824fada24f9dc24f9dd25"
+    "f8df25f8e125f7e225f7e425f6e626f6e826f5e926f5eb27f4ed27f3ee27f3f027f2f227"
+    "f1f426f1f525f0f724f0f921"), "ramp")
+cividis = Scheme("Cividis", "sequential", (
+    "00224e00234f00245100255300255400265600275800285900285b00295d002a5f002a61"
+    "002b62002c64002c66002d68002e6a002e6c002f6d00306f003070003170003171013271"
+    "0533710833700c34700f357012357014367016377018376f1a386f1c396f1e3a6f203a6f"
+    "213b6e233c6e243c6e263d6e273e6e293f6e2a3f6d2b406d2d416d2e416d2f426d31436d"
+    "32436d33446d34456c35456c36466c38476c39486c3a486c3b496c3c4a6c3d4a6c3e4b6c"
+    "3f4c6c404c6c414d6c424e6c434e6c444f6c45506c46516c47516c48526c49536c4a536c"
+    "4b546c4c556c4d556c4e566c4f576c50576c51586d52596d535a6d545a6d555b6d555c6d"
+    "565c6d575d6d585e6d595e6e5a5f6e5b606e5c616e5d616e5e626e5e636f5f636f60646f"
+    "61656f62656f636670646770656870656870666970676a71686a71696b716a6c716b6d72"
+    "6c6d726c6e726d6f726e6f736f7073707173717274727274727374737475747475757575"
+    "7676767777767777777878777979777a7a787b7a787c7b787d7c787e7c787e7d787f7e78"
+    "807f78817f788280798381798482798582798683798784788885788985788a86788b8778"
+    "8c88788d88788e89788f8a78908b78918b78928c78928d78938e78948e77958f77969077"
+    "9791779892779992779a93769b94769c95769d95769e96769f9775a09875a19975a29975"
+    "a39a74a49b74a59c74a69c74a79d73a89e73a99f73aaa073aba072aca172ada272aea371"
+    "afa471b0a571b1a570b3a670b4a76fb5a86fb6a96fb7a96eb8aa6eb9ab6dbaac6dbbad6d"
+    "bcae6cbdae6cbeaf6bbfb06bc0b16ac1b26ac2b369c3b369c4b468c5b568c6b667c7b767"
+    "c8b866c9b965cbb965ccba64cdbb63cebc63cfbd62d0be62d1bf61d2c060d3c05fd4c15f"
+    "d5c25ed6c35dd7c45cd9c55cdac65bdbc75adcc859ddc858dec958dfca57e0cb56e1cc55"
+    "e2cd54e4ce53e5cf52e6d051e7d150e8d24fe9d34eead34cebd44bedd54aeed649efd748"
+    "f0d846f1d945f2da44f3db42f5dc41f6dd3ff7de3ef8df3cf9e03afbe138fce236fde334"
+    "fee434fee535fee636fee838"), "ramp")
+
+# Schemes by d3 name
+schemes = {
+    "Category10": category10,
+    "Accent": accent,
+    "Dark2": dark2,
+    "Paired": paired,
+    "Pastel1": pastel1,
+    "Pastel2": pastel2,
+    "Set1": set1,
+    "Set2": set2,
+    "Set3": set3,
+    "Tableau10": tableau10,
+    "BrBG": br_bg,
+    "PRGn": pr_gn,
+    "PiYG": pi_yg,
+    "PuOr": pu_or,
+    "RdBu": rd_bu,
+    "RdGy": rd_gy,
+    "RdYlBu": rd_yl_bu,
+    "RdYlGn": rd_yl_gn,
+    "Spectral": spectral,
+    "Blues": blues,
+    "Greens": greens,
+    "Greys": greys,
+    "Oranges": oranges,
+    "Purples": purples,
+    "Reds": reds,
+    "BuGn": bu_gn,
+    "BuPu": bu_pu,
+    "GnBu": gn_bu,
+    "OrRd": or_rd,
+    "PuBuGn": pu_bu_gn,
+    "PuBu": pu_bu,
+    "PuRd": pu_rd,
+    "RdPu": rd_pu,
+    "YlGnBu": yl_gn_bu,
+    "YlGn": yl_gn,
+    "YlOrBr": yl_or_br,
+    "YlOrRd": yl_or_rd,
+    "Viridis": viridis,
+    "Magma": magma,
+    "Inferno": inferno,
+    "Plasma": plasma,
+    "Cividis": cividis,
+}
@@ -0,0 +1,368 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of (part of) the `d3-shape
+<https://github.com/d3/d3-shape>`_ javascript module.
+
+Visualizations typically consist of discrete graphical marks, such as symbols,
+arcs, lines and areas. While the rectangles of a bar chart may be easy enough
+to generate directly using SVG or Canvas, other shapes are complex, such as
+rounded annular sectors and centripetal Catmull–Rom splines. This module
+provides a variety of shape generators for your convenience::
+
+   x = scale.linear(domain=[0, 1000], range=[0, 960])
+   y = scale.linear(domain=[-1, 1], range=[500, 0])
+   line = shape.line(curve=shape.curve_monotone_x)
+   d = line(x(t), y(np.sin(t)))   # "M0,250C3.2,243.1,..."
+
+Generators take arrays of coordinates (already mapped by scales) and return
+SVG path data. Curves compute their control points for all points at once
+and numbers are written with a fixed number of digits (3 by default, as
+d3), digit by digit, into a single preallocated byte buffer.
+"""
+import numpy as np
+
+
+# A path is built from runs of commands: (letter, values) where values is an
+# array of shape (m, k) holding the k numbers of each of the m commands.
+
+def _points(x, y):
+    return np.column_stack([x, y])
+
+
+class Linear(object):
+    """
+    Produces a polyline through the specified points.
+
+    This is also the base class of curves: a curve turns a segment of points
+    into runs of path commands (after the move to its first point).
+    """
+
+    def _runs(self, x, y, backward=False):
+        return [("L", _points(x[1:], y[1:]))]
+
+
+class Step(Linear):
+    """
+    Produces a piecewise constant function (a step function) consisting of
+    alternating horizontal and vertical lines. The y-value changes at the
+    position t in [0, 1] between each pair of adjacent x-values (0.5 for
+    the midpoint, 0 before, 1 after).
+    """
+
+    def __init__(self, t=0.5):
+        self._t = t
+
+    def _runs(self, x, y, backward=False):
+        t = 1 - self._t if backward else self._t
+        n = len(x)
+        if n < 2:
+            return []
+        if t <= 0:
+            xm = x[:-1]
+        elif t >= 1:
+            xm = x[1:]
+        else:
+            xm = x[:-1] * (1 - t) + x[1:] * t
+        steps = np.empty((n-1, 2, 2))
+        steps[:, 0, 0], steps[:, 0, 1] = xm, y[:-1] if t > 0 else y[1:]
+        steps[:, 1, 0], steps[:, 1, 1] = xm if t > 0 else x[1:], y[1:]
+        runs = [("L", steps.reshape(-1, 2))]
+        if 0 < t < 1:
+            runs.append(("L", _points(x[-1:], y[-1:])))
+        return runs
+
+
+class Basis(Linear):
+    """
+    Produces a cubic basis spline using the specified control points. The
+    first and last points are triplicated such that the spline starts at the
+    first point and ends at the last point, and is tangent to the line
+    between the first and second points, and to the line between the
+    penultimate and last points.
+    """
+
+    def _runs(self, x, y, backward=False):
+        n = len(x)
+        if n < 3:
+            return [("L", _points(x[1:], y[1:]))] if n == 2 else []
+        p = _points(x, y)
+        a = np.concatenate([p[:-2], p[-2:-1]])
+        b = np.concatenate([p[1:-1], p[-1:]])
+        c = np.concatenate([p[2:], p[-1:]])
+        curves = np.hstack([(2*a + b) / 3, (a + 2*b) / 3, (a + 4*b + c) / 6])
+        return [("L", (5*p[:1] + p[1:2]) / 6), ("C", curves), ("L", p[-1:])]
+
+
+class Cardinal(Linear):
+    """
+    Produces a cubic cardinal spline using the specified control points, with
+    one-sided differences used for the first and last piece. The tension
+    (in [0, 1]) determines the length of the tangents: 1 yields all zero
+    tangents (equivalent to a linear curve) and 0 yields a uniform
+    Catmull–Rom spline.
+    """
+
+    def __init__(self, tension=0):
+        self._tension = tension
+
+    def tension(self, tension):
+        """ Returns a cardinal curve with the specified tension """
+        return Cardinal(tension)
+
+    def _runs(self, x, y, backward=False):
+        n = len(x)
+        if n < 3:
+            return [("L", _points(x[1:], y[1:]))] if n == 2 else []
+        k = (1 - self._tension) / 6
+        p = _points(x, y)
+        # Points are reflected at the extremities: p[-1] = p[1], p[n] = p[n-2]
+        q = np.concatenate([p[1:2], p, p[-2:-1]])
+        before, start, end, after = q[:-3], q[1:-2], q[2:-1], q[3:]
+        curves = np.hstack([start + k*(end - before), end + k*(start - after), end])
+        return [("C", curves)]
+
+
+class MonotoneX(Linear):
+    """
+    Produces a cubic spline that preserves monotonicity in y, assuming
+    monotonicity in x, as proposed by Steffen in A simple method for
+    monotonic interpolation in one dimension: “a smooth curve with
+    continuous first-order derivatives that passes through any given set of
+    data points without spurious oscillations. Local extrema can occur only
+    at grid points where they are given by the data, but not in between two
+    adjacent grid points.”
+    """
+
+    def _runs(self, x, y, backward=False):
+        # Coincident points are ignored
+        keep = np.ones(len(x), dtype=bool)
+        keep[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+        x, y = x[keep], y[keep]
+        n = len(x)
+        if n < 3:
+            return [("L", _points(x[1:], y[1:]))] if n == 2 else []
+
+        # Tangents of interior points (slope3)
+        h = np.diff(x)
+        dy = np.diff(y)
+        h0, h1 = h[:-1], h[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s0 = dy[:-1] / np.where(h0 != 0, h0, np.where(h1 < 0, -0.0, 0.0))
+            s1 = dy[1:] / np.where(h1 != 0, h1, np.where(h0 < 0, -0.0, 0.0))
+            p = (s0*h1 + s1*h0) / (h0 + h1)
+            t = ((np.where(s0 < 0, -1, 1) + np.where(s1 < 0, -1, 1))
+                 * np.minimum(np.minimum(np.abs(s0), np.abs(s1)), 0.5*np.abs(p)))
+        t = np.where(np.isnan(t), 0, t)
+
+        # Tangents of extremities (slope2)
+        def slope2(h, dy, t):
+            return (3*dy/h - t) / 2 if h else t
+        t = np.concatenate([[slope2(h[0], dy[0], t[0])], t,
+                            [slope2(h[-1], dy[-1], t[-1])]])
+
+        d = h / 3
+        curves = np.column_stack([x[:-1] + d, y[:-1] + d*t[:-1],
+                                  x[1:] - d, y[1:] - d*t[1:], x[1:], y[1:]])
+        return [("C", curves)]
+
+
+curve_linear = Linear()
+curve_step = Step(0.5)
+curve_step_before = Step(0)
+curve_step_after = Step(1)
+curve_basis = Basis()
+curve_cardinal = Cardinal(0)
+curve_monotone_x = MonotoneX()
+
+
+
+def _segments(defined):
+    """
+    Start and stop indices of the runs of defined points.
+    """
+    edges = np.diff(np.concatenate([[0], defined.astype(np.int8), [0]]))
+    return zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist())
+
+
+def _format(runs, digits):
+    """
+    Writes runs of commands into a single string. Numbers are rounded to the
+    given number of digits (trailing zeros are removed), or written exactly
+    if digits is None.
+    """
+
+    # Tokens: one byte (command letter or comma) followed by an optional
+    # number (close commands have none)
+    prefixes, values, numbered = [], [], []
+    for letter, array in runs:
+        array = np.asarray(array, dtype=float)
+        m, k = array.shape
+        if k == 0:
+            prefixes.append(np.full(m, ord(letter), dtype=np.uint8))
+            values.append(np.zeros(m))
+            numbered.append(np.zeros(m, dtype=bool))
+        else:
+            prefix = np.full((m, k), ord(","), dtype=np.uint8)
+            prefix[:, 0] = ord(letter)
+            prefixes.append(prefix.ravel())
+            values.append(array.ravel())
+            numbered.append(np.ones(m*k, dtype=bool))
+    if not prefixes:
+        return None
+    return _write(np.concatenate(prefixes), np.concatenate(values),
+                  np.concatenate(numbered), digits)
+
+
+def _write(prefixes, values, numbered, digits):
+    """
+    Writes tokens into a single string: each token is a byte (prefixes)
+    followed, if numbered, by a number (values).
+    """
+
+    if digits is None:
+        # Negative zeros are written as zeros (as javascript)
+        numbers = [repr(v) for v in (values + 0.0).tolist()]
+        numbers = [s[:-2] if s.endswith(".0") else s for s in numbers]
+        return "".join([chr(p) + (s if n else "")
+                        for p, s, n in zip(prefixes.tolist(), numbers, numbered.tolist())])
+
+    # Fixed point numbers: sign, integer digits, point and fraction digits
+    scale = 10**digits
+    rounded = np.floor(values * scale + 0.5)
+    if not np.all(np.isfinite(rounded)) or np.abs(rounded).max(initial=0) >= 2**62:
+        raise ValueError("Path coordinates must be finite and less than 2^62 / 10^digits")
+    rounded = rounded.astype(np.int64)
+    negative = rounded < 0
+    absolute = np.abs(rounded)
+    integer, fraction = absolute // scale, absolute % scale
+    integer_digits = np.ones(len(values), dtype=np.intp)
+    power = 10
+    while power <= integer.max(initial=0):
+        integer_digits += integer >= power
+        power *= 10
+    fraction_digits = np.full(len(values), digits, dtype=np.intp)
+    fraction_digits[fraction == 0] = 0
+    for i in range(1, digits):
+        fraction_digits -= (fraction % 10**i == 0) & (fraction != 0)
+    lengths = 1 + numbered * (negative + integer_digits + (fraction_digits > 0) + fraction_digits)
+
+    # Write all tokens into a single buffer
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    buffer = np.empty(ends[-1] if len(ends) else 0, dtype=np.uint8)
+    buffer[starts] = prefixes
+    starts, negative = starts[numbered], negative[numbered]
+    integer, fraction = integer[numbered], fraction[numbered]
+    integer_digits, fraction_digits = integer_digits[numbered], fraction_digits[numbered]
+    buffer[starts[negative] + 1] = ord("-")
+    first = starts + 1 + negative
+    last = first + integer_digits - 1
+    for i in range(integer_digits.max(initial=0)):
+        selected = integer_digits > i
+        buffer[last[selected] - i] = ord("0") + integer[selected] // 10**i % 10
+    point = last + 1
+    decimal = fraction_digits > 0
+    buffer[point[decimal]] = ord(".")
+    for i in range(digits):
+        selected = fraction_digits > i
+        buffer[point[selected] + 1 + i] = ord("0") + fraction[selected] // 10**(digits-1-i) % 10
+    return buffer.tobytes().decode("ascii")
+
+
+class Line(object):
+    """
+    Line generator: produces the path data of a spline or polyline, as in a
+    line chart, through points given as arrays of coordinates. The curve
+    (linear by default) determines how points are joined and digits sets
+    the number of decimal digits of the output (None for exact numbers).
+    """
+
+    def __init__(self, curve=None, digits=3):
+        self._curve = curve if curve is not None else curve_linear
+        self._digits = digits
+
+    @property
+    def curve(self):
+        """ Curve joining points """
+        return self._curve
+
+    @curve.setter
+    def curve(self, curve):
+        self._curve = curve
+
+    @property
+    def digits(self):
+        """ Number of decimal digits of numbers (None for exact numbers) """
+        return self._digits
+
+    @digits.setter
+    def digits(self, digits):
+        self._digits = digits
+
+    def __call__(self, x, y=None, defined=None):
+        """
+        Returns the path data of the line through points (x, y), given as
+        two arrays or as a single array of shape (n, 2). Points that are
+        not defined (a boolean array, finite coordinates by default) split
+        the line into separate segments. Returns None if there is no point.
+        """
+
+        if y is None:
+            points = np.asarray(x, dtype=float).reshape(-1, 2)
+            x, y = points[:, 0], points[:, 1]
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float).ravel(),
+                                   np.asarray(y, dtype=float).ravel())
+        if defined is None:
+            defined = np.isfinite(x) & np.isfinite(y)
+        runs = []
+        for start, stop in _segments(np.asarray(defined, dtype=bool)):
+            xs, ys = x[start:stop], y[start:stop]
+            runs.append(("M", _points(xs[:1], ys[:1])))
+            runs.extend(self._curve._runs(xs, ys))
+            # A line of a single point is closed
+            if stop - start == 1:
+                runs.append(("Z", np.empty((1, 0))))
+        return _format(runs, self._digits)
+
+
+class Area(Line):
+    """
+    Area generator: produces the path data of an area, as in an area chart.
+    An area is defined by two bounding lines, either splines or polylines:
+    the topline (x1, y1) and the baseline (x0, y0), drawn in reverse order
+    and closed.
+    """
+
+    def __call__(self, x, y1, y0=0, x1=None, defined=None):
+        """
+        Returns the path data of the area between the topline (x1, y1) and
+        the baseline (x, y0). x1 defaults to x and y0 (a number or an array)
+        to 0. Points that are not defined (a boolean array, finite
+        coordinates by default) split the area into separate segments.
+        Returns None if there is no point.
+        """
+
+        x0 = np.asarray(x, dtype=float).ravel()
+        x1 = np.asarray(x1, dtype=float).ravel() if x1 is not None else x0
+        x0, y0, x1, y1 = np.broadcast_arrays(x0, np.asarray(y0, dtype=float).ravel(),
+                                             x1, np.asarray(y1, dtype=float).ravel())
+        if defined is None:
+            defined = (np.isfinite(x0) & np.isfinite(y0)
+                       & np.isfinite(x1) & np.isfinite(y1))
+        runs = []
+        for start, stop in _segments(np.asarray(defined, dtype=bool)):
+            xs, ys = x1[start:stop], y1[start:stop]
+            runs.append(("M", _points(xs[:1], ys[:1])))
+            runs.extend(self._curve._runs(xs, ys))
+            xs, ys = x0[start:stop][::-1], y0[start:stop][::-1]
+            runs.append(("L", _points(xs[:1], ys[:1])))
+            runs.extend(self._curve._runs(xs, ys, backward=True))
+            runs.append(("Z", np.empty((1, 0))))
+        return _format(runs, self._digits)
+
+
+line = Line
+area = Area
@@ -0,0 +1,180 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+Bounded memory summaries of very large (or unbounded) streams of numbers.
+
+A quantile sketch ingests data chunk by chunk and retains only a few thousand
+weighted samples, whatever the number of values seen. It answers quantile
+queries with a rank error of roughly 1/k (k being the accuracy parameter) and
+sketches built on different parts of the data (e.g. by parallel workers) can
+be merged::
+
+   sketch = QuantileSketch(k=200)
+   for chunk in chunks:
+       sketch.update(chunk)
+   sketch.quantile([0.25, 0.5, 0.75])
+
+The implementation follows the KLL sketch (Karnin, Lang & Liberty, 2016): a
+hierarchy of compactors where level h holds items of weight 2^h. When a level
+overflows its capacity, it is sorted and every other item (with a random
+offset) is promoted to the next level. All operations are vectorized over
+whole levels.
+"""
+import copy
+import numpy as np
+
+
+class QuantileSketch(object):
+    """
+    Mergeable quantile sketch with bounded memory.
+
+    k sets the accuracy (and the memory): the sketch retains at most about 3k
+    values and the rank error of quantile estimates is roughly 1/k. While
+    fewer than k values have been seen, quantiles are exact.
+    """
+
+    def __init__(self, k=200, seed=None):
+        if k < 8:
+            raise ValueError("Sketch accuracy k must be at least 8")
+        self._k = int(k)
+        self._levels = [np.empty(0)]
+        self._count = 0
+        self._min = np.nan
+        self._max = np.nan
+        self._random = np.random.default_rng(seed)
+
+    @property
+    def k(self):
+        """ Accuracy parameter """
+        return self._k
+
+    @property
+    def count(self):
+        """ Number of values seen so far (NaN excluded) """
+        return self._count
+
+    @property
+    def size(self):
+        """ Number of values actually retained by the sketch """
+        return sum(len(level) for level in self._levels)
+
+    @property
+    def min(self):
+        """ Exact minimum of values seen so far """
+        return self._min
+
+    @property
+    def max(self):
+        """ Exact maximum of values seen so far """
+        return self._max
+
+    def _capacity(self, level):
+        depth = len(self._levels) - 1 - level
+        return max(8, int(np.ceil(self._k * (2/3)**depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level == len(self._levels) - 1:
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # Odd number of items: keep the largest one at this level
+                keep = len(items) % 2
+                offset = self._random.integers(2)
+                promoted = items[offset:len(items)-keep:2]
+                self._levels[level] = items[len(items)-keep:]
+                self._levels[level+1] = np.concatenate([self._levels[level+1], promoted])
+                # The number of levels may have changed, capacities too
+                level = 0
+            else:
+                level += 1
+
+    def update(self, values):
+        """
+        Adds values (any array like, NaN are ignored) to the sketch and
+        returns the sketch.
+        """
+
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self._min = np.fmin(self._min, values.min())
+        self._max = np.fmax(self._max, values.max())
+        self._count += len(values)
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Merges another sketch into this one and returns this sketch. The
+        result summarizes the union of the values seen by both sketches.
+        """
+
+        if other._count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self._count += other._count
+        self._min = np.fmin(self._min, other._min)
+        self._max = np.fmax(self._max, other._max)
+        self._compress()
+        return self
+
+    def copy(self):
+        """ Returns an independent copy of the sketch """
+        return copy.deepcopy(self)
+
+    def _samples(self):
+        """
+        Sorted retained values and their (centered) rank in the stream.
+        """
+
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(items), 2.0**level)
+                                  for level, items in enumerate(self._levels)])
+        order = np.argsort(values, kind='stable')
+        values, weights = values[order], weights[order]
+        ranks = np.cumsum(weights) - (weights + 1)/2
+        return values, ranks
+
+    def quantile(self, p):
+        """
+        Returns the estimated p-quantile(s) of the values seen so far, p being
+        a number or an array of numbers in [0, 1]. The estimate is exact (R-7
+        method, as in numpy or d3) as long as no compaction occurred.
+        """
+
+        p = np.asarray(p, dtype=float)
+        if self._count == 0:
+            return np.full(p.shape, np.nan)[()]
+        values, ranks = self._samples()
+        total = self._count
+        # Anchor extremities on the exact minimum and maximum
+        values = np.concatenate([[self._min], values, [self._max]])
+        ranks = np.concatenate([[0], np.clip(ranks, 0, total-1), [total-1]])
+        return np.interp(p * (total-1), ranks, values)[()]
+
+    def cdf(self, values):
+        """
+        Returns the estimated fraction of the values seen so far that are less
+        than or equal to each of the given values.
+        """
+
+        values = np.asarray(values, dtype=float)
+        if self._count == 0:
+            return np.full(values.shape, np.nan)[()]
+        samples = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(items), 2.0**level)
+                                  for level, items in enumerate(self._levels)])
+        order = np.argsort(samples, kind='stable')
+        cumulated = np.concatenate([[0], np.cumsum(weights[order])])
+        index = np.searchsorted(samples[order], values, side='right')
+        return (cumulated[index] / cumulated[-1])[()]
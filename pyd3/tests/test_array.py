@@ -0,0 +1,186 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import os
+import tempfile
+import tracemalloc
+import unittest
+import numpy as np
+from pyd3 import array
+
+class test_array(unittest.TestCase):
+
+    def test_1(self):
+        """
+        array.extent(values) returns [min, max] ignoring undefined values
+        """
+        self.assertEqual(array.extent([3, 1, np.nan, 2]), [1, 3])
+        self.assertEqual(array.min([3, 1, np.nan, 2]), 1)
+        self.assertEqual(array.max([3, 1, np.nan, 2]), 3)
+        self.assertTrue(np.all(np.isnan(array.extent([]))))
+        self.assertTrue(np.all(np.isnan(array.extent([np.nan]))))
+        lo, hi = array.extent([[1, 5], [np.nan, 2]], axis=1)
+        self.assertEqual(lo.tolist(), [1, 2])
+        self.assertEqual(hi.tolist(), [5, 2])
+        dates = np.array(["2020-01-01", "NaT", "2019-01-01"], dtype="M8[D]")
+        self.assertEqual(array.extent(dates), [dates[2], dates[0]])
+
+    def test_2(self):
+        """
+        array.mean, variance, deviation and quantile ignore undefined values
+        """
+        self.assertEqual(array.sum([1, np.nan, 3]), 4)
+        self.assertEqual(array.mean([1, np.nan, 3]), 2)
+        self.assertTrue(np.isnan(array.mean([])))
+        self.assertEqual(array.variance([5, 1, 2, 3, 4]), 2.5)
+        self.assertTrue(np.isnan(array.variance([1])))
+        self.assertAlmostEqual(array.deviation([5, 1, 2, 3, 4]), np.sqrt(2.5))
+        self.assertEqual(array.quantile([3, 1, 2, np.nan], [0, 0.25, 1]).tolist(), [1, 1.5, 3])
+        self.assertEqual(array.median([3, 1, 2, 4]), 2.5)
+        self.assertEqual(array.quantile_sorted([1, 2, 3, 4], 0.5), 2.5)
+        self.assertTrue(np.isnan(array.quantile_sorted([], 0.5)))
+
+    def test_3(self):
+        """
+        array.bisect(values, x) returns insertion points
+        """
+        self.assertEqual(array.bisect([1, 2, 3], 2), 2)
+        self.assertEqual(array.bisect_left([1, 2, 3], 2), 1)
+        self.assertEqual(array.bisect_right([1, 2, 2, 3], [0, 2, 4]).tolist(), [0, 3, 4])
+        self.assertEqual(array.bisect_left([1, 2, 3, 4], 3, lo=1, hi=2), 2)
+        self.assertEqual(array.bisect_center([1, 2, 3], [1.4, 1.6, 0, 9]).tolist(), [0, 1, 0, 2])
+
+    def test_4(self):
+        """
+        array.ticks and array.nice are the scale ones
+        """
+        self.assertEqual(array.ticks(0, 1, 5), [0.0, 0.2, 0.4, 0.6000000000000001, 0.8, 1.0])
+        self.assertEqual(array.tick_step(0, 1, 5), 0.2)
+        self.assertEqual(array.nice(0.1, 9.7, 10), [0, 10])
+
+    def test_5(self):
+        """
+        array.Extent accumulates and merges extents of chunks
+        """
+        extent = array.Extent()
+        self.assertTrue(np.all(np.isnan(extent.value)))
+        extent.update([3, np.nan]).update([])
+        other = array.Extent().update([-1, 7])
+        self.assertEqual(extent.merge(other).value, [-1, 7])
+        self.assertEqual(extent.count, 3)
+        copy = extent.copy().update([10])
+        self.assertEqual(extent.value, [-1, 7])
+        self.assertEqual(copy.value, [-1, 10])
+
+    def test_6(self):
+        """
+        array.Moments accumulates and merges means and variances of chunks
+        """
+        values = np.random.RandomState(1).normal(1e6, 3, 10000)
+        moments = array.Moments()
+        self.assertTrue(np.isnan(moments.mean))
+        for chunk in np.array_split(values, 7):
+            moments.update(chunk)
+        self.assertEqual(moments.count, 10000)
+        self.assertAlmostEqual(moments.mean, values.mean(), places=6)
+        self.assertAlmostEqual(moments.variance, values.var(ddof=1), places=6)
+        merged = array.Moments().update(values[:10]).merge(array.Moments().update(values[10:]))
+        self.assertAlmostEqual(merged.deviation, values.std(ddof=1), places=6)
+        self.assertAlmostEqual(merged.sum, values.sum(), places=3)
+        self.assertTrue(np.isnan(array.Moments().update([1, np.nan]).variance))
+
+    def test_7(self):
+        """
+        array.bin(values) uses nice ticks of the extent as thresholds
+        """
+        histogram = array.bin([0, 0, 0, 10, 20, 20])
+        self.assertEqual(histogram.domain, [0, 25])
+        self.assertEqual(histogram.x0.tolist(), [0, 5, 10, 15, 20])
+        self.assertEqual(histogram.x1.tolist(), [5, 10, 15, 20, 25])
+        self.assertEqual(histogram.counts.tolist(), [3, 0, 1, 0, 2])
+        histogram = array.bin([5, 5, 5])
+        self.assertEqual(histogram.counts.tolist(), [3])
+        histogram = array.bin([0, 1, 2, 3, 4, 5, 8], domain=[0, 5], thresholds=[1, 3, 5, 7])
+        self.assertEqual(histogram.x0.tolist(), [0, 1, 3, 5])
+        self.assertEqual(histogram.x1.tolist(), [1, 3, 5, 5])
+        self.assertEqual(histogram.counts.tolist(), [1, 2, 2, 1])
+        histogram = array.bin([0.1, 0.2, np.nan, 0.3], thresholds=array.threshold_scott)
+        self.assertEqual(histogram.counts.sum(), 3)
+
+    def test_8(self):
+        """
+        array.Histogram(domain, count) bins values exactly at thresholds
+        """
+        values = np.random.RandomState(1).normal(0, 2, 100000)
+        for domain, count in ([-5, 5], 100), ([-3.3, 7.1], 37), ([-1, 1], 7):
+            histogram = array.Histogram(domain, count).update(values)
+            inside = values[(values >= histogram.domain[0]) & (values <= histogram.domain[1])]
+            expected = np.bincount(np.searchsorted(histogram.thresholds, inside, side="right"),
+                                   minlength=len(histogram))
+            self.assertEqual(histogram.counts.tolist(), expected.tolist())
+        histogram = array.Histogram([0, 1], 10)
+        thresholds = histogram.thresholds
+        self.assertEqual(histogram.index(thresholds).tolist(), list(range(1, 10)))
+        self.assertEqual(histogram.index(np.nextafter(thresholds, -1)).tolist(), list(range(9)))
+        self.assertEqual(histogram.index([-1, np.nan, 1]).tolist(), [-1, -1, 9])
+
+    def test_9(self):
+        """
+        array.Histogram can be updated by (weighted) chunks and merged
+        """
+        histogram = array.Histogram([0, 10], 5)
+        histogram._chunk_size = 2
+        histogram.update([1, 2, 3, 9, 11])
+        self.assertEqual(histogram.counts.tolist(), [1, 2, 0, 0, 1])
+        other = array.Histogram([0, 10], 5).update([9, 5], weights=[2.5, 1])
+        self.assertEqual(other.counts.tolist(), [0, 0, 1, 0, 2.5])
+        self.assertEqual(histogram.copy().merge(other).counts.tolist(), [1, 2, 1, 0, 3.5])
+        self.assertEqual(histogram.counts.tolist(), [1, 2, 0, 0, 1])
+        with self.assertRaises(ValueError):
+            histogram.merge(array.Histogram([0, 10], 2))
+
+    def test_10(self):
+        """
+        array.blur(values, r) and array.blur2(values, rx, ry) blur values
+        """
+        blurred = array.blur([0, 0, 0, 1, 0, 0, 0], 1)
+        self.assertTrue(np.allclose(blurred * 27, [1, 3, 6, 7, 6, 3, 1]))
+        self.assertAlmostEqual(array.blur([0, 0, 0, 1, 0, 0, 0], 0.5)[3], 0.3125)
+        self.assertEqual(array.blur([1, 2], 0).tolist(), [1, 2])
+        values = np.zeros((5, 7))
+        values[2, 3] = 1
+        blurred = array.blur2(values, 1, 0)
+        self.assertEqual(blurred[2].tolist(), array.blur(values[2], 1).tolist())
+        self.assertEqual(blurred[1].tolist(), [0] * 7)
+        self.assertTrue(np.allclose(array.blur2(values, 1), array.blur(array.blur(values, 1, axis=0), 1)))
+
+    def test_11(self):
+        """
+        array.bin(values) converts memory-mapped values chunk by chunk
+        """
+        path = tempfile.mkdtemp()
+        filename = os.path.join(path, "values.npy")
+        chunk_size = array.Histogram._chunk_size
+        try:
+            values = np.lib.format.open_memmap(filename, "w+", np.float32, shape=(2**22,))
+            values[:] = np.arange(2**22) % 100
+            values.flush()
+            values = np.load(filename, mmap_mode="r")
+            array.Histogram._chunk_size = 2**16
+            tracemalloc.start()
+            histogram = array.bin(values, weights=values)
+            self.assertEqual(array.threshold_sturges(values), 23)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertLess(peak, values.nbytes // 4)
+            expected = array.bin(np.array(values, dtype=float), weights=values)
+            self.assertEqual(histogram.domain, expected.domain)
+            self.assertEqual(histogram.counts.tolist(), expected.counts.tolist())
+            del values
+        finally:
+            array.Histogram._chunk_size = chunk_size
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            os.remove(filename)
+            os.rmdir(path)
@@ -0,0 +1,98 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import axis, scale
+
+class test_axis(unittest.TestCase):
+
+    def test_1(self):
+        """
+        axis.bottom(scale) has the expected defaults
+        """
+        a = axis.bottom(scale.linear())
+        self.assertEqual(a.orient, "bottom")
+        self.assertEqual(a.tick_arguments, ())
+        self.assertEqual(a.tick_values, None)
+        self.assertEqual(a.tick_format, None)
+        self.assertEqual(a.tick_size_inner, 6)
+        self.assertEqual(a.tick_size_outer, 6)
+        self.assertEqual(a.tick_padding, 3)
+        self.assertEqual(a.offset, 0.5)
+        with self.assertRaises(ValueError):
+            axis.Axis("middle", scale.linear())
+
+    def test_2(self):
+        """
+        axis.layout() returns tick positions, labels and paths
+        """
+        layout = axis.bottom(scale.linear(domain=[0, 100], range=[0, 960])).layout()
+        self.assertEqual(layout.positions.tolist()[:3], [0.5, 96.5, 192.5])
+        self.assertEqual(layout.labels.tolist()[:3], ["0", "10", "20"])
+        self.assertEqual(layout.domain_path, "M0.5,6V0.5H960.5V6")
+        self.assertTrue(layout.tick_path.startswith("M0.5,0V6M96.5,0V6"))
+        self.assertEqual(layout.label_offset, 9)
+        self.assertEqual(layout.text_anchor, "middle")
+        self.assertEqual(layout.dy, "0.71em")
+
+    def test_3(self):
+        """
+        axis.layout() is cached until the axis or the scale change
+        """
+        x = scale.linear(domain=[0, 100], range=[0, 960])
+        a = axis.top(x)
+        layout = a.layout()
+        self.assertIs(a.layout(), layout)
+        x.domain = [0, 50]
+        self.assertIsNot(a.layout(), layout)
+        self.assertEqual(a.layout().labels.tolist()[:3], ["0", "5", "10"])
+        layout = a.layout()
+        a.ticks(2)
+        self.assertEqual(a.layout().labels.tolist(), ["0", "20", "40"])
+        self.assertEqual(a.layout().domain_path, "M0.5,-6V0.5H960.5V-6")
+
+    def test_4(self):
+        """
+        axis.left(band) centers ticks in bands and uses the domain as values
+        """
+        a = axis.left(scale.band(domain=["a", "b", "c"], range=[0, 90]),
+                      tick_format=lambda d: d.upper(), tick_size_outer=0)
+        layout = a.layout()
+        self.assertEqual(layout.positions.tolist(), [15, 45, 75])
+        self.assertEqual(layout.labels.tolist(), ["A", "B", "C"])
+        self.assertEqual(layout.domain_path, "M0.5,0.5V90.5")
+        self.assertEqual(layout.tick_path, "M0,15H-6M0,45H-6M0,75H-6")
+        self.assertEqual(layout.text_anchor, "end")
+        a.scale.domain = ["a", "b"]
+        self.assertEqual(a.layout().positions.tolist(), [22.5, 67.5])
+
+    def test_5(self):
+        """
+        axis.right(scale) accepts explicit tick values and format specifiers
+        """
+        a = axis.right(scale.linear(range=[0, 100]), tick_values=[0, 0.5, 1],
+                       tick_format=".0%", offset=0)
+        layout = a.layout()
+        self.assertEqual(layout.positions.tolist(), [0, 50, 100])
+        self.assertEqual(layout.labels.tolist(), ["0%", "50%", "100%"])
+        self.assertEqual(layout.domain_path, "M6,0H0V100H6")
+        self.assertEqual(layout.dy, "0.32em")
+
+    def test_6(self):
+        """
+        axis.layout() is recomputed when the base of a log scale changes
+        """
+        s = scale.log(domain=[1, 100], range=[0, 100])
+        a = axis.bottom(s)
+        layout = a.layout()
+        self.assertEqual(list(layout.values), s.ticks())
+        s.base = 2
+        self.assertIsNot(a.layout(), layout)
+        self.assertEqual(list(a.layout().values), [1, 2, 4, 8, 16, 32, 64])
+        self.assertEqual(a.layout().labels.tolist(), ["1", "2", "4", "8", "16", "32", "64"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import contour, array
+
+class test_contour(unittest.TestCase):
+
+    def test_1(self):
+        """
+        contours(values) returns the expected result for a simple polygon
+        """
+        values = np.zeros((10, 10))
+        values[3:8, 3:6] = 1
+        c = contour.contours([0.5])(values)
+        self.assertEqual(len(c), 1)
+        self.assertEqual(c[0]["type"], "MultiPolygon")
+        self.assertEqual(c[0]["value"], 0.5)
+        self.assertEqual(len(c[0]["coordinates"]), 1)
+        self.assertEqual(c[0]["coordinates"][0][0].tolist(), [
+            [3.5, 3], [3, 3.5], [3, 4.5], [3, 5.5], [3, 6.5], [3, 7.5], [3.5, 8],
+            [4.5, 8], [5.5, 8], [6, 7.5], [6, 6.5], [6, 5.5], [6, 4.5], [6, 3.5],
+            [5.5, 3], [4.5, 3], [3.5, 3]])
+        self.assertEqual(contour.contours([2])(values)[0]["coordinates"], [])
+
+    def test_2(self):
+        """
+        contours(values) interpolates values unless smooth is False
+        """
+        values = np.zeros((3, 3))
+        values[1, 1] = 1
+        c = contour.contours()
+        ring = c.contour(values, 0.25)["coordinates"][0][0]
+        self.assertEqual(ring.tolist(), [[1.5, 0.75], [0.75, 1.5], [1.5, 2.25], [2.25, 1.5], [1.5, 0.75]])
+        c.smooth = False
+        ring = c.contour(values, 0.25)["coordinates"][0][0]
+        self.assertEqual(ring.tolist(), [[1.5, 1], [1, 1.5], [1.5, 2], [2, 1.5], [1.5, 1]])
+
+    def test_3(self):
+        """
+        contours(values) assigns holes to the polygons enclosing them
+        """
+        values = np.zeros((11, 11))
+        values[1:10, 1:10] = 1
+        values[3:8, 3:8] = 0
+        values[5, 5] = 1
+        polygons = contour.contours([0.5])(values)[0]["coordinates"]
+        self.assertEqual([len(polygon) for polygon in polygons], [2, 1])
+        self.assertEqual(polygons[0][0][:, 0].min(), 1)
+        self.assertEqual(polygons[0][1][:, 0].min(), 3)
+        self.assertEqual(polygons[1][0][:, 0].min(), 5)
+
+        values = array.blur2(np.random.RandomState(1).uniform(size=(60, 80)), 1.2)
+        for geometry in contour.contours(6)(values):
+            for polygon in geometry["coordinates"]:
+                exterior = polygon[0]
+                for hole in polygon[1:]:
+                    # The first point of holes is within the exterior
+                    x, y = hole[0]
+                    x0, y0, x1, y1 = exterior[:-1, 0], exterior[:-1, 1], exterior[1:, 0], exterior[1:, 1]
+                    crossing = (y0 > y) != (y1 > y)
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        xc = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+                    self.assertEqual(np.count_nonzero(crossing & (x < xc)) % 2, 1)
+
+    def test_4(self):
+        """
+        contours(values) has thresholds defaulting to nice ticks and ignores NaN
+        """
+        values = np.arange(100.0).reshape(10, 10)
+        self.assertEqual([c["value"] for c in contour.contours()(values)],
+                         [0, 10, 20, 30, 40, 50, 60, 70, 80, 90])
+        self.assertEqual([c["value"] for c in contour.contours(5)(values)],
+                         [0, 20, 40, 60, 80])
+        self.assertEqual([c["value"] for c in contour.contours([50, 10])(values)],
+                         [10, 50])
+        values[0, 0] = np.nan
+        c = contour.contours([-1])(values)[0]
+        self.assertEqual(len(c["coordinates"]), 1)
+        self.assertEqual(c["coordinates"][0][0][:, 0].min(), 0)
+        with self.assertRaises(ValueError):
+            contour.contours()(np.arange(10))
+
+    def test_5(self):
+        """
+        contours.isolines(values) and path(geometry) return rings and SVG paths
+        """
+        values = np.zeros((9, 9))
+        values[2:7, 2:7] = 1
+        values[4, 4] = 0
+        lines = contour.contours([0.5]).isolines(values)[0]
+        self.assertEqual(lines["type"], "MultiLineString")
+        self.assertEqual(len(lines["coordinates"]), 2)
+        polygon = contour.contours([0.5])(values)[0]
+        self.assertEqual(contour.path(polygon),
+                         "M2.5,2L2,2.5L2,3.5L2,4.5L2,5.5L2,6.5L2.5,7L3.5,7L4.5,7L5.5,7"
+                         "L6.5,7L7,6.5L7,5.5L7,4.5L7,3.5L7,2.5L6.5,2L5.5,2L4.5,2L3.5,2Z"
+                         "M4,4.5L4.5,4L5,4.5L4.5,5Z")
+        self.assertEqual(contour.path(lines), contour.path(polygon))
+        self.assertEqual(contour.path(contour.contours([2])(values)[0]), None)
+
+    def test_6(self):
+        """
+        contour_density(x, y) returns contours of the density of points
+        """
+        random = np.random.RandomState(1)
+        x, y = random.normal(480, 100, 10000), random.normal(250, 60, 10000)
+        density = contour.contour_density()
+        self.assertEqual(density.cell_size, 4)
+        self.assertEqual(density.size, (960, 500))
+        self.assertAlmostEqual(density.bandwidth, np.sqrt(420))
+        grid = density.grid(x, y)
+        self.assertEqual(grid.shape, (155, 270))
+        self.assertAlmostEqual(grid.sum(), 10000 * (np.abs(x - 480) < 540).mean(), delta=50)
+        geometries = density(x, y)
+        values = [g["value"] for g in geometries]
+        self.assertEqual(values, array.ticks(5e-324, grid.max() / 16, 20))
+        ring = geometries[0]["coordinates"][0][0]
+        self.assertTrue(0 < ring[:, 0].min() < 480 < ring[:, 0].max() < 960)
+        self.assertTrue(density(x, y, weights=0) == [])
+
+    def test_7(self):
+        """
+        contours.isobands(values) returns polygons between consecutive thresholds
+        """
+        values = np.zeros((11, 11))
+        values[1:10, 1:10] = 1
+        values[3:8, 3:8] = 2
+        values[5, 5] = 0
+        bands = contour.contours([0.5, 1.5]).isobands(values)
+        self.assertEqual([band["value"] for band in bands], [(0.5, 1.5), (1.5, np.inf)])
+        self.assertEqual([len(polygon) for polygon in bands[0]["coordinates"]], [2, 2])
+        self.assertEqual(bands[0]["coordinates"][1][0][:, 0].min(), 4.75)
+        self.assertEqual(bands[0]["coordinates"][1][1][:, 0].min(), 5.25)
+        self.assertEqual(len(bands[1]["coordinates"]), 1)
+
+        # Grid points are within the polygon of the band of their value
+        def inside(ring, x, y):
+            x0, y0, x1, y1 = ring[:-1, 0, None], ring[:-1, 1, None], ring[1:, 0, None], ring[1:, 1, None]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                xc = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+            return np.count_nonzero(((y0 > y) != (y1 > y)) & (x < xc), axis=0) % 2 == 1
+        values = array.blur2(np.random.RandomState(1).uniform(size=(40, 50)), 1.2)
+        y, x = np.indices(values.shape).reshape(2, -1) + 0.5
+        for smooth in (True, False):
+            for band in contour.contours(8, smooth=smooth).isobands(values):
+                lower, upper = band["value"]
+                count = np.zeros(len(x))
+                for polygon in band["coordinates"]:
+                    within = inside(polygon[0], x, y)
+                    for hole in polygon[1:]:
+                        within &= ~inside(hole, x, y)
+                    count += within
+                self.assertTrue(np.array_equal(count, (lower <= values.ravel()) & (values.ravel() < upper)))
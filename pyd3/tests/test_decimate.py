@@ -0,0 +1,57 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import decimate, scale
+
+class test_decimate(unittest.TestCase):
+
+    def test_1(self):
+        """
+        decimate.m4(x, y) keeps first, last, minimum and maximum points of columns
+        """
+        x = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 1.0, 1.2, 1.4, 1.6, 1.8, 1.9]
+        y = [5.0, 1.0, 9.0, 3.0, 9.0, 4.0, 2.0, 2.0, 7.0, 0.0, 2.0, 3.0]
+        self.assertEqual(decimate.m4(x, y).tolist(), [0, 1, 2, 5, 6, 8, 9, 11])
+        self.assertEqual(decimate.m4([0, 1], [2, 3]).tolist(), [0, 1])
+
+    def test_2(self):
+        """
+        decimate.m4(x, y, range) keeps extrema of every pixel column
+        """
+        n = 100000
+        values = np.cumsum(np.random.RandomState(1).normal(size=n))
+        x = scale.linear(domain=[0, n-1], range=[0, 200])
+        y = scale.linear(domain=[values.min(), values.max()], range=[100, 0])
+        px, py = x(np.arange(n)), y(values)
+        px[50], py[50] = np.nan, np.nan
+        index = decimate.m4(px, py, x.range)
+        self.assertLessEqual(len(index), 4 * 201 + 3)
+        self.assertIn(50, index)
+        columns = np.floor(px)
+        for column in (0, 17, 199):
+            selected = index[columns[index] == column]
+            full = columns == column
+            self.assertEqual(py[selected].min(), py[full].min())
+            self.assertEqual(py[selected].max(), py[full].max())
+
+        # Points outside the range collapse into a single column
+        index = decimate.m4(px, py, [50, 100])
+        self.assertLessEqual(len(index), 4 * 53 + 3)
+        self.assertLessEqual(np.sum(px[index] < 50), 8)
+
+    def test_3(self):
+        """
+        decimate.lttb(x, y, threshold) keeps threshold points
+        """
+        x = np.arange(1000.0)
+        y = np.sin(x / 50)
+        index = decimate.lttb(x, y, 100)
+        self.assertEqual(len(index), 100)
+        self.assertEqual(index[0], 0)
+        self.assertEqual(index[-1], 999)
+        self.assertTrue(np.all(np.diff(index) > 0))
+        self.assertEqual(decimate.lttb(x[:10], y[:10], 20).tolist(), list(range(10)))
+        self.assertEqual(decimate.lttb([0, 1, 2, 3], [0, 5, 1, 0], 3).tolist(), [0, 1, 3])
@@ -0,0 +1,125 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import format as formats
+from pyd3.format import format, format_prefix
+
+class test_format(unittest.TestCase):
+
+    def test_1(self):
+        """
+        format(specifier)(number) returns a string
+        """
+        self.assertEqual(format("")(0), "0")
+        self.assertEqual(format("")(0.1*3), "0.3")
+        self.assertEqual(format(".0%")(0.123), "12%")
+        self.assertEqual(format("$.2f")(3.5), "$3.50")
+        self.assertEqual(format("+20")(42), "                 +42")
+        self.assertEqual(format(".^20")(42), ".........42.........")
+        self.assertEqual(format("#x")(48879), "0xbeef")
+        self.assertEqual(format(",.2r")(4223), "4,200")
+
+    def test_2(self):
+        """
+        format(specifier) is cached and throws an error for invalid formats
+        """
+        self.assertIs(format(",.2f"), format(",.2f"))
+        with self.assertRaises(ValueError):
+            format("foo")
+        self.assertEqual(str(formats.FormatSpecifier(" >-,.2f")), " >-,.2f")
+        self.assertEqual(str(formats.FormatSpecifier(".2")), ".2")
+
+    def test_3(self):
+        """
+        format("s") outputs SI-prefix notation with significant digits
+        """
+        self.assertEqual(format(".2s")(42e6), "42M")
+        self.assertEqual(format("s")(1500), "1.50000k")
+        self.assertEqual(format("~s")(1500), "1.5k")
+        self.assertEqual(format(".3s")(0.000001), "1.00µ")
+        self.assertEqual(format(".3s")(-2e-27), "−0.002y")
+
+    def test_4(self):
+        """
+        format(",") groups thousands, also within the zero fill
+        """
+        self.assertEqual(format(",d")(1e6), "1,000,000")
+        self.assertEqual(format(",.2f")(-1234.5), "−1,234.50")
+        self.assertEqual(format("010,")(1234), "00,001,234")
+        self.assertEqual(format("08.2f")(-3.1), "−0003.10")
+
+    def test_5(self):
+        """
+        format(specifier) handles signs, negative zero and non finite values
+        """
+        self.assertEqual(format("(.2f")(-3), "(3.00)")
+        self.assertEqual(format(".2f")(-0.0001), "0.00")
+        self.assertEqual(format("+.2f")(-0.0001), "−0.00")
+        self.assertEqual(format("=+8.1f")(3.14), "+    3.1")
+        self.assertEqual(format(",.0f")(np.nan), "NaN")
+        self.assertEqual(format(".1f")(-np.inf), "−Infinity")
+
+    def test_6(self):
+        """
+        format("e"), format("g") and format("r") follow javascript notations
+        """
+        self.assertEqual(format("e")(123456), "1.234560e+5")
+        self.assertEqual(format("g")(0.00001234), "0.0000123400")
+        self.assertEqual(format(".2")(1234.5), "1.2e+3")
+        self.assertEqual(format("r")(123.456), "123.456")
+        self.assertEqual(format(".1p")(0.1234), "10%")
+        self.assertEqual(format("d")(2.5), "3")
+
+    def test_7(self):
+        """
+        format(specifier)(array) formats arrays of numbers
+        """
+        labels = format(",.2f")(np.array([[1234.5, -0.001], [1e6, 3]]))
+        self.assertEqual(labels.shape, (2, 2))
+        self.assertEqual(labels.tolist(), [["1,234.50", "0.00"], ["1,000,000.00", "3.00"]])
+        self.assertEqual(format(".1s")([1500, 2e6]).tolist(), ["2k", "2M"])
+
+    def test_8(self):
+        """
+        format_prefix(specifier, value) uses a fixed SI prefix
+        """
+        self.assertEqual(format_prefix(",.0", 1e-6)(0.00042), "420µ")
+        self.assertEqual(format_prefix(".1", 1e3)([1500, 2000]).tolist(), ["1.5k", "2.0k"])
+
+    def test_9(self):
+        """
+        precision_fixed, precision_prefix and precision_round suggest precisions
+        """
+        self.assertEqual(formats.precision_fixed(0.001), 3)
+        self.assertEqual(formats.precision_fixed(10), 0)
+        self.assertEqual(formats.precision_prefix(1e5, 1.3e6), 1)
+        self.assertEqual(formats.precision_round(0.01, 1.01), 3)
+
+    def test_10(self):
+        """
+        FormatLocale(...) defines decimal, grouping, currency and minus sign
+        """
+        locale = formats.FormatLocale(decimal=",", thousands=".", grouping=[3],
+                                      currency=["", " €"], minus="-")
+        self.assertEqual(locale.format("$,.2f")(-1234.5), "-1.234,50 €")
+        indian = formats.FormatLocale(grouping=[3, 2, 2])
+        self.assertEqual(indian.format(",d")(12345678), "1,23,45,678")
+
+    def test_11(self):
+        """
+        format(specifier) rounds exact ties up, as javascript
+        """
+        self.assertEqual(format(".0f")([0.5, 1.5, 2.5, -2.5]).tolist(), ["1", "2", "3", "−3"])
+        self.assertEqual(format(".1f")(0.25), "0.3")
+        self.assertEqual(format(".0%")(0.125), "13%")
+        self.assertEqual(format(".1e")(0.25), "2.5e-1")
+        self.assertEqual(format(".2s")(1250), "1.3k")
+        self.assertEqual(format(",.0f")(2500000.5), "2,500,001")
+        self.assertEqual(format(".1f")(1.005), "1.0")
+
+
+if __name__ == "__main__":
+    unittest.main()
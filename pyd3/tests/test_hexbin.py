@@ -0,0 +1,92 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import hexbin
+
+class test_hexbin(unittest.TestCase):
+
+    def test_1(self):
+        """
+        hexbin() has the expected defaults
+        """
+        h = hexbin.hexbin()
+        self.assertEqual(h.radius, 1)
+        self.assertEqual(h.extent, [[0, 0], [1, 1]])
+        self.assertEqual(h.size, [1, 1])
+        h.size = [960, 500]
+        self.assertEqual(h.extent, [[0, 0], [960, 500]])
+
+    def test_2(self):
+        """
+        hexbin(x, y) bins points into the hexagon of the nearest center
+        """
+        random = np.random.RandomState(1)
+        x, y = random.uniform(-50, 50, 10000), random.uniform(-30, 30, 10000)
+        h = hexbin.hexbin(radius=3)
+        i, j = h.index(x, y)
+        cx, cy = h.center(i, j)
+        d = np.hypot(x - cx, y - cy)
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                ox, oy = h.center(i + di, j + dj)
+                self.assertTrue(np.all(d <= np.hypot(x - ox, y - oy) + 1e-9))
+
+    def test_3(self):
+        """
+        hexbin(x, y, weights) returns non-empty bins with counts and sums
+        """
+        h = hexbin.hexbin()
+        bins = h([0, 0, 0, 1, 1, 1, 2, 2, 2, np.nan], [0, 1, 2, 0, 1, 2, 0, 1, 2, 0])
+        self.assertEqual(bins.count.sum(), 9)
+        self.assertEqual(bins.sum, None)
+        i, j = h.index(bins.x, bins.y)
+        self.assertTrue(np.allclose(h.center(i, j), (bins.x, bins.y)))
+        self.assertEqual(np.lexsort((i, j)).tolist(), list(range(len(i))))
+        bins = h([0, 0.1, 5], [0, 0.1, 5], weights=[1, 2, 3])
+        self.assertEqual(bins.count.tolist(), [2, 1])
+        self.assertEqual(bins.sum.tolist(), [3, 3])
+        self.assertEqual(len(h([], []).count), 0)
+
+        # Scattered points (sparse hexagons)
+        bins = h([0, 1e6], [0, 1e6])
+        self.assertEqual(bins.count.tolist(), [1, 1])
+        self.assertEqual(bins.x[0], 0)
+
+    def test_4(self):
+        """
+        hexbin.hexagon(), centers() and mesh() return hexagons covering the extent
+        """
+        h = hexbin.hexbin()
+        self.assertEqual(h.hexagon(), "m0,-1l0.866,0.5l0,1l-0.866,0.5l-0.866,-0.5l0,-1z")
+        self.assertEqual(h.hexagon(2), "m0,-2l1.732,1l0,2l-1.732,1l-1.732,-1l0,-2z")
+        h = hexbin.hexbin(radius=2, extent=[[0, 0], [4, 4]])
+        dx = 2 * np.sqrt(3)
+        self.assertTrue(np.allclose(h.centers(), [[0, 0], [dx, 0], [dx/2, 3], [3*dx/2, 3]]))
+        self.assertEqual(h.mesh(), "M0,0m0,-2l1.732,1l0,2l-1.732,1"
+                                   "M3.464,0m0,-2l1.732,1l0,2l-1.732,1"
+                                   "M1.732,3m0,-2l1.732,1l0,2l-1.732,1"
+                                   "M5.196,3m0,-2l1.732,1l0,2l-1.732,1")
+
+    def test_5(self):
+        """
+        hexbin.counts() accumulates and merges bins by chunks
+        """
+        random = np.random.RandomState(1)
+        x, y = random.uniform(0, 100, 10000), random.uniform(0, 50, 10000)
+        h = hexbin.hexbin(radius=5, extent=[[0, 0], [100, 50]])
+        h._chunk_size = 1000
+        bins = h(x, y, weights=y)
+        counts = h.counts().update(x[:3000], y[:3000], y[:3000])
+        counts.merge(h.counts().update(x[3000:], y[3000:], y[3000:]))
+        self.assertEqual(len(counts.count), len(h.centers()))
+        self.assertEqual(counts.count.sum(), 10000)
+        result = counts.bins()
+        self.assertEqual(result.count.tolist(), bins.count.tolist())
+        self.assertTrue(np.allclose(result.sum, bins.sum))
+        self.assertTrue(np.allclose(result.x, bins.x))
+        self.assertEqual(h.counts().update([-100, np.nan], [-100, 0]).count.sum(), 0)
+        with self.assertRaises(ValueError):
+            counts.merge(hexbin.hexbin(radius=4).counts())
@@ -0,0 +1,61 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import scale_chromatic
+from pyd3.pool import ScalePool
+
+class test_pool(unittest.TestCase):
+
+    def test_1(self):
+        """
+        pool.map(values) is equivalent to scale(values)
+        """
+        values = np.random.uniform(1, 100, 1000)
+        for s in [scale.linear([0, 100], [0, 960]), scale.pow([0, 100], exponent=2),
+                  scale.quantize([0, 100], ["a", "bb", "c"])]:
+            with ScalePool(s, workers=2) as pool:
+                np.testing.assert_array_equal(pool.map(values, chunk_size=64), s(values))
+
+    def test_2(self):
+        """
+        pool.map(values) returns colors as strings
+        """
+        s = scale.linear([0, 100], ["white", "steelblue"])
+        values = np.linspace(0, 100, 20).reshape(4, 5)
+        with ScalePool(s, workers=2) as pool:
+            colors = pool.map(values, chunk_size=3)
+            self.assertEqual(colors.shape, (4, 5))
+            self.assertEqual(colors[0, 0], "#ffffff")
+            self.assertEqual(colors[-1, -1], "#4682b4")
+            self.assertEqual(pool.map(50), "#a2c0da")
+
+    def test_3(self):
+        """
+        pool.map(values, method) uses the given method of the scale
+        """
+        s = scale.sequential(scale_chromatic.viridis, [0, 100])
+        values = np.random.uniform(0, 100, 1000)
+        with ScalePool(s, workers=2) as pool:
+            np.testing.assert_array_equal(pool.map(values, "rgba"), s.rgba(values))
+        s = scale.log([1, 100], [0, 960])
+        with ScalePool(s, workers=2) as pool:
+            out = np.empty(1000, dtype=np.float32)
+            self.assertIs(pool.map(s(values + 1), "invert", out=out), out)
+            np.testing.assert_almost_equal(out, values + 1, decimal=3)
+
+    def test_4(self):
+        """
+        pool.map(values) does not truncate strings of variable width
+        """
+        s = scale.linear([0, 100], ["1px", "100px"])
+        values = np.linspace(0, 100, 5)
+        with ScalePool(s, workers=2) as pool:
+            result = pool.map(values, chunk_size=1)
+            self.assertEqual(result.tolist(), ["1px", "25.75px", "50.5px", "75.25px", "100px"])
+            values = np.concatenate([np.zeros(1000), [50.5]])
+            self.assertEqual(pool.map(values, chunk_size=64).tolist(), s(values))
+            self.assertRaises(ValueError, pool.map, values, dtype="U3")
@@ -0,0 +1,99 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import warnings
+import numpy as np
+from pyd3 import quadtree
+
+class test_quadtree(unittest.TestCase):
+
+    def test_1(self):
+        """
+        quadtree(x, y) has the expected size and extent
+        """
+        tree = quadtree.quadtree([0, 2, np.nan], [1, 0, 1])
+        self.assertEqual(len(tree), 2)
+        self.assertEqual(tree.extent[0], [0, 0])
+        self.assertTrue(tree.extent[1][0] > 2)
+        tree = quadtree.quadtree(np.array([[0, 1], [2, 0]]))
+        self.assertEqual(tree.x.tolist(), [0, 2])
+        self.assertEqual(tree.y.tolist(), [1, 0])
+        tree = quadtree.quadtree([], [])
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(tree.extent, None)
+        with self.assertRaises(ValueError):
+            quadtree.quadtree([0, 1], [0])
+
+    def test_2(self):
+        """
+        quadtree.find(x, y) returns the index of the closest point
+        """
+        tree = quadtree.quadtree([0, 1, 2, 0, 1, 2, 0, 1, 2], [0, 0, 0, 1, 1, 1, 2, 2, 2])
+        self.assertEqual(tree.find(0.1, 0.1), 0)
+        self.assertEqual(tree.find(7.1, 7.1), 8)
+        self.assertEqual(tree.find(0.5, 0.5), 0)
+        self.assertEqual(tree.find(0.5, 0.5, radius=0.5), None)
+        self.assertEqual(tree.find(0.5, 0.5, radius=0.75), 0)
+        self.assertEqual(tree.find([0.1, 7.1], [0.1, 7.1]).tolist(), [0, 8])
+        self.assertEqual(quadtree.quadtree([], []).find(0, 0), None)
+        self.assertEqual(quadtree.quadtree(np.zeros(100), np.zeros(100)).find(1, 1), 0)
+
+    def test_3(self):
+        """
+        quadtree.find(x, y) returns the closest points of many positions
+        """
+        random = np.random.RandomState(1)
+        x, y = random.uniform(0, 960, 20000), random.uniform(0, 500, 20000)
+        tree = quadtree.quadtree(x, y)
+        tree._chunk_size = 64
+        qx, qy = random.uniform(-50, 1010, 200), random.uniform(-50, 550, 200)
+        index = tree.find(qx, qy)
+        near = tree.find(qx, qy, radius=3)
+        for k in range(len(qx)):
+            d = np.hypot(x - qx[k], y - qy[k])
+            self.assertEqual(index[k], np.argmin(d))
+            self.assertEqual(near[k], np.argmin(d) if d.min() < 3 else -1)
+
+    def test_4(self):
+        """
+        quadtree.search(x0, y0, x1, y1) returns the indices of points in rectangles
+        """
+        random = np.random.RandomState(1)
+        x, y = random.uniform(0, 960, 20000), random.uniform(0, 500, 20000)
+        x[:10] = np.nan
+        tree = quadtree.quadtree(x, y)
+        x0, y0 = random.uniform(-50, 1010, 100), random.uniform(-50, 550, 100)
+        width, height = random.uniform(0, 200, 100), random.uniform(0, 200, 100)
+        result = tree.search(x0, y0, x0 + width, y0 + height)
+        self.assertEqual(len(result), 100)
+        for k in range(100):
+            inside = (x >= x0[k]) & (x < x0[k] + width[k]) & (y >= y0[k]) & (y < y0[k] + height[k])
+            self.assertEqual(result[k].tolist(), np.flatnonzero(inside).tolist())
+        self.assertEqual(len(tree.search(-1, -1, 1000, 1000)), 19990)
+        self.assertEqual(tree.search(0, 0, 0, 0).tolist(), [])
+        self.assertEqual(quadtree.quadtree([], []).search(0, 0, 1, 1).tolist(), [])
+
+    def test_5(self):
+        """
+        quadtree(x, y) splits clusters far from outliers and coincident points
+        """
+        random = np.random.RandomState(1)
+        x = np.append(random.uniform(0, 1, 5000), 1e12)
+        y = np.append(random.uniform(0, 1, 5000), 1e12)
+        tree = quadtree.quadtree(x, y)
+        leaves = tree._leaf & ~tree._coincident
+        self.assertLessEqual((tree._stops - tree._starts)[leaves].max(), tree._leaf_size)
+        qx, qy = random.uniform(0, 1, 50), random.uniform(0, 1, 50)
+        index = tree.find(qx, qy)
+        for k in range(len(qx)):
+            self.assertEqual(index[k], np.argmin((x - qx[k])**2 + (y - qy[k])**2))
+        inside = np.flatnonzero((x >= 0.25) & (x < 0.5) & (y >= 0.25) & (y < 0.5))
+        self.assertEqual(tree.search(0.25, 0.25, 0.5, 0.5).tolist(), inside.tolist())
+        tree = quadtree.quadtree(np.append(np.zeros(1000), 1), np.zeros(1001))
+        self.assertEqual(tree.find([0.1, 0.9], [0, 0]).tolist(), [0, 1000])
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(tree.find(np.nan, 0), None)
+            self.assertEqual(tree.find([np.nan, 0.9], [0, np.nan]).tolist(), [-1, -1])
@@ -0,0 +1,57 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import asyncio
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import scale_chromatic
+
+async def produce(chunks, delay=0):
+    for chunk in chunks:
+        await asyncio.sleep(delay)
+        yield chunk
+
+async def collect(generator):
+    return [result async for result in generator]
+
+class test_scale_async(unittest.TestCase):
+
+    def test_1(self):
+        """
+        scale.amap(chunks) maps chunks in order
+        """
+        s = scale.linear([0, 100], [0, 960])
+        chunks = [np.random.uniform(0, 100, n) for n in (10, 1000, 1, 100)]
+        results = asyncio.run(collect(s.amap(produce(chunks), concurrency=2)))
+        self.assertEqual(len(results), 4)
+        for chunk, result in zip(chunks, results):
+            np.testing.assert_array_equal(result, s(chunk))
+
+    def test_2(self):
+        """
+        scale.amap(chunks, method) uses the given method of the scale
+        """
+        s = scale.sequential(scale_chromatic.viridis, [0, 100])
+        chunks = [np.linspace(0, 100, 5), np.linspace(100, 0, 5)]
+        results = asyncio.run(collect(s.amap(chunks, "rgba")))
+        np.testing.assert_array_equal(results[1], s.rgba(chunks[1]))
+
+    def test_3(self):
+        """
+        scale.amap(chunks) pulls at most concurrency chunks ahead
+        """
+        pulled = []
+        async def source():
+            for i in range(10):
+                pulled.append(i)
+                yield np.full(10, i)
+        async def first():
+            generator = scale.linear().amap(source(), concurrency=3)
+            result = await generator.__anext__()
+            await generator.aclose()
+            return result
+        result = asyncio.run(first())
+        np.testing.assert_array_equal(result, np.zeros(10))
+        self.assertEqual(len(pulled), 3)
@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_band(unittest.TestCase):
+
+    def test_1(self):
+        """
+        band() has the expected defaults
+        """
+        s = scale.band()
+        self.assertEqual(s.domain, [])
+        self.assertEqual(s.range, [0, 1])
+        self.assertEqual(s.bandwidth, 1)
+        self.assertEqual(s.step, 1)
+        self.assertEqual(s.round, False)
+        self.assertEqual(s.padding_inner, 0)
+        self.assertEqual(s.padding_outer, 0)
+        self.assertEqual(s.align, 0.5)
+
+    def test_2(self):
+        """
+        band(value) computes discrete bands in a continuous range
+        """
+        s = scale.band(domain=["foo", "bar"], range=[0, 960])
+        self.assertEqual(s("foo"), 0)
+        self.assertEqual(s("bar"), 480)
+        self.assertEqual(s.bandwidth, 480)
+        self.assertEqual(s("baz"), None)
+        np.testing.assert_equal(s(["bar", "baz", "foo"]), [480, np.nan, 0])
+
+    def test_3(self):
+        """
+        band.padding(p) sets the inner and outer padding
+        """
+        s = scale.band(domain=["a", "b", "c"], range=[0, 120])
+        s.padding = 0.2
+        self.assertEqual(s.padding_inner, 0.2)
+        self.assertEqual(s.padding_outer, 0.2)
+        np.testing.assert_almost_equal(s(["a", "b", "c"]), [7.5, 45, 82.5])
+        self.assertAlmostEqual(s.bandwidth, 30)
+        self.assertAlmostEqual(s.step, 37.5)
+
+    def test_4(self):
+        """
+        band.range(range) can be reversed
+        """
+        s = scale.band(domain=["a", "b", "c"], range=[120, 0])
+        np.testing.assert_almost_equal(s(["a", "b", "c"]), [80, 40, 0])
+
+    def test_5(self):
+        """
+        band.round(true) computes integer band positions and width
+        """
+        s = scale.band(domain=["a", "b", "c"], range=[0, 100], round=True)
+        self.assertEqual(s(["a", "b", "c"]).tolist(), [1, 34, 67])
+        self.assertEqual(s.bandwidth, 33)
+
+    def test_6(self):
+        """
+        band.align(align) distributes the outer padding
+        """
+        s = scale.band(domain=["a", "b", "c"], range=[0, 120], padding_outer=1, align=0)
+        np.testing.assert_almost_equal(s(["a", "b", "c"]), [0, 24, 48])
+        s.align = 1
+        np.testing.assert_almost_equal(s(["a", "b", "c"]), [48, 72, 96])
+
+        
+if __name__ == "__main__":
+    unittest.main()
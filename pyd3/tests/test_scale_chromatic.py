@@ -0,0 +1,61 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import scale_chromatic
+
+class test_scale_chromatic(unittest.TestCase):
+
+    def test_1(self):
+        """
+        categorical schemes are tuples of hex colors
+        """
+        self.assertEqual(len(scale_chromatic.category10), 10)
+        self.assertEqual(scale_chromatic.category10[0], "#1f77b4")
+        self.assertEqual(scale_chromatic.set3[-1], "#ffed6f")
+        self.assertIs(scale_chromatic.schemes["Tableau10"], scale_chromatic.tableau10)
+
+    def test_2(self):
+        """
+        viridis(t) is a discrete ramp over 256 colors
+        """
+        viridis = scale_chromatic.viridis
+        self.assertEqual(viridis(0), "#440154")
+        self.assertEqual(viridis(0.5), "#21918c")
+        self.assertEqual(viridis(1), "#fde725")
+        self.assertEqual(viridis([0, 1]).tolist(), ["#440154", "#fde725"])
+
+    def test_3(self):
+        """
+        ColorBrewer schemes are interpolated with a B-spline
+        """
+        rd_bu = scale_chromatic.rd_bu
+        self.assertEqual(rd_bu(0), "#67001f")
+        self.assertEqual(rd_bu(0.5), "#f2efee")
+        self.assertEqual(rd_bu(1), "#053061")
+        self.assertEqual(scale_chromatic.blues(-1), "#f7fbff")
+
+    def test_4(self):
+        """
+        scheme.lut(resolution) is cached and read-only
+        """
+        lut = scale_chromatic.magma.lut(64)
+        self.assertEqual(lut.shape, (64, 4))
+        self.assertEqual(lut.dtype, np.uint8)
+        self.assertIs(scale_chromatic.magma.lut(64), lut)
+        self.assertFalse(lut.flags.writeable)
+
+    def test_5(self):
+        """
+        schemes feed sequential, diverging and ordinal scales
+        """
+        s = scale.sequential(scale_chromatic.viridis, [0, 100])
+        self.assertEqual(s([0, 50, 100]).tolist(), ["#440154", "#21918c", "#fde725"])
+        np.testing.assert_array_equal(s.rgba(50), [33, 145, 140, 255])
+        s = scale.diverging(scale_chromatic.rd_bu, [-1, 0, 1])
+        self.assertEqual(s(0), "#f2efee")
+        s = scale.ordinal(range=scale_chromatic.category10)
+        self.assertEqual(s("a"), "#1f77b4")
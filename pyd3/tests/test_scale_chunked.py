@@ -0,0 +1,58 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import scale_chromatic
+
+class test_scale_chunked(unittest.TestCase):
+
+    def test_1(self):
+        """
+        scale.map_chunked(values) is equivalent to scale(values)
+        """
+        values = np.random.uniform(1, 100, 10000)
+        for s in [scale.linear([0, 100], [0, 960]), scale.log([1, 100], [0, 1]),
+                  scale.quantize([0, 100], ["a", "b", "c"]),
+                  scale.sequential(scale_chromatic.viridis, [0, 100])]:
+            np.testing.assert_array_equal(s.map_chunked(values, chunk_size=999, workers=4),
+                                          s(values))
+
+    def test_2(self):
+        """
+        scale.map_chunked(values, out=out) writes into out
+        """
+        values = np.linspace(0, 100, 1000).reshape(10, 100)
+        s = scale.linear([0, 100], [0, 960])
+        out = np.empty((10, 100), dtype=np.float32)
+        self.assertIs(s.map_chunked(values, chunk_size=64, workers=2, out=out), out)
+        np.testing.assert_almost_equal(out, s(values), decimal=4)
+
+    def test_3(self):
+        """
+        scale.map_chunked(values, out=out) requires a contiguous output
+        """
+        s = scale.linear()
+        out = np.empty((20,))[::2]
+        self.assertRaises(ValueError, s.map_chunked, np.zeros(10), out=out)
+        self.assertRaises(ValueError, s.map_chunked, np.zeros(10), out=np.empty(5))
+
+    def test_4(self):
+        """
+        scale.map_chunked(value) maps scalars directly
+        """
+        self.assertEqual(scale.linear([0, 1], [0, 10]).map_chunked(0.5), 5)
+
+    def test_5(self):
+        """
+        scale.map_chunked(values) does not truncate strings of variable width
+        """
+        s = scale.linear([0, 100], ["1px", "100px"])
+        values = np.linspace(0, 100, 5)
+        result = s.map_chunked(values, chunk_size=1, workers=2)
+        self.assertEqual(result.tolist(), ["1px", "25.75px", "50.5px", "75.25px", "100px"])
+        self.assertEqual(result.tolist(), s(values))
+        s = scale.quantize([0, 100], ["a", "bbb"])
+        self.assertEqual(s.map_chunked(values, chunk_size=2).tolist(), s(values).tolist())
@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_compose(unittest.TestCase):
+
+    def test_1(self):
+        """
+        compose(s1, s2) is equivalent to s2(s1(x))
+        """
+        s1 = scale.linear([0, 100], [0, 1])
+        s2 = scale.linear([0, 0.5, 1], [0, 10, -5])
+        s = scale.compose(s1, s2)
+        x = np.linspace(-50, 150, 101)
+        np.testing.assert_almost_equal(s(x), s2(s1(x)))
+        self.assertEqual(s.domain, [0, 50, 100])
+
+    def test_2(self):
+        """
+        compose(s1, s2) merges breakpoints of polylinear scales
+        """
+        s1 = scale.linear([100, 0, -20], [0, 1, 3])
+        s2 = scale.linear([-1, 0.5, 2], [5, 10, -5])
+        s = scale.compose(s1, s2)
+        x = np.linspace(-50, 150, 101)
+        np.testing.assert_almost_equal(s(x), s2(s1(x)))
+
+    def test_3(self):
+        """
+        compose(s1, s2) is clamped if either scale is clamped
+        """
+        x = np.linspace(-50, 150, 101)
+        for clamp1, clamp2 in [(True, False), (False, True)]:
+            s1 = scale.linear([0, 100], [0, 1], clamp=clamp1)
+            s2 = scale.linear([0.2, 0.9], [0, 10], clamp=clamp2)
+            s = scale.compose(s1, s2)
+            self.assertEqual(s.clamp, True)
+            np.testing.assert_almost_equal(s(x), s2(s1(x)))
+
+    def test_4(self):
+        """
+        compose(s1, s2) keeps the transform of s1
+        """
+        s1 = scale.log([1, 1000], [0, 1])
+        s2 = scale.linear([0.2, 0.5, 0.9], [0, 10, -5])
+        s = scale.compose(s1, s2)
+        self.assertIsInstance(s, scale.LogScale)
+        x = np.linspace(0.5, 2000, 101)
+        np.testing.assert_almost_equal(s(x), s2(s1(x)))
+
+    def test_5(self):
+        """
+        compose(s1, s2) supports time and color scales
+        """
+        s1 = scale.time(["2000-01-01", "2000-01-11"], [0, 1])
+        s2 = scale.linear([0, 0.25, 1], [0, 100, 0])
+        s = scale.compose(s1, s2)
+        self.assertEqual(s.domain[1], np.datetime64("2000-01-03T12"))
+        dates = np.arange(np.datetime64("1999-12-25"), np.datetime64("2000-01-20"))
+        np.testing.assert_almost_equal(s(dates), s2(s1(dates)))
+        s = scale.compose(scale.linear([0, 100]), scale.linear(range=["white", "black"]))
+        self.assertEqual(s(50), "#808080")
+
+    def test_6(self):
+        """
+        compose(s1, s2) requires s2 to be piecewise linear
+        """
+        self.assertRaises(ValueError, scale.compose, scale.linear(), scale.log())
+        self.assertRaises(ValueError, scale.compose, scale.linear(range=["red", "blue"]),
+                          scale.linear())
@@ -0,0 +1,42 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import interpolate
+
+class test_scale_diverging(unittest.TestCase):
+
+    def test_1(self):
+        """
+        diverging() has the expected defaults
+        """
+        s = scale.diverging()
+        self.assertEqual(s.domain, [0,0.5,1])
+        np.testing.assert_array_equal(s([0, 0.5, 1]), [0, 0.5, 1])
+
+    def test_2(self):
+        """
+        diverging(x) maps each half of the domain linearly
+        """
+        s = scale.diverging(domain=[-1, 0, 3])
+        np.testing.assert_almost_equal(s([-1, -0.5, 0, 1.5, 3]),
+                                       [0, 0.25, 0.5, 0.75, 1], decimal=2)
+
+    def test_3(self):
+        """
+        diverging(x) supports descending domains
+        """
+        s = scale.diverging(domain=[10, 0, -10])
+        np.testing.assert_almost_equal(s([10, 5, 0, -10]), [0, 0.25, 0.5, 1], decimal=2)
+
+    def test_4(self):
+        """
+        diverging(x) maps the middle of the domain to the neutral color
+        """
+        s = scale.diverging(interpolate.rgb("red", "blue"), [-1, 0, 1])
+        self.assertEqual(s(-1), "#ff0000")
+        self.assertEqual(s(0), "#800080")
+        self.assertEqual(s(1), "#0000ff")
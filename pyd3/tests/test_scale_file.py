@@ -0,0 +1,75 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import scale_chromatic
+
+class test_scale_file(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.values = np.linspace(0, 100, 9999).reshape(101, 99)
+        self.source = os.path.join(self.path, "source.npy")
+        np.save(self.source, self.values)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_1(self):
+        """
+        map_file(scale, source, destination) maps a file to a file
+        """
+        s = scale.linear([0, 100], [0, 960])
+        destination = os.path.join(self.path, "destination.npy")
+        result = scale.map_file(s, self.source, destination, dtype=np.int32, memory=4096)
+        self.assertEqual(result.shape, (101, 99))
+        np.testing.assert_array_equal(np.load(destination), s(self.values, dtype=np.int32))
+
+    def test_2(self):
+        """
+        map_file(scale.invert, source, destination) maps values back
+        """
+        s = scale.linear([0, 100], [0, 960])
+        pixels = os.path.join(self.path, "pixels.npy")
+        values = os.path.join(self.path, "values.npy")
+        scale.map_file(s, self.source, pixels, memory=4096)
+        scale.map_file(s.invert, pixels, values, memory=4096, workers=2)
+        np.testing.assert_almost_equal(np.load(values), self.values)
+
+    def test_3(self):
+        """
+        map_file(sequential.rgba, source, destination) writes RGBA colors
+        """
+        s = scale.sequential(scale_chromatic.viridis, [0, 100])
+        destination = os.path.join(self.path, "colors.npy")
+        result = scale.map_file(s.rgba, self.source, destination, memory=4096)
+        self.assertEqual(result.shape, (101, 99, 4))
+        np.testing.assert_array_equal(np.load(destination), s.rgba(self.values))
+
+    def test_4(self):
+        """
+        map_file(scale, source, array) writes into an existing array
+        """
+        s = scale.linear([0, 100], [0, 1])
+        source = np.load(self.source, mmap_mode="r")
+        out = np.empty((101, 99), dtype=np.float32)
+        self.assertIs(scale.map_file(s, source, out), out)
+        self.assertRaises(ValueError, scale.map_file, s, source, np.empty(5))
+
+    def test_5(self):
+        """
+        map_file(scale, source, destination) does not truncate strings
+        """
+        s = scale.linear([0, 100], ["1px", "100px"])
+        destination = os.path.join(self.path, "strings.npy")
+        self.assertRaises(ValueError, scale.map_file, s, self.source, destination)
+        result = scale.map_file(s, self.source, destination, dtype="U24", memory=4096)
+        self.assertEqual(result.shape, (101, 99))
+        self.assertEqual(result.ravel().tolist(), s(self.values.ravel()))
+        self.assertRaises(ValueError, scale.map_file, s, self.source, destination, dtype="U3")
@@ -423,6 +423,140 @@ class test_scale_linear(unittest.TestCase):
         s = scale.linear();
         self.assertEqual(s.ticks(), s.ticks(10))
 
-        
+
+    def test_38(self):
+        """
+        linear(x) preserves the floating point type of x
+        """
+        s = scale.linear(domain=[0, 10], range=[0, 100])
+        x = np.linspace(0, 10, 5, dtype=np.float32)
+        self.assertEqual(s(x).dtype, np.float32)
+        self.assertEqual(s.invert(x).dtype, np.float32)
+        self.assertEqual(s([0, 5, 10]).dtype, np.float64)
+        np.testing.assert_almost_equal(s(x), [0, 25, 50, 75, 100])
+
+    def test_39(self):
+        """
+        linear(x, dtype=dtype) rounds integer output to the nearest integer
+        """
+        s = scale.linear(domain=[0, 3], range=[0, 10])
+        y = s([0, 1, 2, 3], dtype=np.int32)
+        self.assertEqual(y.dtype, np.int32)
+        self.assertEqual(y.tolist(), [0, 3, 7, 10])
+
+    def test_40(self):
+        """
+        linear(x, out=out) writes into and returns out
+        """
+        s = scale.linear(domain=[-10, 0, 100], range=[0, 10, 20], clamp=True)
+        out = np.zeros(4, dtype=np.float32)
+        y = s(np.array([-20, -5, 50, 200]), out=out)
+        self.assertIs(y, out)
+        np.testing.assert_almost_equal(out, [0, 5, 15, 20])
+        out = np.zeros(2, dtype=np.int16)
+        s.invert(np.array([5, 15]), out=out)
+        self.assertEqual(out.tolist(), [-5, 50])
+
+    def test_41(self):
+        """
+        linear(x, out=out) supports datetime and color ranges
+        """
+        s = scale.linear(range=[np.datetime64("1990-01-01"), np.datetime64("1991-01-01")])
+        out = np.empty(2, dtype="datetime64[D]")
+        s([0, .5], out=out)
+        self.assertEqual(out[1], np.datetime64("1990-07-02"))
+        s = scale.linear(range=["red", "blue"])
+        self.assertEqual(s([0, .5], dtype="U7").tolist(), ["#ff0000", "#800080"])
+
+    def test_42(self):
+        """
+        linear.update_extent(values) sets the domain from the first chunk
+        """
+        s = scale.linear(range=[0, 960])
+        self.assertEqual(s.extent, None)
+        self.assertTrue(s.update_extent([3.2, np.nan, 7.9]))
+        self.assertEqual(s.domain, [3, 8])
+        self.assertEqual(s.extent, (3.2, 7.9))
+
+    def test_43(self):
+        """
+        linear.update_extent(values) renices only when the extent grows out
+        """
+        s = scale.linear(range=[0, 960])
+        s.update_extent([3.2, 7.9])
+        version = s.version
+        self.assertFalse(s.update_extent([4, 5]))
+        self.assertEqual(s.version, version)
+        self.assertTrue(s.update_extent([8.3]))
+        self.assertEqual(s.domain, [3, 8.5])
+        self.assertEqual(s.version, version + 1)
+        self.assertFalse(s.update_extent([np.nan]))
+
+    def test_44(self):
+        """
+        linear.update_extent(values, None) keeps the exact extent and order
+        """
+        s = scale.linear([10, 0])
+        s.update_extent([1.5, 12.2], None)
+        self.assertEqual(s.domain, [12.2, 1.5])
+
+    def test_45(self):
+        """
+        linear.nice() does not modify the original scale
+        """
+        s = scale.linear(domain=[1.1, 10.9])
+        t = s.nice()
+        self.assertEqual(s.domain, [1.1, 10.9])
+        self.assertEqual(t.domain, [1, 11])
+        s.domain.append(12)
+        self.assertEqual(s.domain, [1.1, 10.9])
+
+    def test_46(self):
+        """
+        linear.with_domain(domain) and linear.with_range(range) return new scales
+        """
+        s = scale.linear(domain=[0, 10], range=[0, 100])
+        t = s.with_range([100, 0])
+        self.assertEqual(s(2), 20)
+        self.assertEqual(t(2), 80)
+        self.assertIs(t._forward_domain, s._forward_domain)
+        self.assertEqual(t.invert(80), 2)
+        u = s.with_domain([0, 20])
+        self.assertEqual(s.domain, [0, 10])
+        self.assertEqual(u(10), 50)
+        v = s.with_range(["red", "blue"])
+        self.assertEqual(v(5), "#800080")
+        self.assertEqual(v.invert(5), None)
+
+    def test_47(self):
+        """
+        linear.ticks() are cached until the scale changes
+        """
+        s = scale.linear(domain=[0, 1])
+        self.assertEqual(s.ticks(5), s.ticks(5))
+        self.assertIn((0, 1, 5), s._ticks)
+        version = s.version
+        s.domain = [0, 10]
+        self.assertEqual(s.version, version + 1)
+        self.assertEqual(s.ticks(5), [0, 2, 4, 6, 8, 10])
+        with self.assertRaises(ValueError):
+            s._forward_domain[0] = 1
+
+    def test_48(self):
+        """
+        linear.tick_format(count, specifier) sets the precision from the tick step
+        """
+        s = scale.linear(domain=[0, 1])
+        self.assertEqual(s.tick_format(5)(s.ticks(5)).tolist(),
+                         ["0.0", "0.2", "0.4", "0.6", "0.8", "1.0"])
+        self.assertEqual(s.tick_format(100)(0.25), "0.25")
+        s = scale.linear(domain=[-1, 1])
+        self.assertEqual(s.tick_format(5, "+%")(s.ticks(5)).tolist(),
+                         ["−100%", "−50%", "+0%", "+50%", "+100%"])
+        s = scale.linear(domain=[0, 1e6])
+        self.assertEqual(s.tick_format(5, "s")([0, 2e5, 1e6]).tolist(), ["0.0M", "0.2M", "1.0M"])
+        self.assertEqual(s.tick_format(10, ".1s")(1e6), "1.0M")
+
+
 if __name__ == "__main__":
     unittest.main()
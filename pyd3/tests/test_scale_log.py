@@ -0,0 +1,130 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_log(unittest.TestCase):
+
+    def test_1(self):
+        """
+        log() has the expected defaults
+        """
+        s = scale.log()
+        self.assertEqual(s.domain, [1,10])
+        self.assertEqual(s.range, [0,1])
+        self.assertEqual(s.clamp, False)
+        self.assertEqual(s.base, 10)
+        self.assertAlmostEqual(s(5), 0.69897000, delta=1e-6)
+        self.assertAlmostEqual(s.invert(0.69897000), 5, delta=1e-6)
+
+    def test_2(self):
+        """
+        log(x) maps a domain value x to a range value y
+        """
+        s = scale.log(domain=[1, 2], range=[0, 1])
+        self.assertAlmostEqual(s(0.5), -1.0000000, delta=1e-6)
+        self.assertAlmostEqual(s(1.0),  0.0000000, delta=1e-6)
+        self.assertAlmostEqual(s(1.5),  0.5849625, delta=1e-6)
+        self.assertAlmostEqual(s(2.0),  1.0000000, delta=1e-6)
+        self.assertAlmostEqual(s(2.5),  1.3219281, delta=1e-6)
+
+    def test_3(self):
+        """
+        log.invert(y) maps a range value y to a domain value x
+        """
+        s = scale.log(domain=[1, 2], range=[0, 1])
+        np.testing.assert_almost_equal(s.invert([-1, 0, 0.5849625, 1, 1.3219281]),
+                                       [0.5, 1.0, 1.5, 2.0, 2.5])
+
+    def test_4(self):
+        """
+        log(x) and log.invert(y) work with negative domains
+        """
+        s = scale.log(domain=[-1, -100], range=[0, 1])
+        self.assertAlmostEqual(s(-10), 0.5, delta=1e-6)
+        self.assertAlmostEqual(s.invert(0.5), -10, delta=1e-6)
+        np.testing.assert_almost_equal(s([-1, -10, -100]), [0, 0.5, 1])
+
+    def test_5(self):
+        """
+        log(x) can map to colors
+        """
+        s = scale.log(domain=[1, 100], range=["red", "blue"])
+        self.assertEqual(s(10), "#80007f")
+
+    def test_6(self):
+        """
+        log(x, out=out) maps arrays in place
+        """
+        s = scale.log(domain=[1, 100], range=[0, 200])
+        x = np.array([1, 10, 100.0])
+        out = np.zeros(3)
+        self.assertIs(s(x, out=out), out)
+        np.testing.assert_almost_equal(out, [0, 100, 200])
+        out = np.zeros(3, dtype=np.float32)
+        s.invert([0, 100, 200], out=out)
+        np.testing.assert_almost_equal(out, [1, 10, 100], decimal=4)
+
+    def test_7(self):
+        """
+        log.nice() nices the domain, extending it to powers of ten
+        """
+        self.assertEqual(scale.log(domain=[1.1, 10.9]).nice().domain, [1, 100])
+        self.assertEqual(scale.log(domain=[10.9, 1.1]).nice().domain, [100, 1])
+        self.assertEqual(scale.log(domain=[0.7, 11.001]).nice().domain, [0.1, 100])
+        self.assertEqual(scale.log(domain=[123.1, 6.7]).nice().domain, [1000, 1])
+        self.assertEqual(scale.log(domain=[0.01, 0.49]).nice().domain, [0.01, 1])
+        self.assertEqual(scale.log(domain=[1.5, 50]).nice().domain, [1, 100])
+        self.assertEqual(scale.log(domain=[-123.1, -1.1]).nice().domain, [-1000, -1])
+
+    def test_8(self):
+        """
+        log.nice() does not modify the original scale
+        """
+        s = scale.log(domain=[1.1, 10.9])
+        s.nice()
+        self.assertEqual(s.domain, [1.1, 10.9])
+
+    def test_9(self):
+        """
+        log.ticks() generates the expected power-of-ten ticks
+        """
+        s = scale.log(domain=[1e-1, 1e1])
+        np.testing.assert_almost_equal(
+            s.ticks(), [.1, .2, .3, .4, .5, .6, .7, .8, .9, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        s = scale.log(domain=[1e1, 1e-1])
+        np.testing.assert_almost_equal(
+            s.ticks(), [.1, .2, .3, .4, .5, .6, .7, .8, .9, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10][::-1])
+        s = scale.log(domain=[-1e-1, -1e1])
+        np.testing.assert_almost_equal(
+            s.ticks(), [-10, -9, -8, -7, -6, -5, -4, -3, -2, -1,
+                        -.9, -.8, -.7, -.6, -.5, -.4, -.3, -.2, -.1][::-1])
+        self.assertEqual(scale.log(domain=[1, 5]).ticks(), [1, 2, 3, 4, 5])
+
+    def test_10(self):
+        """
+        log.ticks() returns one tick per power when the domain is large
+        """
+        s = scale.log(domain=[1e-10, 1e10])
+        self.assertEqual(s.ticks(), [1e-10, 1e-8, 1e-6, 1e-4, 1e-2, 1, 1e2, 1e4, 1e6, 1e8, 1e10])
+        s = scale.log(domain=[1, 1024], base=2)
+        self.assertEqual(s.ticks(), [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024])
+
+    def test_11(self):
+        """
+        log.tick_format(count) returns a filtered "s" format
+        """
+        s = scale.log(domain=[1e-1, 1e1])
+        self.assertEqual(s.tick_format(10)(s.ticks()).tolist(),
+                         ["100m", "200m", "300m", "400m", "500m", "", "", "", "",
+                          "1", "2", "3", "4", "5", "", "", "", "", "10"])
+        self.assertEqual(s.tick_format(None)(0.7), "700m")
+        s = scale.log(domain=[1, 1024], base=2)
+        self.assertEqual(s.tick_format(10)(1024), "1,024")
+
+        
+if __name__ == "__main__":
+    unittest.main()
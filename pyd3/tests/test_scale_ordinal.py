@@ -0,0 +1,73 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_ordinal(unittest.TestCase):
+
+    def test_1(self):
+        """
+        ordinal() has the expected defaults
+        """
+        s = scale.ordinal()
+        self.assertEqual(s.domain, [])
+        self.assertEqual(s.range, [])
+        self.assertIs(s.unknown, scale.implicit)
+        self.assertEqual(s(0), None)
+
+    def test_2(self):
+        """
+        ordinal(x) maps a unique name x in the domain to the corresponding
+        value y in the range
+        """
+        s = scale.ordinal(domain=[0, 1], range=["foo", "bar"])
+        self.assertEqual(s(0), "foo")
+        self.assertEqual(s(1), "bar")
+        s = scale.ordinal(range=["a", "b", "c"])
+        self.assertEqual(s(0), "a")
+        self.assertEqual(s("0"), "b")
+        self.assertEqual(s([0]).tolist(), ["a"])
+
+    def test_3(self):
+        """
+        ordinal(x) implicitly extends the domain in order of appearance
+        """
+        s = scale.ordinal(range=["a", "b", "c"])
+        self.assertEqual(s(["y", "x", "z", "w", "y"]).tolist(), ["a", "b", "c", "a", "a"])
+        self.assertEqual(s.domain, ["y", "x", "z", "w"])
+
+    def test_4(self):
+        """
+        ordinal(x) returns the unknown value for unknown names
+        """
+        s = scale.ordinal(domain=["x", "y"], range=[1, 2], unknown=np.nan)
+        np.testing.assert_equal(s(["x", "q", "y"]), [1, np.nan, 2])
+        s = scale.ordinal(domain=["x", "y"], range=["r", "g"], unknown=None)
+        self.assertEqual(s(["x", "q", "y"]).tolist(), ["r", None, "g"])
+        self.assertEqual(s.domain, ["x", "y"])
+        self.assertEqual(s("q"), None)
+
+    def test_5(self):
+        """
+        ordinal(x) does not coerce mixed types
+        """
+        s = scale.ordinal(domain=[1, 2], range=["a", "b"])
+        self.assertEqual(s([2, "1"]).tolist(), ["b", "a"])
+        self.assertEqual(s.domain, [1, 2, "1"])
+
+    def test_6(self):
+        """
+        ordinal.copy() returns an independent copy
+        """
+        s1 = scale.ordinal(domain=[1, 2], range=["a", "b"])
+        s2 = s1.copy()
+        s2(3)
+        self.assertEqual(s1.domain, [1, 2])
+        self.assertEqual(s2.domain, [1, 2, 3])
+
+        
+if __name__ == "__main__":
+    unittest.main()
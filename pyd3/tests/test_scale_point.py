@@ -0,0 +1,43 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_point(unittest.TestCase):
+
+    def test_1(self):
+        """
+        point() has the expected defaults
+        """
+        s = scale.point()
+        self.assertEqual(s.domain, [])
+        self.assertEqual(s.range, [0, 1])
+        self.assertEqual(s.bandwidth, 0)
+        self.assertEqual(s.step, 1)
+        self.assertEqual(s.padding, 0)
+        self.assertEqual(s.align, 0.5)
+
+    def test_2(self):
+        """
+        point(value) computes discrete points in a continuous range
+        """
+        s = scale.point(domain=["a", "b", "c"], range=[0, 1])
+        np.testing.assert_almost_equal(s(["a", "b", "c"]), [0, 0.5, 1])
+        self.assertEqual(s.bandwidth, 0)
+        self.assertEqual(s.step, 0.5)
+
+    def test_3(self):
+        """
+        point.padding(p) sets the outer padding
+        """
+        s = scale.point(domain=["a", "b", "c"], range=[0, 1], padding=0.5)
+        np.testing.assert_almost_equal(s(["a", "b", "c"]), [1/6, 0.5, 5/6])
+        s.padding = 1
+        np.testing.assert_almost_equal(s(["a", "b", "c"]), [0.25, 0.5, 0.75])
+
+        
+if __name__ == "__main__":
+    unittest.main()
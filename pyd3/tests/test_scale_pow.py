@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_pow(unittest.TestCase):
+
+    def test_1(self):
+        """
+        pow() has the expected defaults
+        """
+        s = scale.pow()
+        self.assertEqual(s.domain, [0,1])
+        self.assertEqual(s.range, [0,1])
+        self.assertEqual(s.clamp, False)
+        self.assertEqual(s.exponent, 1)
+        self.assertEqual(s(0.5), 0.5)
+
+    def test_2(self):
+        """
+        pow(x) maps a domain value x to a range value y
+        """
+        s = scale.pow(exponent=0.5)
+        self.assertAlmostEqual(s(0.5), 0.7071068, delta=1e-6)
+        s = scale.pow(exponent=2)
+        self.assertEqual(s(0.5), 0.25)
+        np.testing.assert_almost_equal(s([-0.5, 2]), [-0.25, 4])
+
+    def test_3(self):
+        """
+        pow.invert(y) maps a range value y to a domain value x
+        """
+        s = scale.pow(exponent=2)
+        self.assertAlmostEqual(s.invert(0.25), 0.5, delta=1e-6)
+        np.testing.assert_almost_equal(s.invert([-0.25, 4]), [-0.5, 2])
+
+    def test_4(self):
+        """
+        pow.exponent(exponent) changes the exponent
+        """
+        s = scale.pow(domain=[1, 2])
+        s.exponent = 0.5
+        self.assertAlmostEqual(s(1.5), 0.5425821, delta=1e-6)
+        s.exponent = 2
+        self.assertAlmostEqual(s(1.5), 0.4166667, delta=1e-6)
+
+    def test_5(self):
+        """
+        pow.nice() and pow.ticks() operate on the untransformed domain
+        """
+        s = scale.pow(domain=[1.1, 10.9], exponent=2)
+        self.assertEqual(s.nice().domain, [1, 11])
+        self.assertEqual(s.domain, [1.1, 10.9])
+        np.testing.assert_almost_equal(scale.pow(exponent=2).ticks(5),
+                                       [0, 0.2, 0.4, 0.6, 0.8, 1])
+
+    def test_6(self):
+        """
+        sqrt() is a pow scale with exponent 0.5
+        """
+        s = scale.sqrt(domain=[0, 100], range=[0, 10])
+        self.assertEqual(s.exponent, 0.5)
+        self.assertEqual(s(25), 5)
+        self.assertEqual(s.invert(5), 25)
+        y = s(np.array([4, 16], dtype=np.float32))
+        self.assertEqual(y.dtype, np.float32)
+        np.testing.assert_almost_equal(y, [2, 4])
+
+        
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_quantile(unittest.TestCase):
+
+    def test_1(self):
+        """
+        quantile() has the expected defaults
+        """
+        s = scale.quantile()
+        self.assertEqual(s.domain, [])
+        self.assertEqual(s.range, [])
+
+    def test_2(self):
+        """
+        quantile(x) uses the R-7 algorithm to compute quantiles
+        """
+        s = scale.quantile(domain=[3, 6, 7, 8, 8, 10, 13, 15, 16, 20], range=[0, 1, 2, 3])
+        self.assertEqual(s.quantiles(), [7.25, 9, 14.5])
+        self.assertEqual(s([3, 6, 6.9, 7, 7.1]).tolist(), [0, 0, 0, 0, 0])
+        self.assertEqual(s([8, 8.9]).tolist(), [1, 1])
+        self.assertEqual(s([9, 9.1, 10, 13]).tolist(), [2, 2, 2, 2])
+        self.assertEqual(s([14.9, 15, 15.1, 16, 20]).tolist(), [3, 3, 3, 3, 3])
+
+    def test_3(self):
+        """
+        quantile.domain() values are sorted and NaN are ignored
+        """
+        s = scale.quantile(domain=[6, 3, np.nan, 7, 8, 8, 13, 20, 15, 16, 10])
+        self.assertEqual(s.domain, [3, 6, 7, 8, 8, 10, 13, 15, 16, 20])
+
+    def test_4(self):
+        """
+        quantile.invert_extent(y) maps a value in the range to a domain extent
+        """
+        s = scale.quantile(domain=[3, 6, 7, 8, 8, 10, 13, 15, 16, 20], range=["a", "b", "c", "d"])
+        self.assertEqual(s.invert_extent("a"), [3, 7.25])
+        self.assertEqual(s.invert_extent("b"), [7.25, 9])
+        self.assertEqual(s.invert_extent("c"), [9, 14.5])
+        self.assertEqual(s.invert_extent("d"), [14.5, 20])
+        np.testing.assert_equal(s.invert_extent(["d", "a", "e"]),
+                                [[14.5, 20], [3, 7.25], [np.nan, np.nan]])
+
+    def test_5(self):
+        """
+        streaming_quantile.partial_fit(values) builds the scale incrementally
+        """
+        s = scale.streaming_quantile(range=[0, 1, 2, 3])
+        s.partial_fit([3, 6, 7, 8, 8]).partial_fit([10, 13, 15, 16, 20, np.nan])
+        self.assertEqual(s.domain, [3, 20])
+        self.assertEqual(s.quantiles(), [7.25, 9, 14.5])
+        self.assertEqual(s([3, 8, 9, 20]).tolist(), [0, 1, 2, 3])
+        self.assertEqual(s.invert_extent(0), [3, 7.25])
+
+    def test_6(self):
+        """
+        streaming_quantile.merge(other) merges scales fed by different workers
+        """
+        values = np.random.default_rng(0).random(100000)
+        a = scale.streaming_quantile(range=[0, 1, 2, 3])
+        b = scale.streaming_quantile(range=[0, 1, 2, 3])
+        for chunk in np.array_split(values[:50000], 10):
+            a.partial_fit(chunk)
+        for chunk in np.array_split(values[50000:], 10):
+            b.partial_fit(chunk)
+        a.merge(b)
+        self.assertEqual(a.sketch.count, len(values))
+        np.testing.assert_allclose(a.quantiles(), [0.25, 0.5, 0.75], atol=0.02)
+
+    def test_7(self):
+        """
+        quantile(x) returns unknown for NaN inputs and an empty range
+        """
+        s = scale.quantile([3, 6, 7, 8, 8, 10, 13, 15, 16, 20], ["a", "b", "c", "d"])
+        self.assertEqual(s(np.nan), None)
+        self.assertEqual(s([3, np.nan, 20]).tolist(), ["a", None, "d"])
+        s.unknown = "?"
+        self.assertEqual(s(np.nan), "?")
+        self.assertEqual(s([3, np.nan]).tolist(), ["a", "?"])
+        self.assertEqual(s.copy().unknown, "?")
+        s = scale.quantile([1, 2, 3])
+        self.assertEqual(s(2), None)
+        self.assertEqual(s([1, 2]).tolist(), [None, None])
+        s = scale.quantile([1, 2, 3], [0, 1], unknown=np.nan)
+        self.assertEqual(s([1, np.nan, 3], out=np.empty(3)).tolist()[::2], [0, 1])
+        self.assertTrue(np.isnan(s([np.nan])[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_quantize(unittest.TestCase):
+
+    def test_1(self):
+        """
+        quantize() has the expected defaults
+        """
+        s = scale.quantize()
+        self.assertEqual(s.domain, [0, 1])
+        self.assertEqual(s.range, [0, 1])
+        self.assertEqual(s.thresholds(), [0.5])
+        self.assertEqual(s(0.25), 0)
+        self.assertEqual(s(0.75), 1)
+
+    def test_2(self):
+        """
+        quantize(value) maps a number to a discrete value in the range
+        """
+        s = scale.quantize(range=[0, 1, 2])
+        self.assertEqual(s.thresholds(), [1/3, 2/3])
+        self.assertEqual(s(0.0), 0)
+        self.assertEqual(s(0.2), 0)
+        self.assertEqual(s(0.4), 1)
+        self.assertEqual(s(0.6), 1)
+        self.assertEqual(s(0.8), 2)
+        self.assertEqual(s(1.0), 2)
+
+    def test_3(self):
+        """
+        quantize(values) maps arrays with a single search
+        """
+        s = scale.quantize(domain=[10, 100], range=[1, 2, 4])
+        self.assertEqual(s([20, 50, 80]).tolist(), [1, 2, 4])
+        s = scale.quantize(range=["a", "b", "c"])
+        self.assertEqual(s(np.array([[0.1, 0.5], [0.9, -1]])).tolist(),
+                         [["a", "b"], ["c", "a"]])
+        out = np.zeros(3, dtype=int)
+        self.assertIs(scale.quantize(range=[0, 1, 2])([0, .5, 1], out=out), out)
+        self.assertEqual(out.tolist(), [0, 1, 2])
+
+    def test_4(self):
+        """
+        quantize.invert_extent(y) maps a value in the range to a domain extent
+        """
+        s = scale.quantize(domain=[0, 1], range=[1, 2, 3, 4])
+        self.assertEqual(s.invert_extent(1), [0.00, 0.25])
+        self.assertEqual(s.invert_extent(2), [0.25, 0.50])
+        self.assertEqual(s.invert_extent(3), [0.50, 0.75])
+        self.assertEqual(s.invert_extent(4), [0.75, 1.00])
+        np.testing.assert_equal(s.invert_extent(-1), [np.nan, np.nan])
+        np.testing.assert_equal(s.invert_extent([4, 1, 5]),
+                                [[0.75, 1.00], [0.00, 0.25], [np.nan, np.nan]])
+
+    def test_5(self):
+        """
+        quantize.nice() and quantize.ticks() operate on the domain
+        """
+        s = scale.quantize(domain=[0.1, 0.96])
+        self.assertEqual(s.nice().domain, [0.1, 1])
+        self.assertEqual(s.domain, [0.1, 0.96])
+        np.testing.assert_almost_equal(scale.quantize().ticks(5),
+                                       [0, 0.2, 0.4, 0.6, 0.8, 1])
+
+    def test_6(self):
+        """
+        quantize(x) returns unknown for NaN inputs
+        """
+        s = scale.quantize([0, 1], ["a", "b"])
+        self.assertEqual(s(np.nan), None)
+        self.assertEqual(s([0, np.nan, 1]).tolist(), ["a", None, "b"])
+        s = scale.quantize([0, 1], [0, 1], unknown=-1)
+        self.assertEqual(s([0, np.nan, 1]).tolist(), [0, -1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import interpolate
+
+class test_scale_sequential(unittest.TestCase):
+
+    def test_1(self):
+        """
+        sequential() has the expected defaults
+        """
+        s = scale.sequential()
+        self.assertEqual(s.domain, [0,1])
+        self.assertEqual(s.resolution, 256)
+        self.assertEqual(s(0), 0)
+        self.assertEqual(s(1), 1)
+        self.assertAlmostEqual(s(0.5), 0.5, delta=1/255)
+
+    def test_2(self):
+        """
+        sequential(x) maps values to colors of the interpolator
+        """
+        s = scale.sequential(interpolate.rgb("white", "steelblue"), [0, 100])
+        self.assertEqual(s(0), "#ffffff")
+        self.assertEqual(s(100), "#4682b4")
+        self.assertEqual(s([-10, 200]).tolist(), ["#ffffff", "#4682b4"])
+        self.assertEqual(s(np.zeros((2,3))).shape, (2,3))
+
+    def test_3(self):
+        """
+        sequential.rgba(x) returns uint8 colors, into out when given
+        """
+        s = scale.sequential(interpolate.rgb("black", "red"), [0, 10])
+        np.testing.assert_array_equal(s.rgba([0, 10]), [[0,0,0,255], [255,0,0,255]])
+        out = np.empty((2,4), dtype=np.uint8)
+        self.assertIs(s.rgba([0, 10], out=out), out)
+        self.assertRaises(ValueError, scale.sequential().rgba, 0.5)
+
+    def test_4(self):
+        """
+        sequential(NaN) returns none
+        """
+        s = scale.sequential(interpolate.rgb("black", "red"))
+        self.assertEqual(s(np.nan), "none")
+        np.testing.assert_array_equal(s.rgba([np.nan]), [[0,0,0,0]])
+
+    def test_5(self):
+        """
+        sequential.domain and sequential.interpolator can be changed
+        """
+        s = scale.sequential(interpolate.rgb("black", "red"))
+        s.domain = [1, 0]
+        self.assertEqual(s(0), "#ff0000")
+        s.interpolator = interpolate.rgb("black", "blue")
+        self.assertEqual(s(0), "#0000ff")
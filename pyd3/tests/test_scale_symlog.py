@@ -0,0 +1,57 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_symlog(unittest.TestCase):
+
+    def test_1(self):
+        """
+        symlog() has the expected defaults
+        """
+        s = scale.symlog()
+        self.assertEqual(s.domain, [0,1])
+        self.assertEqual(s.range, [0,1])
+        self.assertEqual(s.clamp, False)
+        self.assertEqual(s.constant, 1)
+
+    def test_2(self):
+        """
+        symlog(x) maps a domain value x to a range value y
+        """
+        s = scale.symlog(domain=[-100, 100], range=[-1, 1])
+        self.assertEqual(s(0), 0)
+        self.assertEqual(s(100), 1)
+        self.assertAlmostEqual(s(-50), -0.8519443, delta=1e-6)
+        np.testing.assert_almost_equal(s([-100, 0, 100]), [-1, 0, 1])
+
+    def test_3(self):
+        """
+        symlog.invert(y) maps a range value y to a domain value x
+        """
+        s = scale.symlog(domain=[-100, 100], range=[-1, 1])
+        self.assertAlmostEqual(s.invert(-0.8519443), -50, delta=1e-4)
+        np.testing.assert_almost_equal(s.invert(s([-20, 3, 70])), [-20, 3, 70])
+
+    def test_4(self):
+        """
+        symlog.constant(constant) changes the constant
+        """
+        s = scale.symlog(domain=[-10, 10], range=[-1, 1])
+        s.constant = 5
+        self.assertEqual(s.constant, 5)
+        self.assertAlmostEqual(s(2), 0.3062702, delta=1e-6)
+
+    def test_5(self):
+        """
+        symlog.nice() nices the untransformed domain
+        """
+        s = scale.symlog(domain=[-0.1, 51.1])
+        self.assertEqual(s.nice(8).domain, [-10, 60])
+
+        
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_threshold(unittest.TestCase):
+
+    def test_1(self):
+        """
+        threshold() has the expected defaults
+        """
+        s = scale.threshold()
+        self.assertEqual(s.domain, [0.5])
+        self.assertEqual(s.range, [0, 1])
+        self.assertEqual(s(0.50), 1)
+        self.assertEqual(s(0.49), 0)
+
+    def test_2(self):
+        """
+        threshold(x) maps a number to a discrete value in the range
+        """
+        s = scale.threshold(domain=[1/3, 2/3], range=["a", "b", "c"])
+        self.assertEqual(s(0), "a")
+        self.assertEqual(s(0.2), "a")
+        self.assertEqual(s(0.4), "b")
+        self.assertEqual(s(0.6), "b")
+        self.assertEqual(s(0.8), "c")
+        self.assertEqual(s(1), "c")
+        self.assertEqual(s([0, 0.4, 1]).tolist(), ["a", "b", "c"])
+
+    def test_3(self):
+        """
+        threshold(x) supports arbitrary orderable values
+        """
+        s = scale.threshold(domain=["10", "2"], range=[0, 1, 2])
+        self.assertEqual(s("0"), 0)
+        self.assertEqual(s("12"), 1)
+        self.assertEqual(s("3"), 2)
+
+    def test_4(self):
+        """
+        threshold(x) ignores extra range values
+        """
+        s = scale.threshold(domain=[1/3, 2/3], range=["a", "b", "c", "d"])
+        self.assertEqual(s([0, 0.5, 1]).tolist(), ["a", "b", "c"])
+
+    def test_5(self):
+        """
+        threshold.invert_extent(y) returns the domain extent for the
+        specified range value
+        """
+        s = scale.threshold(domain=[1, 2], range=["a", "b", "c"])
+        np.testing.assert_equal(s.invert_extent("a"), [np.nan, 1])
+        self.assertEqual(s.invert_extent("b"), [1, 2])
+        np.testing.assert_equal(s.invert_extent("c"), [2, np.nan])
+        np.testing.assert_equal(s.invert_extent(["b", "d"]), [[1, 2], [np.nan, np.nan]])
+        s = scale.threshold(domain=["10", "2"], range=[0, 1, 2])
+        self.assertEqual(s.invert_extent(0), [None, "10"])
+
+    def test_6(self):
+        """
+        threshold(x) returns unknown for NaN inputs
+        """
+        s = scale.threshold([0, 1], ["a", "b", "c"])
+        self.assertEqual(s(np.nan), None)
+        self.assertEqual(s([-1, np.nan, 2]).tolist(), ["a", None, "c"])
+        self.assertEqual(s.copy()(np.nan), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
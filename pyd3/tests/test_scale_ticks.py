@@ -0,0 +1,56 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+
+class test_scale_ticks(unittest.TestCase):
+
+    def test_1(self):
+        """
+        tick_steps(starts, stops, count) returns the tick_step of each domain
+        """
+        starts, stops = [0, 10, 0, -3.7], [1, 0, 96, 12.2]
+        steps = scale.tick_steps(starts, stops, 10)
+        self.assertEqual(steps.tolist(),
+                         [scale.tick_step(a, b, 10) for a, b in zip(starts, stops)])
+        self.assertTrue(np.isnan(scale.tick_steps(1, 1, 10)))
+
+    def test_2(self):
+        """
+        ticks_many(starts, stops, count) returns ragged ticks of each domain
+        """
+        starts, stops = [0, 10, -0.4, 1e6], [1, 0, 0.7, 1e6 + 12]
+        values, offsets = scale.ticks_many(starts, stops, 5)
+        self.assertEqual(len(offsets), 5)
+        for i, (start, stop) in enumerate(zip(starts, stops)):
+            self.assertEqual(values[offsets[i]:offsets[i+1]].tolist(),
+                             scale.ticks(start, stop, 5))
+
+    def test_3(self):
+        """
+        ticks_many(starts, stops, count) matches ticks for random domains
+        """
+        generator = np.random.default_rng(1)
+        starts = generator.normal(0, 10**generator.uniform(-3, 6, 500))
+        stops = starts + generator.normal(0, 10**generator.uniform(-3, 6, 500))
+        values, offsets = scale.ticks_many(starts, stops, 10)
+        for i in range(len(starts)):
+            self.assertEqual(values[offsets[i]:offsets[i+1]].tolist(),
+                             scale.ticks(starts[i], stops[i], 10))
+
+    def test_4(self):
+        """
+        ticks_many(starts, stops, count) handles degenerate domains
+        """
+        values, offsets = scale.ticks_many([5, np.nan, 0], [5, 1, np.inf], 10)
+        self.assertEqual(values.tolist(), [5])
+        self.assertEqual(offsets.tolist(), [0, 1, 1, 1])
+        values, offsets = scale.ticks_many([], [], 10)
+        self.assertEqual(offsets.tolist(), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
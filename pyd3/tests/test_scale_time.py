@@ -0,0 +1,103 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import scale
+from pyd3 import time
+
+D = np.datetime64
+
+class test_scale_time(unittest.TestCase):
+
+    def test_1(self):
+        """
+        time() has the expected defaults
+        """
+        s = scale.time()
+        self.assertEqual(s.domain, [D("2000-01-01"), D("2000-01-02")])
+        self.assertEqual(s.range, [0,1])
+        self.assertEqual(s.clamp, False)
+        self.assertEqual(s(D("2000-01-01T12:00")), 0.5)
+
+    def test_2(self):
+        """
+        time(date) maps dates (scalar or array) to the range
+        """
+        s = scale.time(["2000-01-01", "2000-01-02"], [0, 960])
+        self.assertEqual(s(D("2000-01-01T05:00")), 200)
+        dates = np.array(["2000-01-01T12", "2000-01-01T18"], dtype="datetime64[h]")
+        np.testing.assert_array_equal(s(dates), [480, 720])
+
+    def test_3(self):
+        """
+        time.invert(y) maps a range value y to a date
+        """
+        s = scale.time(["2000-01-01", "2000-01-02"], [0, 960])
+        self.assertEqual(s.invert(200), D("2000-01-01T05:00"))
+        out = np.empty(2, dtype="datetime64[ms]")
+        s.invert([0, 480], out=out)
+        np.testing.assert_array_equal(out, np.array(["2000-01-01", "2000-01-01T12"],
+                                                    dtype="datetime64[ms]"))
+
+    def test_4(self):
+        """
+        time is exact for nanosecond dates
+        """
+        s = scale.time(["2000-01-01T00:00:00.000000001",
+                        "2000-01-01T00:00:00.000000009"], [0, 8])
+        self.assertEqual(s(D("2000-01-01T00:00:00.000000005")), 4)
+        self.assertEqual(s.invert(2), D("2000-01-01T00:00:00.000000003"))
+
+    def test_5(self):
+        """
+        time.ticks(count) uses calendar intervals
+        """
+        s = scale.time(["2000-01-01", "2000-01-02"])
+        self.assertEqual(s.ticks(4), [D("2000-01-01T00"), D("2000-01-01T06"),
+                                      D("2000-01-01T12"), D("2000-01-01T18"),
+                                      D("2000-01-02T00")])
+        s = scale.time(["2000-01-01", "2010-06-01"])
+        self.assertEqual(s.ticks(5), [D("%d-01-01" % y) for y in range(2000, 2011, 2)])
+        s = scale.time(["2000-01-01T00:00:00.000", "2000-01-01T00:00:00.010"])
+        self.assertEqual(len(s.ticks(5)), 6)
+
+    def test_6(self):
+        """
+        time.ticks(interval) uses the given interval
+        """
+        s = scale.time(["2000-01-01", "2000-04-15"])
+        self.assertEqual(s.ticks(time.month), [D("2000-01"), D("2000-02"),
+                                               D("2000-03"), D("2000-04")])
+        s = scale.time(["2000-04-15", "2000-01-01"])
+        self.assertEqual(s.ticks(time.month.every(3)), [D("2000-04"), D("2000-01")])
+
+    def test_7(self):
+        """
+        time.nice() extends the domain to calendar boundaries
+        """
+        s = scale.time(["2000-01-01T00:17", "2000-01-01T23:42"]).nice()
+        self.assertEqual(s.domain, [D("2000-01-01"), D("2000-01-02")])
+        s = scale.time(["2000-01-05T10:12", "2000-02-03"]).nice(time.month)
+        self.assertEqual(s.domain, [D("2000-01-01"), D("2000-03-01")])
+
+    def test_8(self):
+        """
+        time.invert(pixels) is exact in nanoseconds over long domains
+        """
+        start = np.datetime64("2000-01-01T00:00:00.000000001")
+        step = np.timedelta64(123456789012345677, "ns") // 1000
+        s = scale.time([start, start + 1000 * step], [0, 1000])
+        pixels = np.arange(0, 1001)
+        dates = start + pixels * step
+        self.assertEqual(s.invert(pixels).tolist(), dates.tolist())
+        self.assertEqual(s.invert(np.int64(333)), start + 333 * step)
+        s = scale.time([start, start + 1000 * step], [960, 0], clamp=True)
+        self.assertEqual(s.invert([960, 0, -5]).tolist(),
+                         np.array([start, start + 1000 * step, start + 1000 * step]).tolist())
+
+        # Float positions have a relative precision of 2**-53 of the span
+        s = scale.time([start, start + 1000 * step], [0, 1000])
+        error = s.invert(pixels.astype(float)) - dates
+        self.assertTrue(np.all(np.abs(error.astype(np.int64)) <= 1000 * step.astype(np.int64) * 2.0**-52))
@@ -0,0 +1,73 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import shape
+
+points = [[0, 1], [1, 3], [2, 1], [3, 3]]
+
+class test_shape(unittest.TestCase):
+
+    def test_1(self):
+        """
+        line(x, y) generates a polyline with numbers rounded to 3 digits
+        """
+        l = shape.line()
+        self.assertEqual(l.curve, shape.curve_linear)
+        self.assertEqual(l.digits, 3)
+        self.assertEqual(l([0, 1, 2], [1, 3, 2]), "M0,1L1,3L2,2")
+        self.assertEqual(l(points), "M0,1L1,3L2,1L3,3")
+        self.assertEqual(l([0.1234, -1e-6, -1.23456], [100.5, 2/3, 1e6]),
+                         "M0.123,100.5L0,0.667L-1.235,1000000")
+        self.assertEqual(shape.line(digits=None)([0.1, 1/3], [2, 3]),
+                         "M0.1,2L0.3333333333333333,3")
+        self.assertEqual(l([], []), None)
+
+    def test_2(self):
+        """
+        line(x, y) splits undefined points and closes single points
+        """
+        l = shape.line()
+        self.assertEqual(l([0, 1, np.nan, 3], [0, 1, 2, 3]), "M0,0L1,1M3,3Z")
+        self.assertEqual(l([0, 1, 2, 3], [0, 1, 2, 3], defined=[1, 1, 0, 1]), "M0,0L1,1M3,3Z")
+
+    def test_3(self):
+        """
+        line(x, y) supports step curves
+        """
+        self.assertEqual(shape.line(curve=shape.curve_step)(points),
+                         "M0,1L0.5,1L0.5,3L1.5,3L1.5,1L2.5,1L2.5,3L3,3")
+        self.assertEqual(shape.line(curve=shape.curve_step_before)(points),
+                         "M0,1L0,3L1,3L1,1L2,1L2,3L3,3")
+        self.assertEqual(shape.line(curve=shape.curve_step_after)(points),
+                         "M0,1L1,1L1,3L2,3L2,1L3,1L3,3")
+
+    def test_4(self):
+        """
+        line(x, y) supports basis, cardinal and monotoneX curves
+        """
+        l = shape.line(digits=6)
+        l.curve = shape.curve_basis
+        self.assertEqual(l(points), "M0,1L0.166667,1.333333C0.333333,1.666667,0.666667,2.333333,1,2.333333"
+                                    "C1.333333,2.333333,1.666667,1.666667,2,1.666667"
+                                    "C2.333333,1.666667,2.666667,2.333333,2.833333,2.666667L3,3")
+        l.curve = shape.curve_cardinal
+        self.assertEqual(l(points), "M0,1C0,1,0.666667,3,1,3C1.333333,3,1.666667,1,2,1C2.333333,1,3,3,3,3")
+        l.curve = shape.curve_cardinal.tension(0.5)
+        self.assertEqual(l(points), "M0,1C0,1,0.833333,3,1,3C1.166667,3,1.833333,1,2,1C2.166667,1,3,3,3,3")
+        l.curve = shape.curve_monotone_x
+        self.assertEqual(l(points), "M0,1C0.333333,2,0.666667,3,1,3C1.333333,3,1.666667,1,2,1C2.333333,1,2.666667,2,3,3")
+        self.assertEqual(l(points[:2]), "M0,1L1,3")
+
+    def test_5(self):
+        """
+        area(x, y1, y0) generates a closed area
+        """
+        a = shape.area()
+        self.assertEqual(a([0, 1, 2], [3, 4, 5]), "M0,3L1,4L2,5L2,0L1,0L0,0Z")
+        self.assertEqual(a([0, 1, 2], [3, 4, 5], y0=[1, 2, 3]), "M0,3L1,4L2,5L2,3L1,2L0,1Z")
+        self.assertEqual(a([0, 1, np.nan, 3], [3, 4, 5, 6]), "M0,3L1,4L1,0L0,0ZM3,6L3,0Z")
+        a.curve = shape.curve_step_after
+        self.assertEqual(a([0, 1, 2], [3, 4, 5]), "M0,3L1,3L1,4L2,4L2,5L2,0L2,0L1,0L1,0L0,0Z")
@@ -0,0 +1,51 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3.sketch import QuantileSketch
+
+class test_sketch(unittest.TestCase):
+
+    def test_1(self):
+        """
+        QuantileSketch.quantile(p) is exact for small streams
+        """
+        values = [3, 6, 7, 8, 8, 10, 13, 15, 16, 20]
+        s = QuantileSketch().update(values[:4]).update(values[4:] + [np.nan])
+        self.assertEqual(s.count, 10)
+        np.testing.assert_almost_equal(s.quantile([0, 0.25, 0.5, 0.75, 1]),
+                                       np.quantile(values, [0, 0.25, 0.5, 0.75, 1]))
+
+    def test_2(self):
+        """
+        QuantileSketch uses bounded memory and has a bounded rank error
+        """
+        values = np.random.default_rng(1).normal(size=1000000)
+        s = QuantileSketch(k=200, seed=1)
+        for chunk in np.array_split(values, 10):
+            s.update(chunk)
+        self.assertEqual(s.count, len(values))
+        self.assertLess(s.size, 3*200)
+        self.assertEqual(s.min, values.min())
+        self.assertEqual(s.max, values.max())
+        p = np.array([0.01, 0.1, 0.5, 0.9, 0.99])
+        rank = np.searchsorted(np.sort(values), s.quantile(p)) / len(values)
+        self.assertLess(np.abs(rank - p).max(), 0.02)
+
+    def test_3(self):
+        """
+        QuantileSketch.merge(other) summarizes the union of both streams
+        """
+        values = np.random.default_rng(2).random(200000)
+        a = QuantileSketch(seed=1).update(values[:50000])
+        b = QuantileSketch(seed=2).update(values[50000:])
+        a.merge(b)
+        self.assertEqual(a.count, len(values))
+        np.testing.assert_allclose(a.quantile([0.25, 0.5, 0.75]), [0.25, 0.5, 0.75], atol=0.02)
+        np.testing.assert_allclose(a.cdf([0.25, 0.5, 0.75]), [0.25, 0.5, 0.75], atol=0.02)
+
+        
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+import unittest
+import numpy as np
+from pyd3 import time
+
+D = np.datetime64
+
+class test_time(unittest.TestCase):
+
+    def test_1(self):
+        """
+        interval.floor(date) returns the previous interval boundary
+        """
+        self.assertEqual(time.day.floor(D("2000-01-05T10:12")), D("2000-01-05"))
+        self.assertEqual(time.month.floor(D("2000-02-29")), D("2000-02-01"))
+        self.assertEqual(time.year.floor(D("2011-12-31T23:59")), D("2011-01-01"))
+        self.assertEqual(time.week.floor(D("2016-09-21")), D("2016-09-18"))
+
+    def test_2(self):
+        """
+        interval.ceil(date) returns the next interval boundary
+        """
+        self.assertEqual(time.month.ceil(D("2000-01-05")), D("2000-02-01"))
+        self.assertEqual(time.month.ceil(D("2000-02-01")), D("2000-02-01"))
+        self.assertEqual(time.hour.ceil(D("2000-01-01T10:00:01")), D("2000-01-01T11"))
+
+    def test_3(self):
+        """
+        interval.floor(dates) and interval.ceil(dates) are vectorized
+        """
+        dates = np.array(["2000-01-01T10:30", "2000-01-02T00:00"], dtype="datetime64[m]")
+        np.testing.assert_array_equal(time.day.floor(dates),
+                np.array(["2000-01-01", "2000-01-02"], dtype="datetime64[D]"))
+        np.testing.assert_array_equal(time.day.ceil(dates),
+                np.array(["2000-01-02", "2000-01-02"], dtype="datetime64[D]"))
+
+    def test_4(self):
+        """
+        interval.every(step) is aligned on the parent interval
+        """
+        r = time.minute.every(15).range(D("2000-01-01T10:05"), D("2000-01-01T11:00"))
+        self.assertEqual(list(r), [D("2000-01-01T10:15"), D("2000-01-01T10:30"),
+                                   D("2000-01-01T10:45")])
+        r = time.day.every(2).range(D("2000-01-28"), D("2000-02-04"))
+        self.assertEqual(list(r), [D("2000-01-29"), D("2000-01-31"),
+                                   D("2000-02-01"), D("2000-02-03")])
+
+    def test_5(self):
+        """
+        interval.range(start, stop) excludes stop and respects the calendar
+        """
+        r = time.month.range(D("2000-01-15"), D("2000-04-01"))
+        self.assertEqual(list(r), [D("2000-02-01"), D("2000-03-01")])
+        self.assertEqual(len(time.day.range(D("2000-02-01"), D("2000-03-01"))), 29)
+
+    def test_6(self):
+        """
+        interval.offset(date, step) and interval.count(start, end)
+        """
+        self.assertEqual(time.month.offset(D("2000-01"), 14), D("2001-03"))
+        self.assertEqual(time.week.offset(D("2000-01-01"), 2), D("2000-01-15"))
+        self.assertEqual(time.day.count(D("2000-01-01"), D("2000-12-31")), 365)
+        self.assertEqual(time.sunday.count(D("2016-01-01"), D("2016-12-31")), 52)
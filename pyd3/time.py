@@ -0,0 +1,206 @@
+# -----------------------------------------------------------------------------
+# Copyright (c) 2016, Nicolas P. Rougier. All rights reserved.
+# Distributed under the terms of the new BSD License.
+# -----------------------------------------------------------------------------
+"""
+This is a python translation of the `d3-time
+<https://github.com/d3/d3-time>`_ javascript module, operating on numpy
+datetime64 values (scalars or arrays).
+
+When visualizing time series data, analyzing temporal patterns, or working
+with time in general, the irregularities of conventional time units quickly
+become apparent. In the Gregorian calendar, for example, most months have 31
+days but some have 28, 29 or 30 days; most years have 365 days but leap years
+have 366. This module provides time intervals that respect these calendar
+rules. For example::
+
+   time.day.floor(np.datetime64("2000-01-05T10:12"))  # 2000-01-05T00:00
+   time.month.ceil(np.datetime64("2000-01-05"))       # 2000-02-01
+   time.hour.every(6).range(np.datetime64("2000-01-01"),
+                            np.datetime64("2000-01-02"))
+   # 2000-01-01T00, 2000-01-01T06, 2000-01-01T12, 2000-01-01T18
+
+Since numpy datetime64 values carry no time zone, all intervals follow the
+UTC calendar (local and UTC intervals are the same). Every operation is
+vectorized and works in exact integer arithmetic.
+"""
+import numpy as np
+
+
+# Weekday (Sunday = 0) of the numpy epoch (1970-01-01 is a Thursday)
+_epoch_weekday = 4
+
+
+def _unit(dtype):
+    return np.datetime_data(dtype)[0]
+
+
+def _asdatetime(date):
+    date = np.asarray(date)
+    if date.dtype.kind != 'M':
+        date = date.astype('datetime64')
+    return date
+
+
+class Interval(object):
+    """
+    A time interval represents a conventional unit of time (second, minute,
+    day, month, ...) optionally restricted to every step-th unit. Results of
+    interval methods have the finest of the input unit and the interval unit.
+    """
+
+    def __init__(self, unit, step=1):
+        self._unit = unit
+        self._step = int(step)
+
+    def __repr__(self):
+        if self._step == 1:
+            return "Interval(%r)" % self._unit
+        return "Interval(%r, %d)" % (self._unit, self._step)
+
+    @property
+    def unit(self):
+        """ numpy datetime64 unit of the interval ('W' for weeks) """
+        return self._unit
+
+    @property
+    def step(self):
+        """ Number of units between dates of the interval """
+        return self._step
+
+    def every(self, step):
+        """
+        Returns a filtered view of this interval representing every
+        step-th date. The meaning of step is dependent on this interval’s
+        parent interval as defined by the field function. For example,
+        minute.every(15) returns an interval representing every fifteen
+        minutes, starting on the hour: :00, :15, :30, :45, etc.;
+        day.every(2) represents every other day of the month.
+        """
+        return Interval(self._unit, step)
+
+    def _dtype(self, date):
+        unit = 'D' if self._unit == 'W' else self._unit
+        return np.result_type(date.dtype, np.dtype('datetime64[%s]' % unit))
+
+    def _counts(self, date):
+        """
+        Number of (whole) units since the epoch of each date, floored.
+        """
+        if self._unit == 'W':
+            days = date.astype('datetime64[D]').view(np.int64)
+            return (days + _epoch_weekday) // 7
+        return date.astype('datetime64[%s]' % self._unit).view(np.int64)
+
+    def _dates(self, counts, dtype):
+        """
+        Dates corresponding to the given counts of units since the epoch.
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        if self._unit == 'W':
+            days = counts * 7 - _epoch_weekday
+            return days.view('datetime64[D]').astype(dtype)
+        return counts.view('datetime64[%s]' % self._unit).astype(dtype)
+
+    def _field(self, counts):
+        """
+        Alignment field of dates given as unit counts (e.g. the day of the
+        month for days or the month of the year for months).
+        """
+        if self._unit == 'D':
+            days = counts.view('datetime64[D]')
+            months = days.astype('datetime64[M]').astype('datetime64[D]')
+            return (days - months).view(np.int64)
+        elif self._unit == 'M':
+            return counts % 12
+        elif self._unit == 'Y':
+            return counts + 1970
+        return counts
+
+    def _floor_counts(self, counts):
+        if self._step == 1:
+            return counts
+        return counts - self._field(counts) % self._step
+
+    def floor(self, date):
+        """
+        Returns the latest interval boundary date before or equal to date.
+        """
+        date = _asdatetime(date)
+        counts = self._floor_counts(self._counts(date))
+        return self._dates(counts, self._dtype(date))[()]
+
+    def ceil(self, date):
+        """
+        Returns the earliest interval boundary date after or equal to date.
+        """
+        date = _asdatetime(date)
+        dtype = self._dtype(date)
+        counts = self._floor_counts(self._counts(date))
+        after = self._dates(counts, dtype) < date
+        counts = np.where(after, self._floor_counts(counts + self._step), counts)
+        return self._dates(counts, dtype)[()]
+
+    def round(self, date):
+        """
+        Returns the interval boundary date closest to date (ceil on ties).
+        """
+        date = _asdatetime(date)
+        lower, upper = self.floor(date), self.ceil(date)
+        return np.where(date - lower < upper - date, lower, upper)[()]
+
+    def offset(self, date, step=1):
+        """
+        Returns date plus step units of the interval (the step of an every
+        interval is ignored, as in d3).
+        """
+        date = _asdatetime(date)
+        if self._unit == 'W':
+            return (date + np.timedelta64(7*int(step), 'D'))[()]
+        return (date + np.timedelta64(int(step), self._unit))[()]
+
+    def range(self, start, stop):
+        """
+        Returns an array of dates representing every interval boundary after
+        or equal to start (inclusive) and before stop (exclusive).
+        """
+        start, stop = _asdatetime(start), _asdatetime(stop)
+        dtype = np.result_type(self._dtype(start), self._dtype(stop))
+        first = self._counts(self.ceil(start))
+        last = self._counts(stop)
+        counts = np.arange(first, last + 1, dtype=np.int64)
+        if self._step > 1:
+            counts = counts[self._field(counts) % self._step == 0]
+        dates = self._dates(counts, dtype)
+        return dates[dates < stop]
+
+    def count(self, start, end):
+        """
+        Returns the number of interval boundaries after start (exclusive) and
+        before or equal to end (inclusive).
+        """
+        start, end = _asdatetime(start), _asdatetime(end)
+        dtype = np.result_type(self._dtype(start), self._dtype(end))
+        tick = np.timedelta64(1, _unit(dtype))
+        return len(self.range(start.astype(dtype) + tick, end.astype(dtype) + tick))
+
+
+millisecond = Interval('ms')
+second      = Interval('s')
+minute      = Interval('m')
+hour        = Interval('h')
+day         = Interval('D')
+week        = Interval('W')
+month       = Interval('M')
+year        = Interval('Y')
+sunday      = week
+
+# numpy datetime64 values are naive: UTC intervals are the same
+utc_millisecond = millisecond
+utc_second      = second
+utc_minute      = minute
+utc_hour        = hour
+utc_day         = day
+utc_week        = week
+utc_month       = month
+utc_year        = year